@@ -0,0 +1,89 @@
+import os
+import unicodedata
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple
+
+QUOTE_CHARS = "\"'“”‘’`"
+TRAILING_PUNCT = ".,;:!?"
+
+def clean_surface_form(name) -> str:
+    """
+    Bentuk tampilan yang rapi (huruf besar/kecil dipertahankan)
+    """
+    form = unicodedata.normalize("NFKC", str(name)).strip()
+    form = form.strip(QUOTE_CHARS).rstrip(TRAILING_PUNCT).strip(QUOTE_CHARS)
+    return " ".join(form.split())
+
+
+def canonical_key(name) -> str:
+    """
+    Kunci kanonik nama entitas REBEL:
+    NFKC, tanpa tanda kutip pembungkus & tanda baca di akhir, spasi tunggal,
+    lowercase, dan awalan "the " dibuang. Kualifikasi dalam kurung tetap
+    dipertahankan karena biasanya membedakan entitas (mis. film vs kapal).
+    """
+    key = clean_surface_form(name).lower()
+    if key.startswith("the ") and len(key) > 4:
+        key = key[4:]
+    return key
+
+
+def build_alias_map(df_triplets: pd.DataFrame) -> Dict[str, str]:
+    """
+    Surface form -> nama kanonik. Nama kanonik satu kelompok = surface form yang sudah
+    rapi (tanpa kutip/tanda baca di ujung) dan paling sering muncul; seri -> yang muncul
+    lebih dulu. Hanya nama unik yang diproses.
+    """
+    names = pd.Series(np.concatenate([df_triplets['head'].to_numpy(dtype=object),
+                                      df_triplets['tail'].to_numpy(dtype=object)]))
+    names = names[names.notna()].astype(str)
+    counts = names.value_counts(sort=False)
+    first_seen = pd.Series(np.arange(len(names)), index=names.to_numpy()).groupby(level=0).min()
+
+    forms = pd.DataFrame({'name': counts.index, 'count': counts.to_numpy()})
+    forms['first_seen'] = first_seen.reindex(forms['name']).to_numpy()
+    forms['key'] = [canonical_key(name) for name in forms['name']]
+    forms['clean'] = [clean_surface_form(name) == name for name in forms['name']]
+    # Kunci kosong (mis. nama hanya tanda baca) tidak digabung dengan apa pun
+    forms.loc[forms['key'] == "", 'key'] = forms['name']
+
+    forms = forms.sort_values(['clean', 'count', 'first_seen'], ascending=[False, False, True], kind='stable')
+    canonical_by_key = forms.drop_duplicates('key').set_index('key')['name']
+    canonical = forms['key'].map(canonical_by_key)
+    return dict(zip(forms['name'], canonical))
+
+
+def canonicalize_triplets(df_triplets: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Mengganti head/tail dengan nama kanonik lalu membuang triplet duplikat.
+    Return: (triplet kanonik, tabel alias [alias, canonical]) — alias hanya nama yang berubah.
+    """
+    alias_map = build_alias_map(df_triplets)
+    df_canonical = df_triplets.copy()
+    for column in ('head', 'tail'):
+        mapped = df_canonical[column].map(alias_map)
+        df_canonical[column] = mapped.where(mapped.notna(), df_canonical[column])
+    df_canonical = df_canonical.drop_duplicates().reset_index(drop=True)
+
+    df_aliases = pd.DataFrame(
+        [(alias, canonical) for alias, canonical in alias_map.items() if alias != canonical],
+        columns=['alias', 'canonical']
+    )
+    return df_canonical, df_aliases
+
+
+def alias_table_path(graph_path) -> str:
+    """
+    Tabel alias disimpan di samping file graf (knowledge_graph_20k.pkl -> knowledge_graph_20k.aliases.csv)
+    """
+    base, _ = os.path.splitext(graph_path)
+    return f"{base}.aliases.csv"
+
+
+def load_alias_table(graph_path) -> Dict[str, str]:
+    path = alias_table_path(graph_path)
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return dict(zip(df['alias'], df['canonical']))
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
+
+class ExtractionCheckpoint:
+    def __init__(self, directory, chunk_ids: List[str], settings: Optional[Dict] = None):
+        """
+        Checkpoint ekstraksi triplet yang append-only:
+        - shard_XXXXX.jsonl : triplet (satu JSON per baris), satu shard baru per sesi
+        - manifest.jsonl    : satu baris per span selesai {start, end, first_id, last_id,
+                              shard, offset, length, triplets, settings}
+        Span baru dianggap selesai hanya jika baris manifest-nya tertulis (ditulis setelah
+        data shard di-fsync), sehingga ekor shard yang rusak saat crash diabaikan.
+        chunk_ids: id chunk run ini; entri manifest yang id-nya tidak cocok tidak dipakai.
+        settings: setting yang memengaruhi output ekstraksi (model/backend + parameter generate);
+        entri dari setting lain tidak dipakai agar triplet beam3 dan greedy/int8 tidak tercampur.
+        """
+        self.directory = directory
+        self.chunk_ids = chunk_ids
+        self.settings = settings
+        self.manifest_path = os.path.join(directory, "manifest.jsonl")
+        os.makedirs(directory, exist_ok=True)
+
+        entries = self._read_manifest()
+        self.entries = [e for e in entries if self._matches(e)]
+        if entries and not self.entries:
+            # Checkpoint milik daftar chunk lain (limit/offset berbeda) atau setting ekstraksi
+            # lain (backend/profil) -> mulai dari awal
+            print("[Checkpoint] Manifest tidak cocok dengan chunk/setting ekstraksi run ini, checkpoint direset.")
+            shutil.rmtree(directory)
+            os.makedirs(directory)
+
+        # Penghitung inkremental (tanpa menjumlah ulang manifest tiap span)
+        self.num_triplets = sum(e["triplets"] for e in self.entries)
+        self.num_completed = sum(e["end"] - e["start"] for e in self.entries)
+
+        num_shards = len([f for f in os.listdir(directory) if f.startswith("shard_")])
+        self.shard_name = f"shard_{num_shards:05d}.jsonl"
+        self.shard_path = os.path.join(directory, self.shard_name)
+
+    def _read_manifest(self) -> List[Dict]:
+        if not os.path.exists(self.manifest_path):
+            return []
+        entries = []
+        valid_bytes = 0
+        with open(self.manifest_path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+        # Baris terakhir terpotong (crash saat menulis manifest) dibuang agar append berikutnya utuh
+        if valid_bytes < os.path.getsize(self.manifest_path):
+            with open(self.manifest_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return entries
+
+    def _matches(self, entry) -> bool:
+        start, end = entry["start"], entry["end"]
+        return (entry.get("settings") == self.settings
+                and 0 <= start < end <= len(self.chunk_ids)
+                and self.chunk_ids[start] == entry["first_id"]
+                and self.chunk_ids[end - 1] == entry["last_id"])
+
+    def pending_ranges(self, span_size) -> List[Tuple[int, int]]:
+        """
+        Rentang chunk yang belum selesai (celah di antara span manifest + sisa di akhir),
+        dipotong per span_size
+        """
+        ranges = []
+        position = 0
+        covered = sorted((e["start"], e["end"]) for e in self.entries) + [(len(self.chunk_ids), None)]
+        for start, end in covered:
+            for span_start in range(position, start, span_size):
+                ranges.append((span_start, min(span_start + span_size, start)))
+            position = max(position, end or start)
+        return ranges
+
+    def append(self, start, end, records: List[Dict]):
+        """
+        Menambahkan triplet satu span ke shard sesi ini lalu mencatatnya di manifest
+        """
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode('utf-8')
+        with open(self.shard_path, 'ab') as f:
+            offset = f.tell()
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        entry = {"start": start, "end": end,
+                 "first_id": self.chunk_ids[start], "last_id": self.chunk_ids[end - 1],
+                 "shard": self.shard_name, "offset": offset, "length": len(payload),
+                 "triplets": len(records), "settings": self.settings}
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries.append(entry)
+        self.num_triplets += len(records)
+        self.num_completed += end - start
+
+    def iter_records(self) -> Iterator[Dict]:
+        """
+        Semua triplet dalam urutan chunk (bukan urutan penulisan), dibaca per span
+        """
+        for entry in sorted(self.entries, key=lambda e: e["start"]):
+            with open(os.path.join(self.directory, entry["shard"]), 'rb') as f:
+                f.seek(entry["offset"])
+                payload = f.read(entry["length"])
+            for line in payload.decode('utf-8').splitlines():
+                yield json.loads(line)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(list(self.iter_records()))
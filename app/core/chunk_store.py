@@ -0,0 +1,201 @@
+import json
+import os
+import pickle
+import shutil
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+from app.core.columnar import StringTable, DictionaryColumn, read_array, append_array
+
+class ChunkStore:
+    FORMAT_VERSION = 1
+
+    def __init__(self, path):
+        """
+        Penyimpanan metadata chunk kolumnar (pengganti *_meta.pkl).
+        Struktur direktori:
+        - chunk_id.*        : id chunk per baris + indeks hash (row <-> chunk_id)
+        - text.*            : blob teks UTF-8 + offset
+        - titles.*          : dictionary judul (dipakai kolom title & source)
+        - types.*           : dictionary tipe dokumen
+        - question_ids.*    : dictionary id pertanyaan asal
+        - *.codes           : kode int32 per baris untuk kolom kategorikal
+        - deleted.flags     : tombstone uint8 per baris (opsional, ditulis in-place)
+        Semua kolom di-memory-map; sebuah baris baru dibentuk jadi dict saat diakses.
+        """
+        self.path = path
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"Chunk store tidak ditemukan: {path}")
+        with open(meta_path, 'r') as f:
+            self.meta = json.load(f)
+
+        self.chunk_ids = StringTable(path, "chunk_id", hashed=True)
+        self.texts = StringTable(path, "text")
+        titles = StringTable(path, "titles", hashed=True)
+        types = StringTable(path, "types", hashed=True)
+        question_ids = StringTable(path, "question_ids", hashed=True)
+        self.title_col = DictionaryColumn(path, "title", titles)
+        self.source_col = DictionaryColumn(path, "source", titles)
+        self.type_col = DictionaryColumn(path, "type", types)
+        self.question_col = DictionaryColumn(path, "question_id", question_ids)
+        self.deleted_path = os.path.join(path, "deleted.flags")
+
+    @classmethod
+    def create(cls, path, chunks: Iterable[Dict] = ()):
+        """
+        Membuat chunk store baru (menimpa yang lama) dari iterable chunk dict
+        """
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+
+        StringTable.create(path, "chunk_id", hashed=True)
+        StringTable.create(path, "text")
+        titles = StringTable.create(path, "titles", hashed=True)
+        types = StringTable.create(path, "types", hashed=True)
+        question_ids = StringTable.create(path, "question_ids", hashed=True)
+        DictionaryColumn.create(path, "title", titles)
+        DictionaryColumn.create(path, "source", titles)
+        DictionaryColumn.create(path, "type", types)
+        DictionaryColumn.create(path, "question_id", question_ids)
+
+        with open(os.path.join(path, "meta.json"), 'w') as f:
+            json.dump({"format_version": cls.FORMAT_VERSION}, f)
+
+        store = cls(path)
+        store.append(chunks)
+        return store
+
+    @classmethod
+    def from_pickle(cls, pkl_path, path):
+        """
+        Migrasi metadata lama (list of dict hasil pickle) ke format kolumnar
+        """
+        print(f"[ChunkStore] Migrasi {pkl_path} -> {path}...")
+        with open(pkl_path, 'rb') as f:
+            chunks = pickle.load(f)
+        store = cls.create(path, chunks)
+        print(f"[ChunkStore] Migrasi selesai: {len(store)} chunk.")
+        return store
+
+    def append(self, chunks: Iterable[Dict], batch_size=10000) -> List[int]:
+        """
+        Menambahkan chunk ke ujung store (append-only), mengembalikan nomor baris baru
+        """
+        rows = []
+        caches = {"title": {}, "type": {}, "question_id": {}}
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                rows.extend(self._append_batch(batch, caches))
+                batch = []
+        if batch:
+            rows.extend(self._append_batch(batch, caches))
+        return rows
+
+    def _append_batch(self, batch, caches):
+        metas = [chunk.get('metadata') or {} for chunk in batch]
+        # Prioritas id sama seperti VectorStore.search: 'chunk_id' -> 'id'
+        ids = [chunk.get('chunk_id', chunk.get('id', '')) for chunk in batch]
+
+        title_codes = self.title_col.encode((c.get('title') for c in batch), caches["title"])
+        source_codes = self.source_col.encode((m.get('source') for m in metas), caches["title"])
+        type_codes = self.type_col.encode((m.get('type') for m in metas), caches["type"])
+        question_codes = self.question_col.encode(
+            (m.get('original_question_id') for m in metas), caches["question_id"])
+
+        rows = self.chunk_ids.extend(ids)
+        self.texts.extend(c.get('text', '') for c in batch)
+        self.title_col.append_codes(title_codes)
+        self.source_col.append_codes(source_codes)
+        self.type_col.append_codes(type_codes)
+        self.question_col.append_codes(question_codes)
+        if os.path.exists(self.deleted_path):
+            append_array(self.deleted_path, np.zeros(len(rows)), np.uint8)
+        return rows
+
+    def deleted_rows(self) -> np.ndarray:
+        """
+        Nomor baris yang sudah ditandai terhapus (tombstone)
+        """
+        return np.flatnonzero(read_array(self.deleted_path, np.uint8))
+
+    def is_deleted(self, rows: Iterable[int]) -> np.ndarray:
+        """
+        Flag tombstone untuk baris tertentu saja (hanya byte flag baris tsb. yang dibaca)
+        """
+        rows = np.asarray(list(rows), dtype=np.int64)
+        flags = read_array(self.deleted_path, np.uint8)
+        deleted = np.zeros(len(rows), dtype=bool)
+        in_file = rows < len(flags)
+        deleted[in_file] = flags[rows[in_file]] != 0
+        return deleted
+
+    def mark_deleted(self, rows: Iterable[int]):
+        """
+        Menandai baris sebagai terhapus. Hanya byte flag yang diubah (in-place),
+        data chunk tetap ada sampai index dibangun ulang.
+        """
+        rows = np.asarray(list(rows), dtype=np.int64)
+        if not len(rows):
+            return
+        size = os.path.getsize(self.deleted_path) if os.path.exists(self.deleted_path) else 0
+        if size < len(self):
+            append_array(self.deleted_path, np.zeros(len(self) - size), np.uint8)
+        flags = np.memmap(self.deleted_path, dtype=np.uint8, mode='r+')
+        flags[rows] = 1
+        flags.flush()
+        del flags
+
+    def __len__(self):
+        return len(self.chunk_ids)
+
+    def __getitem__(self, row) -> Dict:
+        row = int(row)
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(f"Baris {row} di luar jangkauan chunk store")
+
+        metadata = {}
+        source = self.source_col[row]
+        if source is not None:
+            metadata['source'] = source
+        doc_type = self.type_col[row]
+        if doc_type is not None:
+            metadata['type'] = doc_type
+        question_id = self.question_col[row]
+        if question_id is not None:
+            metadata['original_question_id'] = question_id
+
+        return {
+            "id": self.chunk_ids[row],
+            "title": self.title_col[row],
+            "text": self.texts[row],
+            "metadata": metadata
+        }
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def get_row(self, chunk_id: str) -> Optional[int]:
+        """
+        Lookup chunk_id -> nomor baris (indeks hash, tanpa memuat semua id).
+        Jika chunk_id pernah dihapus lalu ditambah ulang, baris aktif terbaru yang dipakai.
+        """
+        rows = self.chunk_ids.lookup_all(chunk_id)
+        if rows and os.path.exists(self.deleted_path):
+            rows = [row for row, deleted in zip(rows, self.is_deleted(rows)) if not deleted]
+        return rows[-1] if rows else None
+
+    def get_by_chunk_id(self, chunk_id: str) -> Optional[Dict]:
+        row = self.get_row(chunk_id)
+        return None if row is None else self[row]
+
+    def question_ids(self) -> List[str]:
+        """
+        Daftar id pertanyaan unik yang ter-index (langsung dari dictionary)
+        """
+        return list(self.question_col.dictionary)
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import numpy as np
+from typing import Iterable, List, Optional
+
+# Primitif penyimpanan kolumnar berbasis file mentah + np.memmap.
+# Setiap kolom adalah satu file biner append-only sehingga bisa dibaca lazy
+# (tanpa unpickle) dan ditambah tanpa menulis ulang seluruh isi file.
+
+def hash64(value: str) -> int:
+    """
+    Hash 64-bit yang stabil antar proses (berbeda dengan hash() bawaan Python)
+    """
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def read_array(path, dtype):
+    """
+    Memory-map file kolom. File kosong tidak bisa di-memmap, kembalikan array kosong.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r')
+
+
+def append_array(path, values, dtype):
+    """
+    Menambahkan nilai ke ujung file kolom (append-only)
+    """
+    array = np.ascontiguousarray(values, dtype=dtype)
+    with open(path, 'ab') as f:
+        f.write(array.tobytes())
+
+
+class StringTable:
+    def __init__(self, directory, name, hashed=False):
+        """
+        Kolom string: blob UTF-8 ({name}.blob) + array offset int64 ({name}.offsets).
+        Jika hashed=True, disimpan juga hash 64-bit per baris ({name}.hash)
+        untuk lookup string -> nomor baris tanpa memuat semua string.
+        """
+        self.directory = directory
+        self.name = name
+        self.hashed = hashed
+        self.blob_path = os.path.join(directory, f"{name}.blob")
+        self.offsets_path = os.path.join(directory, f"{name}.offsets")
+        self.hash_path = os.path.join(directory, f"{name}.hash")
+        self._sorted_hashes = None
+        self._sorted_rows = None
+        self.refresh()
+
+    @classmethod
+    def create(cls, directory, name, strings: Iterable[str] = (), hashed=False):
+        """
+        Membuat kolom baru (menimpa file lama) lalu mengisi dengan strings
+        """
+        os.makedirs(directory, exist_ok=True)
+        for ext in ("blob", "offsets", "hash"):
+            path = os.path.join(directory, f"{name}.{ext}")
+            if os.path.exists(path):
+                os.remove(path)
+        append_array(os.path.join(directory, f"{name}.offsets"), [0], np.int64)
+        open(os.path.join(directory, f"{name}.blob"), 'wb').close()
+        if hashed:
+            open(os.path.join(directory, f"{name}.hash"), 'wb').close()
+
+        table = cls(directory, name, hashed=hashed)
+        table.extend(strings)
+        return table
+
+    def refresh(self):
+        """
+        (Re)map file dari disk, dipanggil setelah ada data yang ditambahkan
+        """
+        self.blob = read_array(self.blob_path, np.uint8)
+        self.offsets = read_array(self.offsets_path, np.int64)
+        self.hashes = read_array(self.hash_path, np.uint64) if self.hashed else None
+        self._sorted_hashes = None
+        self._sorted_rows = None
+
+    def __len__(self):
+        return max(len(self.offsets) - 1, 0)
+
+    def __getitem__(self, row) -> str:
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return bytes(self.blob[start:end]).decode('utf-8')
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def extend(self, strings: Iterable[str]) -> List[int]:
+        """
+        Menambahkan string ke ujung tabel, mengembalikan nomor baris yang dibuat
+        """
+        first_row = len(self)
+        position = int(self.offsets[-1]) if len(self.offsets) else 0
+        offsets, hashes = [], []
+        with open(self.blob_path, 'ab') as blob_file:
+            for value in strings:
+                encoded = str(value).encode('utf-8')
+                blob_file.write(encoded)
+                position += len(encoded)
+                offsets.append(position)
+                if self.hashed:
+                    hashes.append(hash64(str(value)))
+
+        if offsets:
+            append_array(self.offsets_path, offsets, np.int64)
+            if self.hashed:
+                append_array(self.hash_path, hashes, np.uint64)
+            self.refresh()
+        return list(range(first_row, first_row + len(offsets)))
+
+    def lookup(self, value: str) -> Optional[int]:
+        """
+        Mencari nomor baris (pertama) dari sebuah string (butuh hashed=True).
+        Indeks hash terurut dibangun sekali secara lazy, lookup = binary search.
+        """
+        rows = self.lookup_all(value)
+        return rows[0] if rows else None
+
+    def lookup_all(self, value: str) -> List[int]:
+        """
+        Semua nomor baris yang berisi string value (urut naik)
+        """
+        if not self.hashed:
+            raise ValueError(f"StringTable '{self.name}' tidak memiliki indeks hash")
+        if self._sorted_hashes is None:
+            self._sorted_rows = np.argsort(self.hashes, kind='stable')
+            self._sorted_hashes = np.asarray(self.hashes)[self._sorted_rows]
+
+        target = np.uint64(hash64(str(value)))
+        pos = int(np.searchsorted(self._sorted_hashes, target, side='left'))
+        # Cek semua baris dengan hash sama (antisipasi tabrakan hash)
+        rows = []
+        while pos < len(self._sorted_hashes) and self._sorted_hashes[pos] == target:
+            row = int(self._sorted_rows[pos])
+            if self[row] == str(value):
+                rows.append(row)
+            pos += 1
+        return rows
+
+
+class DictionaryColumn:
+    def __init__(self, directory, name, dictionary: StringTable):
+        """
+        Kolom kategorikal terenkode dictionary: kode int32 per baris ({name}.codes)
+        yang menunjuk ke StringTable nilai unik. Kode -1 berarti nilai kosong.
+        """
+        self.name = name
+        self.dictionary = dictionary
+        self.codes_path = os.path.join(directory, f"{name}.codes")
+        self.refresh()
+
+    @classmethod
+    def create(cls, directory, name, dictionary: StringTable):
+        path = os.path.join(directory, f"{name}.codes")
+        open(path, 'wb').close()
+        return cls(directory, name, dictionary)
+
+    def refresh(self):
+        self.codes = read_array(self.codes_path, np.int32)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row) -> Optional[str]:
+        code = int(self.codes[row])
+        return None if code < 0 else self.dictionary[code]
+
+    def encode(self, values: Iterable[Optional[str]], cache: dict) -> List[int]:
+        """
+        Mengubah nilai menjadi kode, menambahkan nilai baru ke dictionary.
+        cache: dict nilai -> kode yang dipakai bersama selama satu sesi penulisan.
+        """
+        codes, new_values = [], []
+        next_code = len(self.dictionary)
+        for value in values:
+            if value is None:
+                codes.append(-1)
+                continue
+            value = str(value)
+            code = cache.get(value)
+            if code is None:
+                code = self.dictionary.lookup(value) if len(self.dictionary) else None
+                if code is None:
+                    code = next_code
+                    next_code += 1
+                    new_values.append(value)
+                cache[value] = code
+            codes.append(code)
+        if new_values:
+            self.dictionary.extend(new_values)
+        return codes
+
+    def append_codes(self, codes):
+        append_array(self.codes_path, codes, np.int32)
+        self.refresh()
@@ -18,15 +18,92 @@ SUFFIX = "20k"
 # Nama file spesifik
 VECTOR_INDEX_NAME = f"hotpot_{SUFFIX}"                
 METADATA_NAME     = f"hotpot_{SUFFIX}_meta.pkl"       
+CHUNK_STORE_NAME  = f"hotpot_{SUFFIX}_chunks"
 GRAPH_PKL_NAME    = f"knowledge_graph_{SUFFIX}.pkl"   
 TRIPLETS_CSV_NAME = f"triplets_{SUFFIX}.csv"          
 LINKING_CSV_NAME  = f"entity_linking_{SUFFIX}.csv"
+QUESTION_MAP_NAME = f"question_chunk_map_{SUFFIX}.csv"
 
 # --- PARAMETER GLOBAL ---
 CHUNK_SIZE = 200
 CHUNK_OVERLAP = 50
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
+# --- PARAMETER INDEX VEKTOR (FAISS) ---
+# Profil -> factory string FAISS. {nlist} diisi otomatis dari ukuran korpus (~4*sqrt(N)).
+INDEX_PROFILES = {
+    "flat": "Flat",
+    "ivf_flat": "IVF{nlist},Flat",
+    "ivf_pq": "IVF{nlist},PQ48",
+    "hnsw": "HNSW32,Flat",
+}
+VECTOR_INDEX_FACTORY = "flat"      # nama profil atau factory string FAISS mentah
+VECTOR_TRAIN_SAMPLE = 50000        # jumlah vektor untuk training index IVF/PQ
+VECTOR_NPROBE = 16                 # default nprobe (IVF) saat search
+VECTOR_EF_SEARCH = 64              # default efSearch (HNSW) saat search
+VECTOR_MMAP = True                 # retriever memuat index secara memory-mapped (read-only)
+
+# Format graf yang dimuat GraphRetriever:
+# "csr" = graph store kolumnar memory-mapped (dimigrasi otomatis dari pickle), "networkx" = pickle nx.DiGraph,
+# "sqlite" = file SQLite ber-index (bulk load dari CSV triplet), untuk graf yang lebih besar dari RAM
+GRAPH_BACKEND = "csr"
+GRAPH_SQLITE_CACHE_MB = 64         # page cache SQLite per koneksi (batas memori backend sqlite)
+
+# Entity linking GraphRetriever:
+# "string" = pencocokan substring/keyword (default, hasil sama dengan linker awal),
+# "semantic" = ANN atas embedding nama node (query embedding dipakai bersama vector retrieval),
+# "both" = hasil semantik lalu string.
+# Mode semantic/both mengubah hasil graph & hybrid retrieval; bandingkan dulu dengan
+# evaluation/benchmark_linking.py sebelum dijadikan default.
+GRAPH_LINKING = "string"
+NODE_INDEX_FACTORY = "flat"        # profil index FAISS untuk nama node (lihat INDEX_PROFILES)
+NODE_LINK_TOP_N = 5                # kandidat entitas dari satu pencarian ANN
+# Jarak L2^2 maksimum (embedding ternormalisasi: 1.0 = cos >= 0.5). Belum dikalibrasi:
+# embedding seluruh pertanyaan vs nama entitas pendek; pilih dari sweep benchmark_linking.py
+NODE_LINK_MAX_DISTANCE = 1.0
+
+# Penelusuran graf multi-hop (GraphRetriever.retrieve depth > 1)
+GRAPH_DEPTH = 1                    # jumlah hop dari entitas kandidat (mode graph & hybrid)
+GRAPH_RANK = None                  # None (urutan BFS) atau "ppr" (personalized PageRank)
+GRAPH_MAX_FACTS = 20               # jumlah fakta maksimum per query
+GRAPH_NODE_BUDGET = 200            # node maksimum yang diekspansi per query
+GRAPH_EDGE_BUDGET = 5000           # edge maksimum yang diperiksa per query
+GRAPH_FANOUT = 50                  # edge maksimum per arah per node mulai hop ke-2
+GRAPH_PPR_ALPHA = 0.15             # peluang teleport personalized PageRank
+GRAPH_PPR_ITERATIONS = 30
+
+# Hybrid: jumlah maksimum passage sumber dari entitas/fakta graf (via tabel entity linking)
+HYBRID_MAX_PASSAGES = 2
+
+# Cache embedding query (LRU). Spill ke disk agar run benchmark berikutnya tidak encode ulang.
+QUERY_CACHE_SIZE = 4096
+QUERY_CACHE_SPILL = False
+
+# Cache embedding chunk persisten (dipakai bersama oleh semua build/suffix)
+EMBEDDING_CACHE_DIR = os.path.join(DATA_PROCESSED_DIR, "embedding_cache")
+
+# Ekstraksi triplet REBEL
+EXTRACTION_MAX_LENGTH = 256        # panjang maksimum input (truncation) & output generate
+# "token_budget" = chunk diurutkan berdasarkan panjang token, batch dibatasi token (padding minimal);
+# "fixed" = batch berurutan berukuran tetap
+EXTRACTION_BATCHING = "token_budget"
+EXTRACTION_TOKEN_BUDGET = 4096     # maksimum item x panjang token terpanjang per batch
+# Chunk per span ekstraksi (unit checkpoint & kerja worker). Pengurutan panjang token hanya
+# terjadi di dalam satu span, jadi span harus jauh lebih besar dari batch_size
+EXTRACTION_SPAN = 1024
+# Backend model REBEL: "torch" (fp32), "int8" (dynamic quantization torch, CPU),
+# "onnx" (ONNX Runtime lewat optimum, opsional; hasil export disimpan di MODEL_DIR)
+EXTRACTION_BACKEND = "torch"
+# Profil generate: greedy / beam2 / beam3 (beam3 = setting awal, kualitas acuan)
+GENERATION_PROFILES = {
+    "greedy": {"num_beams": 1},
+    "beam2": {"num_beams": 2},
+    "beam3": {"num_beams": 3},
+}
+EXTRACTION_PROFILE = "beam3"
+# Cache triplet persisten (hash model + parameter generate + teks), dipakai bersama semua build/suffix
+EXTRACTION_CACHE_PATH = os.path.join(DATA_PROCESSED_DIR, "extraction_cache.sqlite")
+
 # Setup Model LLM
 LLM_MODEL_FILE = "mistral-7b-instruct-v0.2.Q4_K_M.gguf"
 LLM_MODEL_PATH = os.path.join(MODEL_DIR, LLM_MODEL_FILE)
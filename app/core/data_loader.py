@@ -3,35 +3,114 @@ import os
 from app.core.config import DATA_RAW_DIR
 
 class HotpotQALoader:
-    def __init__(self, file_name="hotpot_train_v1.1.json"):
+    def __init__(self, file_name="hotpot_train_v1.1.json", read_size=1 << 20):
         self.file_path = os.path.join(DATA_RAW_DIR, file_name)
-    
-    def load_data(self, limit=None):
+        # Ukuran blok baca (byte) untuk parser inkremental
+        self.read_size = read_size
+        self._decoder = json.JSONDecoder()
+
+    def load_data(self, limit=None, offset=0, num_shards=1, shard_index=0):
         """
-        Memuat data HotpotQA dari file json
+        Memuat data HotpotQA dari file json (list penuh).
+        Dibangun di atas iter_records sehingga parsing berhenti setelah limit tercapai.
         """
         print(f"[Loader] Memuat data dari: {self.file_path}")
-        
+
         if not os.path.exists(self.file_path):
             raise FileNotFoundError(f"File tidak ditemukan di {self.file_path}")
-        
+
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            # HotpotQA training data adalah list of dict
-            total_data = len(data)
-            print(f"[Loader] Total data mentah ditemukan: {total_data}")
-            
+            data = list(self.iter_records(limit=limit, offset=offset,
+                                          num_shards=num_shards, shard_index=shard_index))
+            print(f"[Loader] Total data dimuat: {len(data)}")
+
             if limit:
-                data = data[:limit]
                 print(f"[Loader] Mode Testing: Hanya mengambil {limit} data awal.")
-            
+
             return data
         except Exception as e:
             print(f"[Loader] Error saat membaca file: {e}")
             return []
-        
+
+    def iter_records(self, limit=None, offset=0, num_shards=1, shard_index=0):
+        """
+        Generator yang menghasilkan record HotpotQA satu per satu tanpa json.load penuh.
+        - offset      : lewati sejumlah record awal (posisi global di file)
+        - limit       : jumlah maksimum record yang diambil mulai dari offset
+        - num_shards  : bagi record menjadi beberapa shard (round-robin berdasarkan posisi)
+        - shard_index : shard yang diambil (0 <= shard_index < num_shards)
+        Parsing berhenti begitu limit tercapai.
+        """
+        if not os.path.exists(self.file_path):
+            raise FileNotFoundError(f"File tidak ditemukan di {self.file_path}")
+        if num_shards < 1 or not (0 <= shard_index < num_shards):
+            raise ValueError(f"Shard tidak valid: {shard_index}/{num_shards}")
+
+        end = None if limit is None else offset + limit
+        for position, record in enumerate(self._iter_json_array()):
+            if end is not None and position >= end:
+                break
+            if position < offset:
+                continue
+            if position % num_shards != shard_index:
+                continue
+            yield record
+
+    def _iter_json_array(self):
+        """
+        Parser inkremental untuk file berisi satu JSON array of object.
+        Membaca file per blok dan mendekode elemen dengan raw_decode.
+        """
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            buffer = ""
+            pos = 0
+            eof = False
+            started = False
+
+            while True:
+                # Lewati whitespace dan pemisah antar elemen
+                while True:
+                    while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                        pos += 1
+                    if pos < len(buffer) or eof:
+                        break
+                    buffer, pos, eof = self._refill(f, buffer, pos)
+
+                if pos >= len(buffer):
+                    if started:
+                        raise ValueError("JSON array tidak ditutup (file terpotong?)")
+                    return
+
+                if not started:
+                    if buffer[pos] != '[':
+                        raise ValueError("Format tidak dikenali: file harus berupa JSON array")
+                    started = True
+                    pos += 1
+                    continue
+
+                if buffer[pos] == ']':
+                    return
+
+                # Decode satu elemen, tambah buffer jika elemen belum lengkap
+                while True:
+                    try:
+                        record, end = self._decoder.raw_decode(buffer, pos)
+                        break
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        buffer, pos, eof = self._refill(f, buffer, pos)
+
+                pos = end
+                yield record
+
+    def _refill(self, f, buffer, pos):
+        """
+        Membuang bagian buffer yang sudah diproses lalu membaca blok berikutnya.
+        """
+        block = f.read(self.read_size)
+        return buffer[pos:] + block, 0, not block
+
     def get_contexts(self, record):
         """
         Mengambil semua artikel konteks dari satu record.
@@ -40,7 +119,7 @@ class HotpotQALoader:
         """
         contexts = []
         raw_contexts = record.get('context', [])
-        
+
         for item in raw_contexts:
             title = item[0]
             sentences = item[1]
@@ -48,4 +127,4 @@ class HotpotQALoader:
                 'title' : title,
                 'sentences' : sentences
             })
-        return contexts
\ No newline at end of file
+        return contexts
@@ -0,0 +1,59 @@
+import hashlib
+import pandas as pd
+from typing import List, Dict
+
+class ChunkDeduplicator:
+    def __init__(self):
+        """
+        Deduplikasi chunk konteks berdasarkan hash (title, teks ternormalisasi).
+        Pada setting distractor, paragraf Wikipedia yang sama muncul di banyak _id,
+        sehingga embedding & ekstraksi REBEL cukup dilakukan sekali per paragraf unik.
+        """
+        # hash konten -> id chunk kanonik
+        self.canonical_ids = {}
+        # Pasangan (question_id, chunk_id kanonik) untuk evaluasi closed-set
+        self.question_map = []
+        self.total_seen = 0
+
+    def content_key(self, chunk: Dict) -> str:
+        """
+        Kunci hash dari title + teks yang dinormalisasi (lowercase, spasi tunggal)
+        """
+        title = str(chunk.get('title', '')).strip()
+        text = " ".join(str(chunk.get('text', '')).lower().split())
+        return hashlib.sha1(f"{title}\x1f{text}".encode('utf-8')).hexdigest()
+
+    def add(self, chunks: List[Dict]) -> List[Dict]:
+        """
+        Mendaftarkan chunks baru dan mengembalikan hanya chunk yang belum pernah dilihat.
+        Urutan chunk kanonik mengikuti urutan kemunculan pertama (deterministik).
+        """
+        unique_chunks = []
+        for chunk in chunks:
+            self.total_seen += 1
+            key = self.content_key(chunk)
+            canonical_id = self.canonical_ids.get(key)
+            if canonical_id is None:
+                canonical_id = chunk['id']
+                self.canonical_ids[key] = canonical_id
+                unique_chunks.append(chunk)
+
+            question_id = chunk.get('metadata', {}).get('original_question_id')
+            if question_id is not None:
+                self.question_map.append((question_id, canonical_id))
+        return unique_chunks
+
+    @property
+    def num_unique(self):
+        return len(self.canonical_ids)
+
+    def get_question_map(self) -> pd.DataFrame:
+        """
+        Mapping many-to-one: question_id -> chunk_id kanonik
+        """
+        df = pd.DataFrame(self.question_map, columns=['question_id', 'chunk_id'])
+        return df.drop_duplicates()
+
+    def save_question_map(self, path):
+        self.get_question_map().to_csv(path, index=False)
+        print(f"[Dedup] Mapping pertanyaan -> chunk disimpan ke: {path}")
@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import re
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+from app.core.config import DATA_PROCESSED_DIR, EMBEDDING_CACHE_DIR, QUERY_CACHE_SIZE, QUERY_CACHE_SPILL
+from app.core.columnar import read_array, append_array
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa lock antar process
+    fcntl = None
+
+def normalize_query(query: str) -> str:
+    """
+    Kunci cache query: lowercase + spasi tunggal.
+    Aman karena MiniLM (all-MiniLM-L6-v2) memakai tokenizer uncased.
+    """
+    return " ".join(str(query).lower().split())
+
+
+class QueryEmbeddingCache:
+    def __init__(self, capacity=QUERY_CACHE_SIZE, spill_path=None):
+        """
+        Cache embedding query dengan eviksi LRU.
+        spill_path (opsional): file .npz untuk menyimpan/memuat cache antar run.
+        """
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if spill_path and os.path.exists(spill_path):
+            self.load(spill_path)
+
+    def get(self, query):
+        key = normalize_query(query)
+        vector = self._entries.get(key)
+        if vector is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return vector
+
+    def put(self, query, vector):
+        key = normalize_query(query)
+        self._entries[key] = np.asarray(vector, dtype=np.float32)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def save(self, path=None):
+        """
+        Spill isi cache ke disk (urutan LRU dipertahankan)
+        """
+        path = path or self.spill_path
+        if not path or not self._entries:
+            return
+        keys = np.array(list(self._entries.keys()), dtype=str)
+        vectors = np.vstack(list(self._entries.values()))
+        np.savez(path, keys=keys, vectors=vectors)
+        print(f"[QueryCache] {len(keys)} embedding query disimpan ke {path}")
+
+    def load(self, path=None):
+        path = path or self.spill_path
+        with np.load(path) as data:
+            for key, vector in zip(data['keys'], data['vectors']):
+                self.put(str(key), vector)
+        print(f"[QueryCache] {len(self._entries)} embedding query dimuat dari {path}")
+
+
+# Satu cache per model embedding, dipakai bersama oleh semua VectorStore dalam proses
+_query_caches = {}
+
+def _safe_model_name(model_name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+
+
+def get_query_cache(model_name) -> QueryEmbeddingCache:
+    if model_name not in _query_caches:
+        spill_path = None
+        if QUERY_CACHE_SPILL:
+            spill_path = os.path.join(DATA_PROCESSED_DIR, f"query_cache_{_safe_model_name(model_name)}.npz")
+        _query_caches[model_name] = QueryEmbeddingCache(spill_path=spill_path)
+    return _query_caches[model_name]
+
+
+@contextmanager
+def _file_lock(path):
+    """
+    Lock eksklusif antar process (flock) selama blok berjalan
+    """
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    KEY_BYTES = 16
+
+    def __init__(self, model_name, dimension, cache_dir=EMBEDDING_CACHE_DIR):
+        """
+        Cache embedding chunk persisten (content-addressed).
+        Kunci = hash(model, teks chunk); vektor disimpan sebagai matriks float32
+        memory-mapped yang append-only, sehingga build 20k dan full berbagi hasil encode.
+        - keys.bin    : digest 16 byte per baris
+        - vectors.f32 : matriks (N, dimension) float32
+        """
+        self.model_name = model_name
+        self.dimension = dimension
+        self.path = os.path.join(cache_dir, _safe_model_name(model_name))
+        os.makedirs(self.path, exist_ok=True)
+        self.keys_path = os.path.join(self.path, "keys.bin")
+        self.vectors_path = os.path.join(self.path, "vectors.f32")
+
+        meta_path = os.path.join(self.path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            if meta.get("dimension") != dimension:
+                raise ValueError(f"Dimensi cache ({meta.get('dimension')}) != dimensi model ({dimension})")
+        else:
+            with open(meta_path, 'w') as f:
+                json.dump({"model_name": model_name, "dimension": dimension}, f)
+
+        # Indeks hash -> baris dibangun sekali saat dibuka, lalu disinkronkan tiap add
+        self.lock_path = os.path.join(self.path, "cache.lock")
+        self.rows = {}
+        self.num_rows = 0
+        with _file_lock(self.lock_path):
+            self._repair()
+            self._sync_keys()
+        self.hits = 0
+        self.misses = 0
+
+    def _repair(self):
+        """
+        Memotong kedua file ke jumlah baris yang lengkap di keduanya. Vektor ditulis
+        sebelum kunci, jadi crash di antara dua append meninggalkan vektor tanpa kunci;
+        tanpa dipotong, kunci berikutnya akan menunjuk ke vektor yang salah.
+        Dipanggil dengan lock dipegang.
+        """
+        row_bytes = self.dimension * 4
+        num_keys = os.path.getsize(self.keys_path) // self.KEY_BYTES if os.path.exists(self.keys_path) else 0
+        num_vectors = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        complete = min(num_keys, num_vectors)
+        for path, size in ((self.keys_path, complete * self.KEY_BYTES), (self.vectors_path, complete * row_bytes)):
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                print(f"[EmbeddingCache] Memotong {os.path.basename(path)} ke {complete} baris lengkap.")
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def _sync_keys(self):
+        """
+        Membaca kunci yang ditambahkan process lain sejak sinkronisasi terakhir
+        """
+        keys = read_array(self.keys_path, np.uint8).reshape(-1, self.KEY_BYTES)
+        for row in range(self.num_rows, len(keys)):
+            self.rows.setdefault(keys[row].tobytes(), row)
+        self.num_rows = len(keys)
+        self._refresh_vectors()
+
+    def _refresh_vectors(self):
+        self.vectors = read_array(self.vectors_path, np.float32).reshape(-1, self.dimension)
+
+    def key(self, text):
+        payload = f"{self.model_name}\x1f{text}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=self.KEY_BYTES).digest()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def lookup(self, texts):
+        """
+        Mengembalikan (keys, vectors) dengan vectors[i] = None untuk cache miss
+        """
+        keys = [self.key(t) for t in texts]
+        vectors = []
+        for k in keys:
+            row = self.rows.get(k)
+            if row is None:
+                self.misses += 1
+                vectors.append(None)
+            else:
+                self.hits += 1
+                vectors.append(self.vectors[row])
+        return keys, vectors
+
+    def add(self, keys, vectors):
+        """
+        Menambahkan embedding baru ke ujung file (hanya kunci yang belum ada).
+        Vektor ditulis dulu lalu kunci, di bawah lock file agar build paralel
+        tidak saling menggeser nomor baris.
+        """
+        if all(k in self.rows for k in keys):
+            return
+        with _file_lock(self.lock_path):
+            self._repair()
+            self._sync_keys()
+            new_keys, new_vectors = [], []
+            for k, v in zip(keys, vectors):
+                if k not in self.rows:
+                    self.rows[k] = self.num_rows + len(new_keys)
+                    new_keys.append(np.frombuffer(k, dtype=np.uint8))
+                    new_vectors.append(v)
+            if not new_keys:
+                return
+            append_array(self.vectors_path, np.vstack(new_vectors), np.float32)
+            append_array(self.keys_path, np.concatenate(new_keys), np.uint8)
+            self.num_rows += len(new_keys)
+            self._refresh_vectors()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self),
+            "hit_rate": self.hits / total if total else 0.0
+        }
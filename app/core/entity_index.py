@@ -0,0 +1,186 @@
+import os
+import pickle
+from array import array
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional, Set
+
+# Node dengan nama (setelah lowercase + strip) lebih pendek dari ini tidak pernah di-link
+MIN_NODE_LENGTH = 3
+# Lebar bit untuk karakter pada kunci transisi (state << CHAR_BITS | ord(char))
+CHAR_BITS = 21
+
+class EntityIndex:
+    FORMAT_VERSION = 2
+
+    def __init__(self, nodes: Iterable, aliases: Optional[Dict[str, str]] = None):
+        """
+        Indeks entity linking untuk GraphRetriever, dibangun sekali dari daftar node graf.
+        - Automaton Aho-Corasick atas nama node: semua node yang namanya substring query
+          ditemukan dalam satu kali scan query.
+        - Inverted index token -> posisi node: kandidat keyword match tanpa scan semua node.
+        Posisi node = urutan G.nodes(), sehingga urutan kandidat sama dengan loop lama.
+        aliases (opsional): alias -> nama node kanonik; alias yang muncul di query
+        ikut me-link node kanoniknya (lewat automaton substring).
+        """
+        self.format_version = self.FORMAT_VERSION
+        self.nodes = list(nodes)
+        self.source_stat = None
+
+        node_strs = [str(node).lower().strip() for node in self.nodes]
+        self.token_counts = array('i', (len(set(s.split())) for s in node_strs))
+
+        # Inverted index token -> posisi node
+        postings = {}
+        for pos, node_str in enumerate(node_strs):
+            if len(node_str) < MIN_NODE_LENGTH:
+                continue
+            for token in set(node_str.split()):
+                postings.setdefault(token, array('i')).append(pos)
+        self.postings = postings
+
+        self._build_automaton(node_strs, aliases or {})
+
+    def _build_automaton(self, node_strs, aliases):
+        # Pola unik -> daftar posisi node (beberapa node bisa punya nama lowercase yang sama)
+        pattern_ids = {}
+        self.pattern_nodes = []
+        for pos, node_str in enumerate(node_strs):
+            if len(node_str) < MIN_NODE_LENGTH:
+                continue
+            if node_str not in pattern_ids:
+                pattern_ids[node_str] = len(self.pattern_nodes)
+                self.pattern_nodes.append(array('i'))
+            self.pattern_nodes[pattern_ids[node_str]].append(pos)
+
+        positions = {str(node): pos for pos, node in enumerate(self.nodes)}
+        for alias, canonical in aliases.items():
+            alias_str = str(alias).lower().strip()
+            pos = positions.get(str(canonical))
+            if pos is None or len(alias_str) < MIN_NODE_LENGTH:
+                continue
+            if alias_str not in pattern_ids:
+                pattern_ids[alias_str] = len(self.pattern_nodes)
+                self.pattern_nodes.append(array('i'))
+            self.pattern_nodes[pattern_ids[alias_str]].append(pos)
+
+        # Trie: transisi disimpan di satu dict berkunci int agar hemat memori
+        goto = {}
+        output = array('i', [-1])
+        children = [[]]
+        for pattern, pattern_id in pattern_ids.items():
+            state = 0
+            for ch in pattern:
+                key = (state << CHAR_BITS) | ord(ch)
+                nxt = goto.get(key)
+                if nxt is None:
+                    nxt = len(output)
+                    goto[key] = nxt
+                    output.append(-1)
+                    children.append([])
+                    children[state].append((ch, nxt))
+                state = nxt
+            output[state] = pattern_id
+
+        # Fail link (BFS) + output link ke state ber-output terdekat di rantai fail
+        fail = array('i', [0]) * len(output)
+        out_link = array('i', [0]) * len(output)
+        queue = deque(nxt for _, nxt in children[0])
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in children[state]:
+                f = fail[state]
+                while f and ((f << CHAR_BITS) | ord(ch)) not in goto:
+                    f = fail[f]
+                target = goto.get((f << CHAR_BITS) | ord(ch), 0)
+                fail[nxt] = target if target != nxt else 0
+                out_link[nxt] = fail[nxt] if output[fail[nxt]] >= 0 else out_link[fail[nxt]]
+                queue.append(nxt)
+
+        self.goto = goto
+        self.fail = fail
+        self.output = output
+        self.out_link = out_link
+
+    def substring_matches(self, text: str) -> Set[int]:
+        """
+        Posisi node yang namanya muncul sebagai substring text (setara `node_str in text`)
+        """
+        goto, fail, output, out_link = self.goto, self.fail, self.output, self.out_link
+        matches = set()
+        state = 0
+        for ch in text:
+            code = ord(ch)
+            while state and ((state << CHAR_BITS) | code) not in goto:
+                state = fail[state]
+            state = goto.get((state << CHAR_BITS) | code, 0)
+            s = state if output[state] >= 0 else out_link[state]
+            while s:
+                matches.update(self.pattern_nodes[output[s]])
+                s = out_link[s]
+        return matches
+
+    def keyword_matches(self, keywords: Set[str]) -> Set[int]:
+        """
+        Posisi node dengan token yang beririsan dengan keywords.
+        Node > 2 token wajib beririsan minimal 2 keyword (aturan sama seperti loop lama).
+        """
+        overlap = Counter()
+        for keyword in keywords:
+            overlap.update(self.postings.get(keyword, ()))
+        return {pos for pos, count in overlap.items()
+                if not (self.token_counts[pos] > 2 and count < 2)}
+
+    def candidates(self, query_clean: str, keywords: Set[str]) -> List:
+        """
+        Node kandidat dalam urutan graf (sebelum diurutkan berdasarkan panjang)
+        """
+        positions = self.substring_matches(query_clean) | self.keyword_matches(keywords)
+        return [self.nodes[pos] for pos in sorted(positions)]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def file_stat(graph_path):
+        stat = os.stat(graph_path)
+        return (stat.st_size, int(stat.st_mtime))
+
+    @classmethod
+    def build_for_graph(cls, G, graph_path, index_path=None, aliases=None):
+        """
+        Membangun indeks dari graf lalu menyimpannya di samping file graf
+        """
+        index = cls(G.nodes(), aliases)
+        index.source_stat = cls.file_stat(graph_path)
+        index_path = index_path or entity_index_path(graph_path)
+        try:
+            index.save(index_path)
+        except OSError as e:
+            print(f"[EntityIndex] Gagal menyimpan indeks ke {index_path}: {e}")
+        return index
+
+    @classmethod
+    def load_for_graph(cls, G, graph_path, index_path=None, aliases=None):
+        """
+        Memuat indeks yang tersimpan di samping graf; dibangun ulang jika belum ada
+        atau file graf sudah berubah sejak indeks dibuat.
+        """
+        index_path = index_path or entity_index_path(graph_path)
+        if os.path.exists(index_path):
+            with open(index_path, "rb") as f:
+                index = pickle.load(f)
+            if (getattr(index, "format_version", None) == cls.FORMAT_VERSION
+                    and index.source_stat == cls.file_stat(graph_path)
+                    and len(index) == G.number_of_nodes()):
+                return index
+        print(f"[EntityIndex] Membangun indeks entity linking untuk {graph_path}...")
+        return cls.build_for_graph(G, graph_path, index_path, aliases)
+
+
+def entity_index_path(graph_path):
+    base, _ = os.path.splitext(graph_path)
+    return f"{base}.entity_index.pkl"
@@ -0,0 +1,36 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import List
+
+class EntityChunkIndex:
+    def __init__(self, csv_path):
+        """
+        Postings entity -> chunk_id dari tabel entity linking (entity_linking_{suffix}.csv).
+        Entity di-factorize sekali; chunk_id disimpan berurutan per entity (format CSR),
+        urutan chunk dalam satu entity = urutan baris di CSV.
+        """
+        self.csv_path = csv_path
+        self._entity_codes = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.chunk_ids = np.zeros(0, dtype=object)
+        if not os.path.exists(csv_path):
+            print(f"[EntityLinks] Tabel linking tidak ditemukan: {csv_path}")
+            return
+
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        codes, entities = pd.factorize(df['entity'].to_numpy())
+        order = np.argsort(codes, kind='stable')
+        self.chunk_ids = df['chunk_id'].to_numpy(dtype=object)[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(entities)))])
+        self._entity_codes = {entity: code for code, entity in enumerate(entities)}
+        print(f"[EntityLinks] {len(entities)} entitas, {len(self.chunk_ids)} tautan dimuat.")
+
+    def __len__(self):
+        return len(self._entity_codes)
+
+    def get_chunk_ids(self, entity) -> List[str]:
+        code = self._entity_codes.get(str(entity))
+        if code is None:
+            return []
+        return self.chunk_ids[self.offsets[code]:self.offsets[code + 1]].tolist()
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import sqlite3
+from app.core.config import EXTRACTION_CACHE_PATH
+
+# Batas jumlah parameter per statement "IN (...)"
+IN_BATCH = 500
+
+class ExtractionCache:
+    KEY_BYTES = 16
+
+    def __init__(self, model_name, generation_params, path=EXTRACTION_CACHE_PATH):
+        """
+        Cache hasil ekstraksi REBEL persisten (satu file SQLite, dipakai bersama semua build/suffix).
+        Kunci = hash(model, parameter generate, teks chunk); nilai = triplet hasil parsing (JSON).
+        Beberapa process (worker ekstraksi) boleh membuka file yang sama (WAL).
+        """
+        self.model_name = model_name
+        self.generation_params = dict(generation_params)
+        self.path = path
+        # Namespace kunci: setting yang memengaruhi output model
+        self.namespace = f"{model_name}\x1f{json.dumps(self.generation_params, sort_keys=True)}"
+
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS triplets (key BLOB PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text):
+        payload = f"{self.namespace}\x1f{text}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=self.KEY_BYTES).digest()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM triplets").fetchone()[0]
+
+    def lookup(self, texts):
+        """
+        Mengembalikan (keys, results) dengan results[i] = None untuk cache miss
+        """
+        keys = [self.key(t) for t in texts]
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for i in range(0, len(unique_keys), IN_BATCH):
+            batch = unique_keys[i : i + IN_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            found.update(self.conn.execute(f"SELECT key, value FROM triplets WHERE key IN ({placeholders})", batch))
+
+        results = []
+        for k in keys:
+            value = found.get(k)
+            if value is None:
+                self.misses += 1
+                results.append(None)
+            else:
+                self.hits += 1
+                results.append(json.loads(value))
+        return keys, results
+
+    def add(self, keys, results):
+        """
+        Menyimpan triplet hasil parsing per kunci (kunci yang sudah ada tidak ditimpa)
+        """
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO triplets VALUES (?, ?)",
+                                  ((k, json.dumps(triplets)) for k, triplets in zip(keys, results)))
+
+    def close(self):
+        self.conn.close()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
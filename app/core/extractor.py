@@ -1,24 +1,107 @@
+import os
+import re
 import torch
 import pandas as pd
 import math
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
-from app.core.config import DEVICE
+from app.core.config import (
+    DEVICE,
+    MODEL_DIR,
+    EXTRACTION_BATCHING,
+    EXTRACTION_TOKEN_BUDGET,
+    EXTRACTION_MAX_LENGTH,
+    EXTRACTION_BACKEND,
+    EXTRACTION_PROFILE,
+    GENERATION_PROFILES
+)
+from app.core.extraction_cache import ExtractionCache
+
+REBEL_MODEL_NAME = 'Babelscape/rebel-large'
+
+def extraction_model_key(model_name, backend):
+    # Identitas model untuk cache/checkpoint: output int8/ONNX tidak identik dengan fp32
+    return model_name if backend == "torch" else f"{model_name}#{backend}"
+
+def generation_params(profile):
+    """
+    Parameter model.generate untuk profil di GENERATION_PROFILES
+    """
+    return {
+        "max_length": EXTRACTION_MAX_LENGTH,
+        "length_penalty": 0,
+        "num_return_sequences": 1,
+        **GENERATION_PROFILES[profile],
+    }
 
 class TripletExtractor:
-    def __init__(self, model_name='Babelscape/rebel-large'):
+    def __init__(self, model_name=REBEL_MODEL_NAME, batching=EXTRACTION_BATCHING,
+                 token_budget=EXTRACTION_TOKEN_BUDGET, device=DEVICE, cache_path=None,
+                 backend=EXTRACTION_BACKEND, profile=EXTRACTION_PROFILE):
         """
         Inisialisasi model REBEL untuk ekstraksi relasi.
+        batching: "token_budget" (urut panjang, batch per token budget) atau "fixed".
+        cache_path: file ExtractionCache (None = tanpa cache); chunk yang sudah pernah
+        diekstrak dengan model & parameter yang sama tidak dikirim ke model lagi.
+        backend: "torch" (fp32), "int8" (dynamic quantization, CPU) atau "onnx" (ONNX Runtime, CPU).
+        profile: profil generate di GENERATION_PROFILES (greedy / beam2 / beam3).
         """
-        self.device = DEVICE
-        print(f"[Extractor] Menggunakan device: {self.device}")
+        self.model_name = model_name
+        self.backend = backend
+        # Backend terkuantisasi/ONNX hanya untuk CPU
+        self.device = device if backend == "torch" else "cpu"
+        self.batching = batching
+        self.token_budget = token_budget
+        self.model_key = extraction_model_key(model_name, backend)
+        self.cache_path = cache_path
+        self.set_profile(profile)
+        # Worker process pool mematikan progress bar agar output tidak bertumpuk
+        self.show_progress = True
+        print(f"[Extractor] Menggunakan device: {self.device} (backend: {backend}, profil: {profile})")
         print(f"[Extractor] Memuat model {model_name}...")
         
         # Load tokenizer dan model
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name).to(self.device)
+        self.model = self._load_model()
         print("[Extractor] Model berhasil dimuat.")
-        
+
+    def _load_model(self):
+        if self.backend == "onnx":
+            try:
+                from optimum.onnxruntime import ORTModelForSeq2SeqLM
+            except ImportError:
+                raise ImportError("Backend 'onnx' membutuhkan paket optimum[onnxruntime]")
+            # Export sekali, lalu dipakai ulang dari MODEL_DIR
+            onnx_dir = os.path.join(MODEL_DIR, re.sub(r'[^A-Za-z0-9_.-]+', '_', self.model_name) + "_onnx")
+            if os.path.exists(os.path.join(onnx_dir, "config.json")):
+                return ORTModelForSeq2SeqLM.from_pretrained(onnx_dir)
+            print(f"[Extractor] Export ONNX ke {onnx_dir}...")
+            model = ORTModelForSeq2SeqLM.from_pretrained(self.model_name, export=True)
+            model.save_pretrained(onnx_dir)
+            return model
+
+        model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+        if self.backend == "int8":
+            # Bobot Linear int8, aktivasi dikuantisasi dinamis saat inferensi
+            model = torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+        elif self.backend != "torch":
+            raise ValueError(f"Backend ekstraksi tidak dikenal: {self.backend}")
+        return model.to(self.device)
+
+    def set_profile(self, profile):
+        """
+        Mengganti profil generate; parameter generate juga bagian dari kunci cache
+        """
+        self.profile = profile
+        self.generation_params = generation_params(profile)
+        if getattr(self, "cache", None) is not None:
+            self.cache.close()
+        self.cache = (ExtractionCache(self.model_key, self.generation_params, self.cache_path)
+                      if self.cache_path else None)
+
     def _extract_triplets_from_text(self, text):
         """
         Fungsi helper untuk parsing output raw REBEL
@@ -56,55 +139,194 @@ class TripletExtractor:
             triplets.append({'head': subject.strip(), 'type': relation.strip(), 'tail': object_.strip()})
         return triplets
     
+    def _token_batches(self, lengths, max_batch_size):
+        """
+        Posisi chunk diurutkan berdasarkan panjang token lalu dikelompokkan:
+        biaya batch = jumlah item x panjang terpanjang (token setelah padding) <= token_budget.
+        """
+        order = sorted(range(len(lengths)), key=lengths.__getitem__)
+        batches, current = [], []
+        for pos in order:
+            # Urutan naik: item baru selalu yang terpanjang di batch
+            if current and ((len(current) + 1) * lengths[pos] > self.token_budget
+                            or len(current) >= max_batch_size):
+                batches.append(current)
+                current = []
+            current.append(pos)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _generate(self, inputs):
+        """
+        Beam search REBEL untuk satu batch ter-padding, return teks mentah hasil decode
+        """
+        inputs = inputs.to(self.device)
+        with torch.no_grad():
+            generated_tokens = self.model.generate(**inputs, **self.generation_params)
+        return self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=False)
+
+    def extract_texts(self, texts, batch_size=4):
+        """
+        Ekstraksi triplet untuk list teks. Return list triplet per teks (urutan sama dengan input).
+        Dengan cache: hanya teks unik yang belum ada di cache yang dikirim ke model.
+        """
+        if self.cache is None:
+            return self._extract_uncached(texts, batch_size)
+
+        keys, results = self.cache.lookup(texts)
+        missing = {}
+        for i, triplets in enumerate(results):
+            if triplets is None:
+                missing.setdefault(keys[i], []).append(i)
+        if missing:
+            first_positions = [positions[0] for positions in missing.values()]
+            extracted = self._extract_uncached([texts[i] for i in first_positions], batch_size)
+            self.cache.add(list(missing.keys()), extracted)
+            for positions, triplets in zip(missing.values(), extracted):
+                for i in positions:
+                    results[i] = triplets
+        return results
+
+    def _extract_uncached(self, texts, batch_size=4):
+        """
+        batching "token_budget": semua teks ditokenisasi di awal, diurutkan berdasarkan panjang,
+        dan dibagi per token budget (batch_size = jumlah item maksimum per batch);
+        "fixed": batch berurutan berisi batch_size teks (perilaku lama).
+        """
+        decoded = [None] * len(texts)
+        if self.batching == "token_budget":
+            encoded = self.tokenizer(texts, max_length=EXTRACTION_MAX_LENGTH, truncation=True)
+            lengths = [len(ids) for ids in encoded['input_ids']]
+            batches = self._token_batches(lengths, batch_size)
+            for positions in tqdm(batches, desc="Ekstraksi", disable=not self.show_progress):
+                inputs = self.tokenizer.pad(
+                    {key: [encoded[key][pos] for pos in positions] for key in ('input_ids', 'attention_mask')},
+                    return_tensors='pt'
+                )
+                # Hasil disebar kembali ke posisi asli
+                for pos, pred_text in zip(positions, self._generate(inputs)):
+                    decoded[pos] = pred_text
+        else:
+            num_batches = math.ceil(len(texts) / batch_size)
+            for i in tqdm(range(0, len(texts), batch_size), total=num_batches, desc="Ekstraksi",
+                          disable=not self.show_progress):
+                inputs = self.tokenizer(
+                    texts[i : i + batch_size],
+                    max_length=EXTRACTION_MAX_LENGTH,
+                    padding=True,
+                    truncation=True,
+                    return_tensors='pt'
+                )
+                decoded[i : i + batch_size] = self._generate(inputs)
+        return [self._extract_triplets_from_text(pred_text) for pred_text in decoded]
+
     def process_batch(self, data_chunks, batch_size=4):
         """
         Memproses list of chunks secara batch.
         data_chunks: list of dict (hasil dari preprocessing)
+        Output: DataFrame triplet dalam urutan chunk input.
         """
         results = []
-        total_chunks = len(data_chunks)
-        num_batches = math.ceil(total_chunks / batch_size)
-        print(f"[Extractor] Memulai ekstraksi relasi untuk {total_chunks} chunks...")
-        
-        # Loop per batch
-        for i in tqdm(range(0, total_chunks, batch_size), total=num_batches, desc="Ekstraksi"):
-            batch = data_chunks[i : i + batch_size]
-            texts = [item['text'] for item in batch] # Ambil teksnya
-            
-            # Tokenisasi
-            inputs = self.tokenizer(
-                texts,
-                max_length=256,
-                padding=True,
-                truncation=True,
-                return_tensors='pt'
-            ).to(self.device)
-            
-            # Generate
-            with torch.no_grad():
-                generated_tokens = self.model.generate(
-                    **inputs,
-                    max_length=256,
-                    length_penalty=0,
-                    num_beams=3, # agar hasil lebih variatif/akurat
-                    num_return_sequences=1
-                )
-            
-            # decode hasil
-            decoded_preds = self.tokenizer.batch_decode(generated_tokens, skip_special_tokens=False)
-            
-            # Parsing dan mapping kembali ke id chunk
-            for idx, pred_text in enumerate(decoded_preds):
-                extracted_triplets = self._extract_triplets_from_text(pred_text)
-                source_meta = batch[idx] # Metadata chunk asli
-                
-                for triplet in extracted_triplets:
-                    results.append({
-                        'chunk_id' : source_meta['id'],
-                        'source_title' : source_meta['title'],
-                        'head' : triplet['head'],
-                        'relation' : triplet['type'],
-                        'tail' : triplet['tail'],
-                    })           
+        if self.show_progress:
+            print(f"[Extractor] Memulai ekstraksi relasi untuk {len(data_chunks)} chunks...")
+        texts = [item['text'] for item in data_chunks] # Ambil teksnya
+
+        # Parsing dan mapping kembali ke id chunk
+        for source_meta, extracted_triplets in zip(data_chunks, self.extract_texts(texts, batch_size)):
+            for triplet in extracted_triplets:
+                results.append({
+                    'chunk_id' : source_meta['id'],
+                    'source_title' : source_meta['title'],
+                    'head' : triplet['head'],
+                    'relation' : triplet['type'],
+                    'tail' : triplet['tail'],
+                })
         return pd.DataFrame(results)
-                    
\ No newline at end of file
+
+
+def physical_cores() -> int:
+    """
+    Jumlah core fisik (psutil), fallback ke jumlah CPU logis
+    """
+    try:
+        import psutil
+        cores = psutil.cpu_count(logical=False)
+    except ImportError:
+        cores = None
+    return cores or os.cpu_count() or 1
+
+
+def extract_spans(data_chunks, span_size, batch_size=4, start_index=0, num_workers=1,
+                  extractor=None, model_name=REBEL_MODEL_NAME, threads_per_worker=None,
+                  cache_path=None, ranges=None, backend=EXTRACTION_BACKEND, profile=EXTRACTION_PROFILE):
+    """
+    Ekstraksi triplet per span (span_size chunk) mulai dari start_index, atau per rentang
+    (start, end) pada ranges (mis. rentang yang belum selesai menurut checkpoint).
+    Menghasilkan (start, end, DataFrame triplet atau None, pesan error atau None)
+    dalam urutan span, sehingga satu penulis (mis. checkpoint run_indexing) cukup
+    membaca hasil secara berurutan.
+    - num_workers <= 1 : satu process, memakai extractor (dibuat jika None)
+    - num_workers > 1  : span dibagi ke process pool; tiap worker memuat model sendiri di CPU
+      dengan jumlah thread torch dipatok (default: core fisik / num_workers) agar tidak oversubscribe.
+    cache_path: ExtractionCache yang dipakai bersama semua worker (None = tanpa cache).
+    """
+    if ranges is None:
+        ranges = [(start, min(start + span_size, len(data_chunks)))
+                  for start in range(start_index, len(data_chunks), span_size)]
+    if num_workers <= 1:
+        extractor = extractor or TripletExtractor(model_name, cache_path=cache_path, backend=backend, profile=profile)
+        for start, end in ranges:
+            yield _run_span(extractor, start, end, data_chunks[start:end], batch_size)
+        return
+
+    threads = threads_per_worker or max(1, physical_cores() // num_workers)
+    print(f"[Extractor] {num_workers} worker x {threads} thread torch")
+    # spawn: worker tidak mewarisi state OpenMP/torch dari process utama
+    context = multiprocessing.get_context("spawn")
+    range_iter = iter(ranges)
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=context, initializer=_init_worker,
+                             initargs=(model_name, threads, cache_path, backend, profile)) as executor:
+        # Batasi span yang sedang berjalan agar memori tetap terkendali
+        pending = deque()
+        max_pending = num_workers * 2
+        while True:
+            while len(pending) < max_pending:
+                span = next(range_iter, None)
+                if span is None:
+                    break
+                start, end = span
+                pending.append(executor.submit(_extract_span, start, end, data_chunks[start:end], batch_size))
+            if not pending:
+                break
+            # Ambil hasil sesuai urutan submit
+            yield pending.popleft().result()
+
+
+def _run_span(extractor, start, end, chunks, batch_size):
+    try:
+        return start, end, extractor.process_batch(chunks, batch_size=batch_size), None
+    except Exception as e:
+        return start, end, None, str(e)
+
+
+# Extractor milik process worker (satu model per process)
+_worker_extractor = None
+
+def _init_worker(model_name, num_threads, cache_path, backend, profile):
+    global _worker_extractor
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+    _worker_extractor = TripletExtractor(model_name, device="cpu", cache_path=cache_path,
+                                         backend=backend, profile=profile)
+    _worker_extractor.show_progress = False
+
+
+def _extract_span(start, end, chunks, batch_size):
+    """
+    Worker process pool: ekstraksi satu span dengan model milik worker
+    """
+    return _run_span(_worker_extractor, start, end, chunks, batch_size)
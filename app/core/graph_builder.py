@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import networkx as nx
+from app.core.graph_store import CSRGraph
+from app.core.graph_sqlite import SQLiteGraph
+
+# Builder graf kolumnar: string head/tail di-factorize sekali, lalu adjacency dan
+# tabel entity linking dibentuk dari array (tanpa iterrows per baris triplet).
+
+class TripletArrays:
+    def __init__(self, df_triplets: pd.DataFrame):
+        """
+        Representasi array dari tabel triplet (kolom head, relation, tail, chunk_id)
+        dengan semantik yang sama seperti add_edge berulang pada nx.DiGraph:
+        - node_names : node unik dalam urutan kemunculan pertama (head lalu tail per baris)
+        - src, dst   : id node per edge unik, dalam urutan edge pertama kali ditambahkan
+        - relations, source_ids : atribut dari kemunculan terakhir (add_edge menimpa atribut)
+        - pair_offsets, pair_relations, pair_sources : semua pasangan (relasi, chunk) per edge
+        """
+        heads = df_triplets['head'].to_numpy(dtype=object)
+        tails = df_triplets['tail'].to_numpy(dtype=object)
+
+        # Interleave head/tail agar urutan node = urutan G.add_edge(head, tail)
+        interleaved = np.empty(len(heads) * 2, dtype=object)
+        interleaved[0::2] = heads
+        interleaved[1::2] = tails
+        codes, uniques = pd.factorize(interleaved, use_na_sentinel=False)
+        self.node_names = uniques
+        head_codes, tail_codes = codes[0::2], codes[1::2]
+
+        # Edge unik: posisi kemunculan pertama menentukan urutan, terakhir menentukan atribut
+        edge_keys = head_codes.astype(np.int64) * len(uniques) + tail_codes
+        _, first_pos, inverse = np.unique(edge_keys, return_index=True, return_inverse=True)
+        _, last_pos_rev = np.unique(edge_keys[::-1], return_index=True)
+        last_pos = len(edge_keys) - 1 - last_pos_rev
+        order = np.argsort(first_pos, kind='stable')
+        first_pos, last_pos = first_pos[order], last_pos[order]
+
+        relations = df_triplets['relation'].to_numpy(dtype=object)
+        chunk_ids = df_triplets['chunk_id'].to_numpy(dtype=object)
+        self.src = head_codes[first_pos]
+        self.dst = tail_codes[first_pos]
+        self.relations = relations[last_pos]
+        self.source_ids = chunk_ids[last_pos]
+
+        # Multigraph: semua pasangan (relasi, chunk) unik per edge, urut kemunculan terakhir
+        # (pasangan terakhir = atribut yang disimpan nx.DiGraph)
+        edge_rank = np.empty(len(order), dtype=np.int64)
+        edge_rank[order] = np.arange(len(order))
+        row_edges = edge_rank[np.ravel(inverse)]
+        pairs = pd.DataFrame({'edge': row_edges, 'relation': relations, 'chunk_id': chunk_ids}).drop_duplicates(keep='last')
+        pair_order = np.argsort(pairs['edge'].to_numpy(), kind='stable')
+        pair_edges = pairs['edge'].to_numpy()[pair_order]
+        self.pair_offsets = np.concatenate([[0], np.cumsum(np.bincount(pair_edges, minlength=len(order)))])
+        self.pair_relations = pairs['relation'].to_numpy(dtype=object)[pair_order]
+        self.pair_sources = pairs['chunk_id'].to_numpy(dtype=object)[pair_order]
+
+    def __len__(self):
+        return len(self.src)
+
+
+def build_networkx_graph(df_triplets: pd.DataFrame) -> nx.DiGraph:
+    """
+    nx.DiGraph identik dengan loop iterrows + add_edge (urutan node, tetangga, dan atribut)
+    """
+    arrays = TripletArrays(df_triplets)
+    names = arrays.node_names
+    G = nx.DiGraph()
+    G.add_nodes_from(names)
+    G.add_edges_from(
+        (names[u], names[v], {'relation': rel, 'source_id': sid})
+        for u, v, rel, sid in zip(arrays.src.tolist(), arrays.dst.tolist(), arrays.relations, arrays.source_ids)
+    )
+    return G
+
+
+def build_csr_graph(df_triplets: pd.DataFrame, path) -> CSRGraph:
+    """
+    Menulis CSRGraph langsung dari array triplet (tanpa objek NetworkX perantara)
+    """
+    arrays = TripletArrays(df_triplets)
+    # CSR keluar: edge dikelompokkan per src (stabil -> urutan successor tetap)
+    fwd = np.argsort(arrays.src, kind='stable')
+    position = np.empty(len(fwd), dtype=np.int64)
+    position[fwd] = np.arange(len(fwd))
+    # CSR masuk: urutan predecessor = urutan edge ditambahkan, dikelompokkan per dst
+    rev_order = position[np.argsort(arrays.dst, kind='stable')]
+
+    # Kelompok pasangan per edge ikut dipindah ke urutan CSR keluar
+    pair_counts = np.diff(arrays.pair_offsets)[fwd]
+    pair_offsets = np.concatenate([[0], np.cumsum(pair_counts)])
+    pair_index = (np.repeat(arrays.pair_offsets[:-1][fwd] - pair_offsets[:-1], pair_counts)
+                  + np.arange(pair_offsets[-1]))
+    return CSRGraph.create(
+        path, [str(name) for name in arrays.node_names],
+        arrays.src[fwd], arrays.dst[fwd],
+        arrays.relations[fwd], arrays.source_ids[fwd], rev_order,
+        pair_offsets, arrays.pair_relations[pair_index], arrays.pair_sources[pair_index]
+    )
+
+
+def build_sqlite_graph(df_triplets: pd.DataFrame, path, df_aliases: pd.DataFrame = None) -> SQLiteGraph:
+    """
+    Menulis SQLiteGraph langsung dari array triplet (tanpa objek NetworkX perantara).
+    df_aliases (opsional): tabel alias [alias, canonical] hasil canonicalize_triplets.
+    """
+    arrays = TripletArrays(df_triplets)
+    aliases = None if df_aliases is None else dict(zip(df_aliases['alias'], df_aliases['canonical']))
+    return SQLiteGraph.create(
+        path, arrays.node_names, arrays.src, arrays.dst, arrays.relations, arrays.source_ids,
+        arrays.pair_offsets, arrays.pair_relations, arrays.pair_sources, aliases
+    )
+
+
+def build_linking_table(df_triplets: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tabel entity -> chunk_id (head & tail tiap triplet), tanpa duplikat,
+    dengan urutan baris yang sama seperti loop lama
+    """
+    chunk_ids = df_triplets['chunk_id'].to_numpy(dtype=object)
+    entities = np.empty(len(chunk_ids) * 2, dtype=object)
+    entities[0::2] = df_triplets['head'].to_numpy(dtype=object)
+    entities[1::2] = df_triplets['tail'].to_numpy(dtype=object)
+    df_linking = pd.DataFrame({'entity': entities, 'chunk_id': np.repeat(chunk_ids, 2)})
+    return df_linking.drop_duplicates().reset_index(drop=True)
@@ -0,0 +1,312 @@
+import math
+import os
+import sqlite3
+import numpy as np
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set
+from app.core.config import GRAPH_SQLITE_CACHE_MB
+from app.core.entity_index import MIN_NODE_LENGTH
+
+# Skema graph store SQLite. Id node = urutan kemunculan pertama (sama dengan G.nodes()),
+# id edge = urutan edge pertama kali ditambahkan (sama dengan urutan successor/predecessor DiGraph).
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE nodes (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, name_lower TEXT, token_count INTEGER);
+CREATE TABLE edges (id INTEGER PRIMARY KEY, src INTEGER NOT NULL, dst INTEGER NOT NULL,
+                    relation TEXT, source_id TEXT);
+CREATE TABLE edge_pairs (edge_id INTEGER NOT NULL, row INTEGER NOT NULL, relation TEXT, source_id TEXT,
+                         PRIMARY KEY (edge_id, row)) WITHOUT ROWID;
+CREATE TABLE aliases (alias TEXT PRIMARY KEY, canonical TEXT NOT NULL);
+CREATE TABLE node_tokens (token TEXT NOT NULL, node_id INTEGER NOT NULL,
+                          PRIMARY KEY (token, node_id)) WITHOUT ROWID;
+CREATE TABLE alias_keys (alias_lower TEXT NOT NULL, node_id INTEGER NOT NULL,
+                         PRIMARY KEY (alias_lower, node_id)) WITHOUT ROWID;
+"""
+
+INDEXES = """
+CREATE INDEX nodes_lower ON nodes (name_lower);
+CREATE UNIQUE INDEX edges_pair ON edges (src, dst);
+CREATE INDEX edges_src ON edges (src, id);
+CREATE INDEX edges_dst ON edges (dst, id);
+"""
+
+# Query tetap (parameterized): sqlite3 menyimpan statement yang sudah di-compile di cache koneksi,
+# jadi tiap query hanya di-prepare sekali per koneksi.
+SQL_NODE_ID = "SELECT id FROM nodes WHERE name = ?"
+SQL_NODE_NAME = "SELECT name FROM nodes WHERE id = ?"
+SQL_OUT_EDGES = """SELECT e.id, n.name, p.relation, p.source_id FROM edges e
+                   JOIN nodes n ON n.id = e.dst JOIN edge_pairs p ON p.edge_id = e.id
+                   WHERE e.src = ? ORDER BY e.id, p.row"""
+SQL_IN_EDGES = """SELECT e.id, n.name, p.relation, p.source_id FROM edges e
+                  JOIN nodes n ON n.id = e.src JOIN edge_pairs p ON p.edge_id = e.id
+                  WHERE e.dst = ? ORDER BY e.id, p.row"""
+SQL_EDGE = "SELECT id, relation, source_id FROM edges WHERE src = ? AND dst = ?"
+SQL_EDGE_PAIRS = "SELECT relation, source_id FROM edge_pairs WHERE edge_id = ? ORDER BY row"
+
+# Batas jumlah parameter per statement "IN (...)"
+IN_BATCH = 500
+
+def _lower_key(name) -> str:
+    # Normalisasi yang sama dengan EntityIndex (str.lower Python, bukan lower() SQLite)
+    return str(name).lower().strip()
+
+def _token_count(name) -> int:
+    return len(set(_lower_key(name).split()))
+
+def _text(value) -> Optional[str]:
+    # Nilai kosong dari pandas (NaN/None) disimpan sebagai NULL (atribut tidak ada)
+    return None if value is None or (isinstance(value, float) and math.isnan(value)) else str(value)
+
+def _attrs(relation, source_id) -> Dict:
+    data = {}
+    if relation is not None:
+        data['relation'] = relation
+    if source_id is not None:
+        data['source_id'] = source_id
+    return data
+
+
+class SQLiteNodes:
+    def __init__(self, graph):
+        """
+        Daftar node graf yang dibaca lazy dari SQLite (posisi = id - 1),
+        pengganti list nama node di memori.
+        """
+        self.graph = graph
+
+    def __len__(self):
+        return self.graph.number_of_nodes()
+
+    def __getitem__(self, position):
+        row = self.graph.conn.execute(SQL_NODE_NAME, (int(position) + 1,)).fetchone()
+        if row is None:
+            raise IndexError(position)
+        return row[0]
+
+    def __iter__(self):
+        cursor = self.graph.conn.execute("SELECT name FROM nodes ORDER BY id")
+        for (name,) in cursor:
+            yield name
+
+
+class SQLiteGraph:
+    FORMAT_VERSION = 1
+
+    def __init__(self, path, cache_mb=GRAPH_SQLITE_CACHE_MB):
+        """
+        Graf berarah di file SQLite (tabel node, edge, pasangan relasi/sumber, alias),
+        dibuka read-only. Memori terbatas pada page cache SQLite (cache_mb) karena
+        tetangga & entity linking dibaca per query lewat index B-tree.
+        API meniru subset nx.DiGraph / CSRGraph yang dipakai GraphRetriever.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Graph store SQLite tidak ditemukan: {path}")
+        self.path = path
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self.conn.execute(f"PRAGMA cache_size = -{int(cache_mb * 1024)}")
+        self.conn.execute("PRAGMA query_only = ON")
+        self.meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        self._num_nodes = int(self.meta["num_nodes"])
+        self._num_edges = int(self.meta["num_edges"])
+        self._nodes = SQLiteNodes(self)
+
+    def close(self):
+        self.conn.close()
+
+    @classmethod
+    def create(cls, path, node_names, src, dst, relations, source_ids,
+               pair_offsets, pair_relations, pair_sources, aliases: Optional[Dict[str, str]] = None,
+               batch_size=100000):
+        """
+        Menulis graph store SQLite dari array edge (TripletArrays atas triplet kanonik),
+        sumber yang sama dengan build_networkx_graph/build_csr_graph.
+        node_names: urutan node graf (id = posisi + 1); src/dst: id node per edge dalam urutan
+        edge pertama kali ditambahkan; pair_*: semua pasangan (relasi, sumber) per edge.
+        aliases (opsional): alias -> nama kanonik untuk entity linking.
+        """
+        print(f"[GraphSQLite] Menulis graph store -> {path}...")
+        tmp_path = f"{path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+
+        def insert(sql, rows):
+            rows = iter(rows)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                conn.executemany(sql, batch)
+
+        # 1. Node (id = posisi + 1) + postings token & kunci alias (aturan sama dengan EntityIndex)
+        names = [str(name) for name in node_names]
+        insert("INSERT INTO nodes VALUES (?, ?, ?, ?)",
+               ((i + 1, name, _lower_key(name), _token_count(name)) for i, name in enumerate(names)))
+        insert("INSERT INTO node_tokens VALUES (?, ?)",
+               ((token, i + 1) for i, name in enumerate(names)
+                if len(_lower_key(name)) >= MIN_NODE_LENGTH for token in set(_lower_key(name).split())))
+        node_ids = {name: i + 1 for i, name in enumerate(names)}
+        aliases = aliases or {}
+        insert("INSERT OR REPLACE INTO aliases VALUES (?, ?)",
+               ((str(alias), str(canonical)) for alias, canonical in aliases.items()))
+        insert("INSERT OR IGNORE INTO alias_keys VALUES (?, ?)",
+               ((_lower_key(alias), node_ids[str(canonical)]) for alias, canonical in aliases.items()
+                if str(canonical) in node_ids and len(_lower_key(alias)) >= MIN_NODE_LENGTH))
+        del node_ids
+
+        # 2. Edge (id = urutan edge ditambahkan, atribut = kemunculan terakhir) + semua pasangannya
+        insert("INSERT INTO edges VALUES (?, ?, ?, ?, ?)",
+               ((i + 1, int(u) + 1, int(v) + 1, _text(rel), _text(sid))
+                for i, (u, v, rel, sid) in enumerate(zip(src, dst, relations, source_ids))))
+        edge_of_pair = np.repeat(np.arange(1, len(pair_offsets)), np.diff(pair_offsets))
+        insert("INSERT INTO edge_pairs VALUES (?, ?, ?, ?)",
+               ((int(edge_id), row, _text(rel), _text(sid))
+                for row, (edge_id, rel, sid) in enumerate(zip(edge_of_pair, pair_relations, pair_sources))))
+        conn.executescript(INDEXES)
+
+        max_key_length = conn.execute("""
+            SELECT MAX(m) FROM (SELECT MAX(length(name_lower)) AS m FROM nodes
+                                UNION ALL SELECT MAX(length(alias_lower)) FROM alias_keys)""").fetchone()[0]
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("format_version", str(cls.FORMAT_VERSION)),
+            ("num_nodes", str(len(names))),
+            ("num_edges", str(len(src))),
+            ("max_key_length", str(max_key_length or 0)),
+        ])
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.close()
+        # File final baru muncul setelah build lengkap
+        os.replace(tmp_path, path)
+        print(f"[GraphSQLite] Selesai: {len(names)} node, {len(src)} edge.")
+        return cls(path)
+
+    # --- API kompatibel nx.DiGraph ---
+    def node_id(self, node) -> Optional[int]:
+        row = self.conn.execute(SQL_NODE_ID, (str(node),)).fetchone()
+        return None if row is None else row[0]
+
+    def _require_id(self, node) -> int:
+        node_id = self.node_id(node)
+        if node_id is None:
+            raise KeyError(f"Node {node} tidak ada di graf")
+        return node_id
+
+    def nodes(self):
+        return self._nodes
+
+    def number_of_nodes(self) -> int:
+        return self._num_nodes
+
+    def number_of_edges(self) -> int:
+        return self._num_edges
+
+    def __len__(self):
+        return self.number_of_nodes()
+
+    def __contains__(self, node):
+        return self.node_id(node) is not None
+
+    def has_node(self, node) -> bool:
+        return node in self
+
+    def successors(self, node) -> Iterator[str]:
+        return (neighbor for neighbor, _ in self.neighbor_edges(node, "out"))
+
+    def predecessors(self, node) -> Iterator[str]:
+        return (neighbor for neighbor, _ in self.neighbor_edges(node, "in"))
+
+    def neighbor_edges(self, node, direction="out", multi=False) -> Iterator:
+        """
+        (tetangga, atribut edge) untuk satu arah, dibaca streaming dari cursor.
+        multi=True: atribut berupa list semua pasangan (relasi, sumber) antar kedua node.
+        """
+        node_id = self._require_id(node)
+        cursor = self.conn.execute(SQL_OUT_EDGES if direction == "out" else SQL_IN_EDGES, (node_id,))
+        current_edge, neighbor, pairs = None, None, []
+        for edge_id, name, relation, source_id in cursor:
+            if edge_id != current_edge and current_edge is not None:
+                yield neighbor, (pairs if multi else pairs[-1])
+                pairs = []
+            current_edge, neighbor = edge_id, name
+            pairs.append(_attrs(relation, source_id))
+        if current_edge is not None:
+            yield neighbor, (pairs if multi else pairs[-1])
+
+    def _edge_row(self, u, v):
+        u_id, v_id = self.node_id(u), self.node_id(v)
+        if u_id is None or v_id is None:
+            return None
+        return self.conn.execute(SQL_EDGE, (u_id, v_id)).fetchone()
+
+    def get_edge_data(self, u, v, default=None):
+        row = self._edge_row(u, v)
+        return default if row is None else _attrs(row[1], row[2])
+
+    def get_all_edge_data(self, u, v, default=None):
+        row = self._edge_row(u, v)
+        if row is None:
+            return default
+        return [_attrs(relation, source_id) for relation, source_id in self.conn.execute(SQL_EDGE_PAIRS, (row[0],))]
+
+    def has_edge(self, u, v) -> bool:
+        return self._edge_row(u, v) is not None
+
+
+class SQLiteEntityIndex:
+    def __init__(self, graph: SQLiteGraph):
+        """
+        Entity linking di atas tabel nodes/node_tokens/alias_keys (pengganti EntityIndex
+        di memori). Hasil candidates() sama dengan EntityIndex: substring nama node/alias
+        di query + keyword match, dalam urutan node graf.
+        """
+        self.graph = graph
+        self.nodes = graph.nodes()
+        self.max_key_length = int(graph.meta.get("max_key_length", 0))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _select_ids(self, sql, values) -> Iterator:
+        values = list(values)
+        for i in range(0, len(values), IN_BATCH):
+            batch = values[i : i + IN_BATCH]
+            yield from self.graph.conn.execute(sql.format(",".join("?" * len(batch))), batch)
+
+    def substring_matches(self, text: str) -> Set[int]:
+        """
+        Id node yang nama (atau aliasnya) muncul sebagai substring text.
+        Hanya substring dengan panjang MIN_NODE_LENGTH..max_key_length yang dicek (lookup index).
+        """
+        longest = min(self.max_key_length, len(text))
+        substrings = {text[i : i + n] for n in range(MIN_NODE_LENGTH, longest + 1)
+                      for i in range(len(text) - n + 1)}
+        matches = {node_id for (node_id,) in self._select_ids(
+            "SELECT id FROM nodes WHERE name_lower IN ({})", substrings)}
+        matches.update(node_id for (node_id,) in self._select_ids(
+            "SELECT node_id FROM alias_keys WHERE alias_lower IN ({})", substrings))
+        return matches
+
+    def keyword_matches(self, keywords: Set[str]) -> Set[int]:
+        """
+        Id node dengan token yang beririsan dengan keywords (node > 2 token butuh minimal 2)
+        """
+        overlap = Counter()
+        token_counts = {}
+        for node_id, token_count in self._select_ids(
+                "SELECT t.node_id, n.token_count FROM node_tokens t JOIN nodes n ON n.id = t.node_id "
+                "WHERE t.token IN ({})", keywords):
+            overlap[node_id] += 1
+            token_counts[node_id] = token_count
+        return {node_id for node_id, count in overlap.items()
+                if not (token_counts[node_id] > 2 and count < 2)}
+
+    def candidates(self, query_clean: str, keywords: Set[str]) -> List:
+        """
+        Node kandidat dalam urutan graf (sebelum diurutkan berdasarkan panjang)
+        """
+        node_ids = sorted(self.substring_matches(query_clean) | self.keyword_matches(keywords))
+        names = dict(self._select_ids("SELECT id, name FROM nodes WHERE id IN ({})", node_ids))
+        return [names[node_id] for node_id in node_ids]
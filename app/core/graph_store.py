@@ -0,0 +1,226 @@
+import json
+import os
+import pickle
+import shutil
+import numpy as np
+from typing import Dict, Iterator, List, Optional
+from app.core.columnar import StringTable, DictionaryColumn, read_array, append_array
+
+class CSRGraph:
+    FORMAT_VERSION = 2
+
+    def __init__(self, path):
+        """
+        Graf berarah kompak (pengganti pickle nx.DiGraph), di-memory-map dari direktori:
+        - nodes.*           : nama node ter-intern, id node = nomor baris
+        - fwd.offsets/.targets          : CSR keluar (urutan tetangga = urutan G.successors)
+        - rev.offsets/.sources/.edges   : CSR masuk (urutan = G.predecessors) + id edge
+        - relation.codes / source_id.codes : kolom edge terenkode dictionary (nilai terakhir, semantik DiGraph)
+        - pair.offsets + pair_relation.codes / pair_source.codes : SEMUA pasangan
+          (relasi, chunk sumber) per pasangan node (multigraph), array paralel per edge
+        API meniru subset nx.DiGraph yang dipakai GraphRetriever.
+        """
+        self.path = path
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"Graph store tidak ditemukan: {path}")
+        with open(meta_path, 'r') as f:
+            self.meta = json.load(f)
+
+        self.node_names = StringTable(path, "nodes", hashed=True)
+        self.fwd_offsets = read_array(os.path.join(path, "fwd.offsets"), np.int64)
+        self.fwd_targets = read_array(os.path.join(path, "fwd.targets"), np.int32)
+        self.rev_offsets = read_array(os.path.join(path, "rev.offsets"), np.int64)
+        self.rev_sources = read_array(os.path.join(path, "rev.sources"), np.int32)
+        self.rev_edges = read_array(os.path.join(path, "rev.edges"), np.int64)
+        self.relation_col = DictionaryColumn(path, "relation", StringTable(path, "relations", hashed=True))
+        self.source_col = DictionaryColumn(path, "source_id", StringTable(path, "source_ids", hashed=True))
+        # Store versi 1 tidak punya kolom pasangan: tiap edge dianggap punya satu pasangan
+        self.has_pairs = os.path.exists(os.path.join(path, "pair.offsets"))
+        if self.has_pairs:
+            self.pair_offsets = read_array(os.path.join(path, "pair.offsets"), np.int64)
+            self.pair_relation_col = DictionaryColumn(path, "pair_relation", self.relation_col.dictionary)
+            self.pair_source_col = DictionaryColumn(path, "pair_source", self.source_col.dictionary)
+
+    @classmethod
+    def create(cls, path, node_names, src, dst, relations, source_ids, rev_order=None,
+               pair_offsets=None, pair_relations=None, pair_sources=None):
+        """
+        Menulis graph store dari array edge.
+        src/dst: id node per edge, sudah terurut (stabil) berdasarkan src.
+        rev_order: permutasi edge untuk CSR masuk; default urut stabil berdasarkan dst.
+        pair_*: semua pasangan (relasi, sumber) per edge (urutan edge sama dengan src/dst);
+        default satu pasangan per edge = (relations, source_ids).
+        """
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.makedirs(path)
+
+        num_nodes = len(node_names)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if rev_order is None:
+            rev_order = np.argsort(dst, kind='stable')
+        rev_order = np.asarray(rev_order, dtype=np.int64)
+
+        StringTable.create(path, "nodes", node_names, hashed=True)
+        fwd_offsets = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=num_nodes))])
+        rev_offsets = np.concatenate([[0], np.cumsum(np.bincount(dst, minlength=num_nodes))])
+        append_array(os.path.join(path, "fwd.offsets"), fwd_offsets, np.int64)
+        append_array(os.path.join(path, "fwd.targets"), dst, np.int32)
+        append_array(os.path.join(path, "rev.offsets"), rev_offsets, np.int64)
+        append_array(os.path.join(path, "rev.sources"), src[rev_order], np.int32)
+        append_array(os.path.join(path, "rev.edges"), rev_order, np.int64)
+
+        relation_col = DictionaryColumn.create(path, "relation", StringTable.create(path, "relations", hashed=True))
+        source_col = DictionaryColumn.create(path, "source_id", StringTable.create(path, "source_ids", hashed=True))
+        relation_cache, source_cache = {}, {}
+        relation_col.append_codes(relation_col.encode(relations, relation_cache))
+        source_col.append_codes(source_col.encode(source_ids, source_cache))
+
+        if pair_offsets is None:
+            pair_offsets = np.arange(len(src) + 1)
+            pair_relations, pair_sources = relations, source_ids
+        append_array(os.path.join(path, "pair.offsets"), pair_offsets, np.int64)
+        pair_relation_col = DictionaryColumn.create(path, "pair_relation", relation_col.dictionary)
+        pair_source_col = DictionaryColumn.create(path, "pair_source", source_col.dictionary)
+        pair_relation_col.append_codes(pair_relation_col.encode(pair_relations, relation_cache))
+        pair_source_col.append_codes(pair_source_col.encode(pair_sources, source_cache))
+
+        # meta.json ditulis terakhir: direktori tanpa meta dianggap build yang belum selesai
+        with open(os.path.join(path, "meta.json"), 'w') as f:
+            json.dump({"format_version": cls.FORMAT_VERSION,
+                       "num_nodes": int(num_nodes), "num_edges": int(len(src))}, f)
+        return cls(path)
+
+    @classmethod
+    def from_networkx(cls, G, path):
+        """
+        Konversi nx.DiGraph -> graph store, mempertahankan urutan node dan tetangga
+        """
+        node_names = [str(node) for node in G.nodes()]
+        node_ids = {node: i for i, node in enumerate(G.nodes())}
+        src, dst, relations, source_ids = [], [], [], []
+        edge_ids = {}
+        for u, neighbors in G.adj.items():
+            for v, data in neighbors.items():
+                edge_ids[(u, v)] = len(src)
+                src.append(node_ids[u])
+                dst.append(node_ids[v])
+                relations.append(data.get('relation'))
+                source_ids.append(data.get('source_id'))
+        rev_order = [edge_ids[(u, v)] for v, preds in G.pred.items() for u in preds]
+        return cls.create(path, node_names, src, dst, relations, source_ids, rev_order)
+
+    @classmethod
+    def from_pickle(cls, pkl_path, path):
+        """
+        Migrasi graf pickle lama (nx.DiGraph) ke graph store kolumnar
+        """
+        print(f"[GraphStore] Migrasi {pkl_path} -> {path}...")
+        with open(pkl_path, 'rb') as f:
+            G = pickle.load(f)
+        store = cls.from_networkx(G, path)
+        print(f"[GraphStore] Migrasi selesai: {store.number_of_nodes()} node, {store.number_of_edges()} edge.")
+        return store
+
+    # --- API kompatibel nx.DiGraph ---
+    def node_id(self, node) -> Optional[int]:
+        return self.node_names.lookup(str(node))
+
+    def _require_id(self, node) -> int:
+        node_id = self.node_id(node)
+        if node_id is None:
+            raise KeyError(f"Node {node} tidak ada di graf")
+        return node_id
+
+    def nodes(self):
+        return self.node_names
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_names)
+
+    def number_of_edges(self) -> int:
+        return len(self.fwd_targets)
+
+    def __len__(self):
+        return self.number_of_nodes()
+
+    def __contains__(self, node):
+        return self.node_id(node) is not None
+
+    def has_node(self, node) -> bool:
+        return node in self
+
+    def successors(self, node) -> Iterator[str]:
+        node_id = self._require_id(node)
+        start, end = self.fwd_offsets[node_id], self.fwd_offsets[node_id + 1]
+        return (self.node_names[t] for t in self.fwd_targets[start:end])
+
+    def predecessors(self, node) -> Iterator[str]:
+        node_id = self._require_id(node)
+        start, end = self.rev_offsets[node_id], self.rev_offsets[node_id + 1]
+        return (self.node_names[s] for s in self.rev_sources[start:end])
+
+    def neighbor_edges(self, node, direction="out", multi=False) -> Iterator:
+        """
+        (tetangga, atribut edge) untuk satu arah, tanpa lookup ulang per edge.
+        multi=True: atribut berupa list semua pasangan (relasi, sumber) antar kedua node.
+        """
+        node_id = self._require_id(node)
+        attrs = self.edge_pairs if multi else self.edge_attrs
+        if direction == "out":
+            start, end = self.fwd_offsets[node_id], self.fwd_offsets[node_id + 1]
+            for edge_id in range(start, end):
+                yield self.node_names[self.fwd_targets[edge_id]], attrs(edge_id)
+        else:
+            start, end = self.rev_offsets[node_id], self.rev_offsets[node_id + 1]
+            for pos in range(start, end):
+                yield self.node_names[self.rev_sources[pos]], attrs(self.rev_edges[pos])
+
+    def edge_id(self, u, v) -> Optional[int]:
+        u_id, v_id = self.node_id(u), self.node_id(v)
+        if u_id is None or v_id is None:
+            return None
+        start = self.fwd_offsets[u_id]
+        hits = np.flatnonzero(self.fwd_targets[start:self.fwd_offsets[u_id + 1]] == v_id)
+        return int(start + hits[0]) if len(hits) else None
+
+    def edge_attrs(self, edge_id) -> Dict:
+        data = {}
+        relation = self.relation_col[edge_id]
+        if relation is not None:
+            data['relation'] = relation
+        source_id = self.source_col[edge_id]
+        if source_id is not None:
+            data['source_id'] = source_id
+        return data
+
+    def edge_pairs(self, edge_id) -> List[Dict]:
+        """
+        Semua pasangan (relasi, chunk sumber) sebuah edge, urut kemunculan saat build
+        """
+        if not self.has_pairs:
+            return [self.edge_attrs(edge_id)]
+        pairs = []
+        for pos in range(self.pair_offsets[edge_id], self.pair_offsets[edge_id + 1]):
+            data = {}
+            relation = self.pair_relation_col[pos]
+            if relation is not None:
+                data['relation'] = relation
+            source_id = self.pair_source_col[pos]
+            if source_id is not None:
+                data['source_id'] = source_id
+            pairs.append(data)
+        return pairs
+
+    def get_all_edge_data(self, u, v, default=None):
+        edge_id = self.edge_id(u, v)
+        return default if edge_id is None else self.edge_pairs(edge_id)
+
+    def get_edge_data(self, u, v, default=None):
+        edge_id = self.edge_id(u, v)
+        return default if edge_id is None else self.edge_attrs(edge_id)
+
+    def has_edge(self, u, v) -> bool:
+        return self.edge_id(u, v) is not None
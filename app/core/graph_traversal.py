@@ -0,0 +1,158 @@
+import numpy as np
+from typing import Dict, List, Optional
+from app.core.config import (
+    GRAPH_MAX_FACTS,
+    GRAPH_NODE_BUDGET,
+    GRAPH_EDGE_BUDGET,
+    GRAPH_FANOUT,
+    GRAPH_PPR_ALPHA,
+    GRAPH_PPR_ITERATIONS
+)
+
+class GraphTraverser:
+    def __init__(self, G, max_facts=GRAPH_MAX_FACTS, node_budget=GRAPH_NODE_BUDGET,
+                 edge_budget=GRAPH_EDGE_BUDGET, fanout=GRAPH_FANOUT):
+        """
+        Penelusuran k-hop dua arah (successor & predecessor) dengan ekspansi frontier.
+        Bekerja di atas nx.DiGraph maupun CSRGraph (API successors/predecessors/get_edge_data).
+        - node_budget : maksimum node yang diekspansi per query
+        - edge_budget : maksimum edge yang diperiksa per query
+        - fanout      : maksimum edge per arah per node mulai hop ke-2 (meredam hub)
+        """
+        self.G = G
+        self.max_facts = max_facts
+        self.node_budget = node_budget
+        self.edge_budget = edge_budget
+        self.fanout = fanout
+
+    def _neighbor_edges(self, node, direction):
+        """
+        (tetangga, list pasangan atribut edge). CSRGraph menyediakan semua pasangan
+        (relasi, sumber) per pasangan node; graf lain (DiGraph) lewat get_edge_data.
+        """
+        if hasattr(self.G, "neighbor_edges"):
+            yield from self.G.neighbor_edges(node, direction, multi=True)
+            return
+        if direction == "out":
+            for neighbor in self.G.successors(node):
+                yield neighbor, [self.G.get_edge_data(node, neighbor)]
+        else:
+            for neighbor in self.G.predecessors(node):
+                yield neighbor, [self.G.get_edge_data(neighbor, node)]
+
+    def traverse(self, start_nodes: List, depth: int = 1, rank: Optional[str] = None) -> List[Dict]:
+        """
+        Mengembalikan fakta graf (dict text/chunk_id|source_id/sources/score/type/title).
+        rank=None : urutan BFS (hop 1 dulu), berhenti saat max_facts tercapai.
+                    depth=1 menghasilkan output yang sama dengan traversal 1-hop lama.
+        rank="ppr": semua fakta dalam budget dikumpulkan lalu diurutkan dengan
+                    personalized PageRank (seed = start_nodes) atas subgraf yang dijelajahi.
+        """
+        facts = []
+        edges = []
+        seen_facts = set()
+        visited = set(start_nodes)
+        frontier = list(start_nodes)
+        nodes_expanded = 0
+        edges_seen = 0
+        collect_all = rank == "ppr"
+
+        for hop in range(1, depth + 1):
+            next_frontier = []
+            for node in frontier:
+                if nodes_expanded >= self.node_budget or edges_seen >= self.edge_budget:
+                    break
+                nodes_expanded += 1
+                if node not in self.G:
+                    # Node kandidat dari luar graf (mis. start_nodes manual) dilewati
+                    print(f"[GraphTraverser] Node '{node}' tidak ada di graf, dilewati.")
+                    continue
+
+                for direction in ("out", "in"):
+                    for i, (neighbor, pairs) in enumerate(self._neighbor_edges(node, direction)):
+                        if edges_seen >= self.edge_budget or (hop > 1 and i >= self.fanout):
+                            break
+                        edges_seen += 1
+                        head, tail = (node, neighbor) if direction == "out" else (neighbor, node)
+                        if neighbor not in visited:
+                            visited.add(neighbor)
+                            next_frontier.append(neighbor)
+
+                        # Satu fakta per relasi; chunk sumber dari semua kemunculan disimpan di "sources"
+                        sources_by_relation = {}
+                        for edge_data in pairs:
+                            relation = edge_data.get('relation', 'related_to')
+                            sources_by_relation.setdefault(relation, []).append(edge_data.get('source_id'))
+
+                        for relation, sources in sources_by_relation.items():
+                            fact = f"{head} ({relation}) {tail}"
+                            if fact in seen_facts:
+                                continue
+                            seen_facts.add(fact)
+                            # Kunci id sumber sengaja sama dengan format lama: out -> chunk_id, in -> source_id
+                            # (nilainya kemunculan terakhir, seperti atribut nx.DiGraph)
+                            id_key = "chunk_id" if direction == "out" else "source_id"
+                            facts.append({
+                                "text": fact,
+                                id_key: sources[-1],
+                                "sources": sources,
+                                "score": 1.0, "type": f"graph_{direction}", "title": f"Graph: {node}"
+                            })
+                            edges.append((head, tail))
+                            if not collect_all and len(facts) >= self.max_facts:
+                                return facts
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        if collect_all and facts:
+            facts = self._rank_ppr(facts, edges, start_nodes)
+        return facts[:self.max_facts]
+
+    def _rank_ppr(self, facts, edges, start_nodes):
+        """
+        Skor fakta = PPR(head) + PPR(tail) pada subgraf hasil penelusuran (tak berarah)
+        """
+        scores = personalized_pagerank(edges, start_nodes)
+        for item, (head, tail) in zip(facts, edges):
+            item["score"] = float(scores.get(head, 0.0) + scores.get(tail, 0.0))
+        order = sorted(range(len(facts)), key=lambda i: facts[i]["score"], reverse=True)
+        return [facts[i] for i in order]
+
+
+def personalized_pagerank(edges, seeds, alpha=GRAPH_PPR_ALPHA, iterations=GRAPH_PPR_ITERATIONS) -> Dict:
+    """
+    Personalized PageRank (power iteration) dengan matriks transisi sparse.
+    alpha = peluang teleport kembali ke node seed.
+    """
+    from scipy import sparse
+
+    node_ids = {}
+    for head, tail in edges:
+        node_ids.setdefault(head, len(node_ids))
+        node_ids.setdefault(tail, len(node_ids))
+    for seed in seeds:
+        node_ids.setdefault(seed, len(node_ids))
+    n = len(node_ids)
+
+    rows = np.array([node_ids[h] for h, _ in edges] + [node_ids[t] for _, t in edges], dtype=np.int64)
+    cols = np.array([node_ids[t] for _, t in edges] + [node_ids[h] for h, _ in edges], dtype=np.int64)
+    adjacency = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+    adjacency.data[:] = 1.0  # edge ganda dihitung sekali
+    degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    inv_degree = np.divide(1.0, degree, out=np.zeros(n), where=degree > 0)
+    transition_t = (sparse.diags(inv_degree) @ adjacency).T.tocsr()
+
+    personalization = np.zeros(n)
+    for seed in seeds:
+        personalization[node_ids[seed]] = 1.0
+    personalization /= personalization.sum()
+
+    scores = personalization.copy()
+    for _ in range(iterations):
+        spread = transition_t @ scores
+        # Massa dari node tanpa tetangga dikembalikan ke seed
+        dangling = scores[degree == 0].sum()
+        scores = alpha * personalization + (1 - alpha) * (spread + dangling * personalization)
+
+    return {node: scores[i] for node, i in node_ids.items()}
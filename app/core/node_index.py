@@ -0,0 +1,82 @@
+import json
+import os
+import faiss
+import numpy as np
+from app.core.config import NODE_INDEX_FACTORY
+from app.core.entity_index import EntityIndex
+from app.core.vector_store import create_faiss_index, resolve_index_factory, set_search_params
+
+class NodeVectorIndex:
+    FORMAT_VERSION = 1
+
+    def __init__(self, path):
+        """
+        Index FAISS atas embedding nama node graf (id FAISS = posisi node di G.nodes()).
+        Dipakai untuk entity linking semantik: satu pencarian ANN per query,
+        biaya tidak bergantung pada jumlah node.
+        """
+        self.path = path
+        self.index = faiss.read_index(path)
+        with open(f"{path}.json", 'r') as f:
+            self.meta = json.load(f)
+
+    def __len__(self):
+        return self.index.ntotal
+
+    @classmethod
+    def build_for_graph(cls, G, graph_path, index_path, vector_store, embedding_cache=None,
+                        batch_size=256, index_factory=NODE_INDEX_FACTORY):
+        """
+        Encode nama node per batch dengan model embedding milik vector_store
+        (lewat EmbeddingCache jika diberikan), lalu simpan index + metadata di index_path.
+        """
+        node_names = [str(node) for node in G.nodes()]
+        total = len(node_names)
+        factory = resolve_index_factory(index_factory, total)
+        print(f"[NodeIndex] Encoding {total} nama node (index: {factory})...")
+
+        embeddings = [vector_store._embed_texts(node_names[i : i + batch_size], embedding_cache)
+                      for i in range(0, total, batch_size)]
+        embeddings = (np.vstack(embeddings) if embeddings
+                      else np.zeros((0, vector_store.dimension), dtype=np.float32))
+
+        index = create_faiss_index(factory, vector_store.dimension, total)
+        if not index.is_trained:
+            index.train(embeddings)
+        index.add(embeddings)
+        faiss.write_index(index, index_path)
+        # Metadata ditulis terakhir: index tanpa metadata dianggap belum jadi
+        with open(f"{index_path}.json", 'w') as f:
+            json.dump({
+                "format_version": cls.FORMAT_VERSION,
+                "num_nodes": total,
+                "model_name": vector_store.model_name,
+                "factory": factory,
+                "source_stat": list(EntityIndex.file_stat(graph_path)),
+            }, f)
+        print(f"[NodeIndex] Tersimpan di {index_path}.")
+        return cls(index_path)
+
+    @classmethod
+    def load_for_graph(cls, G, graph_path, index_path, vector_store, embedding_cache=None):
+        """
+        Memuat index nama node; dibangun ulang jika belum ada, model embedding berbeda,
+        atau file graf sudah berubah sejak index dibuat.
+        """
+        if os.path.exists(index_path) and os.path.exists(f"{index_path}.json"):
+            index = cls(index_path)
+            if (index.meta.get("format_version") == cls.FORMAT_VERSION
+                    and index.meta.get("model_name") == vector_store.model_name
+                    and tuple(index.meta.get("source_stat", ())) == EntityIndex.file_stat(graph_path)
+                    and len(index) == G.number_of_nodes()):
+                return index
+        print(f"[NodeIndex] Membangun index nama node untuk {graph_path}...")
+        return cls.build_for_graph(G, graph_path, index_path, vector_store, embedding_cache)
+
+    def search(self, query_vectors, top_n=5):
+        """
+        Return (jarak L2, posisi node) per query; posisi -1 berarti slot kosong
+        """
+        set_search_params(self.index, nprobe=8, ef_search=64)
+        query_vectors = np.ascontiguousarray(np.atleast_2d(query_vectors), dtype=np.float32)
+        return self.index.search(query_vectors, min(top_n, max(len(self), 1)))
@@ -1,5 +1,8 @@
 import re
-from typing import List, Dict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Dict, Iterable, Iterator
 
 class TextPreprocessor:
     def clean_text(self, text: str) -> str:
@@ -80,5 +83,43 @@ class TextPreprocessor:
                 }
                 processed_docs.append(doc)
         return processed_docs
-    
-    
\ No newline at end of file
+
+    def process_records(self, records: Iterable[Dict], num_workers=1, batch_size=256,
+                        chunk_size=200, overlap=50) -> Iterator[List[Dict]]:
+        """
+        Memproses banyak record sekaligus, menghasilkan list chunks per record
+        dengan urutan yang sama seperti input (deterministik, id chunk tidak berubah).
+        - num_workers <= 1 : jalur serial (process_record per record)
+        - num_workers > 1  : record dibagi per batch ke process pool
+        Batch record di-pickle ke worker (IPC), jadi process pool hanya lebih cepat bila
+        tersedia beberapa core fisik; pada mesin 1 core jalur serial lebih cepat.
+        """
+        if num_workers <= 1:
+            for record in records:
+                yield self.process_record(record, chunk_size, overlap)
+            return
+
+        record_iter = iter(records)
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            # Batasi batch yang sedang berjalan agar memori tetap terkendali
+            pending = deque()
+            max_pending = num_workers * 2
+            while True:
+                while len(pending) < max_pending:
+                    batch = list(islice(record_iter, batch_size))
+                    if not batch:
+                        break
+                    pending.append(executor.submit(_process_record_batch, batch, chunk_size, overlap))
+                if not pending:
+                    break
+                # Ambil hasil sesuai urutan submit -> urutan chunk tetap sama dengan jalur serial
+                for chunks in pending.popleft().result():
+                    yield chunks
+
+
+def _process_record_batch(records, chunk_size, overlap):
+    """
+    Worker process pool: menerapkan clean_text + create_chunks ke satu batch record
+    """
+    preprocessor = TextPreprocessor()
+    return [preprocessor.process_record(record, chunk_size, overlap) for record in records]
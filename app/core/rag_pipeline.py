@@ -1,43 +1,100 @@
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from app.core.retriever_vector import VectorRetriever
 from app.core.retriever_graph import GraphRetriever
 from app.core.retriever_hybrid import HybridRetriever
 from app.core.generator import LLMGenerator
+from app.core.config import VECTOR_MMAP, GRAPH_DEPTH, GRAPH_RANK
 
 class RAGPipeline:
-    def __init__(self):
+    MODES = ("vector", "graph", "hybrid")
+
+    def __init__(self, modes: Optional[List[str]] = None, load_generator: bool = True,
+                 mmap: bool = VECTOR_MMAP):
         """
-        Inisialisasi semua komponen RAG (retriever & generator)
+        Inisialisasi komponen RAG secara lazy: retriever & generator baru dimuat
+        saat pertama kali dipakai, sehingga proses yang hanya melayani mode 'vector'
+        tidak pernah memuat pickle graf (dan sebaliknya).
+        modes: daftar mode yang langsung dimuat di awal (warm-up), mis. ["vector"].
+        mmap: index FAISS dimuat memory-mapped (read-only).
         """
-        print("[Pipeline] Menginisialisasi komponen...")
-        
-        # Load generator
-        self.generator = LLMGenerator()
+        print("[Pipeline] Menginisialisasi komponen (lazy)...")
+        self.mmap = mmap
+        self._generator = None
+        self._vector_retriever = None
+        self._graph_retriever = None
+        self._hybrid_retriever = None
         
-        # Load retrievers
-        self.vector_retriever = VectorRetriever()
-        self.graph_retriever = GraphRetriever()
-        self.hybrid_retriever = HybridRetriever()
+        for mode in modes or []:
+            self.get_retriever(mode)
+        if modes and load_generator:
+            self.generator
         print("[Pipeline] Sistem siap.")
+
+    @property
+    def generator(self):
+        if self._generator is None:
+            self._generator = LLMGenerator()
+        return self._generator
+
+    @property
+    def vector_retriever(self):
+        if self._vector_retriever is None:
+            self._vector_retriever = VectorRetriever(mmap=self.mmap)
+        return self._vector_retriever
+
+    @property
+    def graph_retriever(self):
+        if self._graph_retriever is None:
+            self._graph_retriever = GraphRetriever()
+        return self._graph_retriever
+
+    @property
+    def hybrid_retriever(self):
+        if self._hybrid_retriever is None:
+            # Hybrid memakai retriever vector & graph milik pipeline (tidak memuat ulang)
+            self._hybrid_retriever = HybridRetriever(vector_retriever=self.vector_retriever,
+                                                     graph_retriever=self.graph_retriever)
+        return self._hybrid_retriever
+
+    def close(self):
+        """
+        Melepas index & graf dari registry resource bersama
+        """
+        if self._vector_retriever is not None:
+            self._vector_retriever.close()
+        if self._graph_retriever is not None:
+            self._graph_retriever.close()
+        self._vector_retriever = self._graph_retriever = self._hybrid_retriever = None
+
+    def get_retriever(self, mode: str):
+        if mode not in self.MODES:
+            raise ValueError(f"Mode tidak dikenal: {mode}")
+        return getattr(self, f"{mode}_retriever")
         
-    def answer_question(self, query: str, mode: str = "hybrid", top_k: int = 5) -> Dict[str, Any]:
+    def answer_question(self, query: str, mode: str = "hybrid", top_k: int = 5,
+                        contexts: Optional[List[Dict]] = None, depth: int = GRAPH_DEPTH,
+                        rank: Optional[str] = GRAPH_RANK) -> Dict[str, Any]:
         """
-        Fungsi utama untuk menjawab pertanyaan
+        Fungsi utama untuk menjawab pertanyaan.
+        contexts: hasil retrieval yang sudah dihitung sebelumnya (mis. dari retrieve_batch);
+        jika diisi, tahap retrieval dilewati.
+        depth/rank: penelusuran graf untuk mode graph & hybrid (lihat GraphRetriever.retrieve).
         """
         start_time = time.time()
         
         # Retrieval
         print(f"[Pipeline] Mode: {mode.upper()} | Query: {query}")
         
-        contexts = []
-        if mode == "vector":
+        if contexts is not None:
+            contexts = contexts[:top_k]
+        elif mode == "vector":
             contexts = self.vector_retriever.retrieve(query, top_k=top_k)
         elif mode == "graph":
-            contexts = self.graph_retriever.retrieve(query)
+            contexts = self.graph_retriever.retrieve(query, depth=depth, rank=rank)
             contexts = contexts[:top_k]
         elif mode == "hybrid":
-            contexts = self.hybrid_retriever.retrieve(query, top_k=top_k)
+            contexts = self.hybrid_retriever.retrieve(query, top_k=top_k, depth=depth, rank=rank)
         else: 
             return {"error" : "Mode tidak dikenal"}
         
@@ -0,0 +1,52 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class ResourceRegistry:
+    def __init__(self):
+        """
+        Registry objek berat (model embedding, index FAISS, graf) per proses.
+        Kunci = (kind, path, model); objek yang sama dipakai bersama semua retriever
+        dan dilepas dari memori saat reference count kembali ke nol.
+        """
+        self._lock = threading.RLock()
+        self._objects: Dict[Tuple, Any] = {}
+        self._refcounts: Dict[Tuple, int] = {}
+
+    def acquire(self, kind: str, path: Hashable, model: Hashable, loader: Callable[[], Any]):
+        """
+        Mengambil objek terdaftar atau memuatnya sekali lewat loader(); refcount +1
+        """
+        key = (kind, path, model)
+        with self._lock:
+            if key not in self._objects:
+                self._objects[key] = loader()
+                self._refcounts[key] = 0
+            self._refcounts[key] += 1
+            return self._objects[key]
+
+    def release(self, kind: str, path: Hashable, model: Hashable) -> bool:
+        """
+        Refcount -1; objek dihapus dari registry saat tidak ada pemakai lagi.
+        Mengembalikan True jika objek benar-benar dilepas (pemakai terakhir).
+        """
+        key = (kind, path, model)
+        with self._lock:
+            if key not in self._refcounts:
+                return False
+            self._refcounts[key] -= 1
+            if self._refcounts[key] > 0:
+                return False
+            del self._refcounts[key]
+            del self._objects[key]
+            return True
+
+    def refcount(self, kind: str, path: Hashable, model: Hashable) -> int:
+        return self._refcounts.get((kind, path, model), 0)
+
+    def stats(self):
+        with self._lock:
+            return {f"{kind}:{path or model}": count for (kind, path, model), count in self._refcounts.items()}
+
+
+# Registry global, dipakai bersama oleh semua komponen dalam satu proses
+registry = ResourceRegistry()
@@ -1,89 +1,218 @@
 import pickle
 import os
 import networkx as nx
-from app.core.config import DATA_PROCESSED_DIR
+import pandas as pd
+from typing import Optional
+from app.core.config import (DATA_PROCESSED_DIR, GRAPH_BACKEND, GRAPH_LINKING,
+                             NODE_LINK_TOP_N, NODE_LINK_MAX_DISTANCE)
+from app.core.resources import registry
+from app.core.entity_index import EntityIndex, entity_index_path
+from app.core.node_index import NodeVectorIndex
+from app.core.vector_store import VectorStore, EMBEDDING_MODEL_NAME
+from app.core.graph_store import CSRGraph
+from app.core.graph_sqlite import SQLiteGraph, SQLiteEntityIndex
+from app.core.graph_traversal import GraphTraverser
+from app.core.graph_builder import build_sqlite_graph
+from app.core.canonicalizer import load_alias_table, alias_table_path, canonicalize_triplets
+
+def _load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+def csr_graph_path(graph_path):
+    """
+    Lokasi graph store CSR untuk sebuah file graf pickle (knowledge_graph_20k.pkl -> knowledge_graph_20k_csr)
+    """
+    base, _ = os.path.splitext(graph_path)
+    return f"{base}_csr"
+
+def sqlite_graph_path(graph_path):
+    """
+    Lokasi graph store SQLite (knowledge_graph_20k.pkl -> knowledge_graph_20k.sqlite)
+    """
+    base, _ = os.path.splitext(graph_path)
+    return f"{base}.sqlite"
+
+def triplets_csv_path(graph_path):
+    """
+    CSV triplet hasil indexing untuk sebuah graf (knowledge_graph_20k.pkl -> triplets_20k.csv)
+    """
+    directory, name = os.path.split(graph_path)
+    suffix = os.path.splitext(name)[0].replace("knowledge_graph_", "", 1)
+    return os.path.join(directory, f"triplets_{suffix}.csv")
+
+def graph_paths(graph_path, backend=GRAPH_BACKEND):
+    """
+    (path graf yang dimuat, file sumber untuk cek staleness, path entity index) per backend.
+    Backend sqlite menyimpan indeks entity linking di dalam database (path entity index None).
+    """
+    if backend == "csr":
+        csr_path = csr_graph_path(graph_path)
+        return csr_path, os.path.join(csr_path, "meta.json"), os.path.join(csr_path, "entity_index.pkl")
+    if backend == "sqlite":
+        sqlite_path = sqlite_graph_path(graph_path)
+        return sqlite_path, sqlite_path, None
+    return graph_path, graph_path, entity_index_path(graph_path)
+
+def node_index_path(graph_path, backend=GRAPH_BACKEND):
+    """
+    Lokasi index FAISS nama node (di dalam direktori CSR, atau di samping pickle)
+    """
+    if backend == "csr":
+        return os.path.join(csr_graph_path(graph_path), "node_index.faiss")
+    if backend == "sqlite":
+        return f"{sqlite_graph_path(graph_path)}.nodes.faiss"
+    base, _ = os.path.splitext(graph_path)
+    return f"{base}.nodes.faiss"
 
 class GraphRetriever:
-    def __init__(self, graph_file="knowledge_graph_20k.pkl"):
+    def __init__(self, graph_file="knowledge_graph_20k.pkl", backend=GRAPH_BACKEND, linking=GRAPH_LINKING):
         self.graph_path = os.path.join(DATA_PROCESSED_DIR, graph_file)
+        self.backend = backend
+        self.linking = linking
+        # Index nama node + encoder query dimuat saat linking semantik pertama kali dipakai
+        self.node_index = None
+        self._encoder = None
+        # Path yang benar-benar dimuat (pickle atau direktori CSR), juga kunci registry
+        self.store_path = None
         self.G = None
+        self.entity_index = None
         self.load_graph()
 
+    def _open_graph(self):
+        """
+        Mengembalikan (path, loader, file sumber, path entity index) sesuai backend
+        """
+        store_path, source_path, index_path = graph_paths(self.graph_path, self.backend)
+        if self.backend == "csr":
+            # Graf lama hanya punya pickle -> migrasi sekali ke CSR
+            if not os.path.exists(source_path) and os.path.exists(self.graph_path):
+                CSRGraph.from_pickle(self.graph_path, store_path)
+            return store_path, lambda: CSRGraph(store_path), source_path, index_path
+        if self.backend == "sqlite":
+            # Database belum ada -> dibangun sekali dari CSV triplet, dengan kanonikalisasi
+            # yang sama seperti run_indexing (hanya jika build aslinya memakai tabel alias)
+            csv_path = triplets_csv_path(self.graph_path)
+            if not os.path.exists(source_path) and os.path.exists(csv_path):
+                df_triplets, df_aliases = pd.read_csv(csv_path), None
+                if os.path.exists(alias_table_path(self.graph_path)):
+                    df_triplets, df_aliases = canonicalize_triplets(df_triplets)
+                build_sqlite_graph(df_triplets, store_path, df_aliases).close()
+            return store_path, lambda: SQLiteGraph(store_path), source_path, index_path
+        return store_path, lambda: _load_pickle(store_path), source_path, index_path
+
     def load_graph(self):
-        if os.path.exists(self.graph_path):
-            with open(self.graph_path, "rb") as f:
-                self.G = pickle.load(f)
-            print(f"✅ [GraphRetriever] GRAF DIMUAT: {self.G.number_of_nodes()} NODES.")
-        else:
+        store_path, loader, source_path, index_path = self._open_graph()
+        if not os.path.exists(source_path):
             print("❌ [GraphRetriever] File graf tidak ditemukan.")
+            return
+        
+        # Graf diambil dari registry: semua GraphRetriever dengan file sama berbagi satu objek
+        self.store_path = store_path
+        self.G = registry.acquire("graph", store_path, None, loader)
+        print(f"✅ [GraphRetriever] GRAF DIMUAT: {self.G.number_of_nodes()} NODES.")
+        if self.backend == "sqlite":
+            entity_loader = lambda: SQLiteEntityIndex(self.G)
+        else:
+            entity_loader = lambda: EntityIndex.load_for_graph(self.G, source_path, index_path,
+                                                               load_alias_table(self.graph_path))
+        self.entity_index = registry.acquire("entity_index", store_path, None, entity_loader)
+
+    def close(self):
+        if self.node_index is not None:
+            registry.release("node_index", self.store_path, EMBEDDING_MODEL_NAME)
+            self.node_index = None
+        if self._encoder is not None:
+            self._encoder.close()
+            self._encoder = None
+        if self.G is not None:
+            if registry.release("graph", self.store_path, None) and hasattr(self.G, "close"):
+                self.G.close()
+            registry.release("entity_index", self.store_path, None)
+            self.G = None
+            self.entity_index = None
 
-    def retrieve(self, query: str, depth: int = 1) -> list:
+    @property
+    def encoder(self):
+        # VectorStore tanpa index: hanya untuk encode query (model & cache LRU dibagi lewat registry)
+        if self._encoder is None:
+            self._encoder = VectorStore()
+        return self._encoder
+
+    def _load_node_index(self):
+        if self.node_index is None:
+            _, source_path, _ = graph_paths(self.graph_path, self.backend)
+            index_path = node_index_path(self.graph_path, self.backend)
+            self.node_index = registry.acquire(
+                "node_index", self.store_path, EMBEDDING_MODEL_NAME,
+                lambda: NodeVectorIndex.load_for_graph(self.G, source_path, index_path, self.encoder))
+        return self.node_index
+
+    def link_entities_semantic(self, query: str, query_vector=None, top_n: int = NODE_LINK_TOP_N) -> list:
+        """
+        Entity linking semantik: satu pencarian ANN atas embedding nama node.
+        query_vector: embedding query yang sudah dihitung (mis. oleh vector retrieval).
+        """
         if not self.G:
             return []
+        if query_vector is None:
+            query_vector = self.encoder.encode_queries([query])[0]
+        distances, positions = self._load_node_index().search(query_vector, top_n)
+        return [self.entity_index.nodes[pos] for dist, pos in zip(distances[0], positions[0])
+                if pos >= 0 and dist <= NODE_LINK_MAX_DISTANCE]
 
-        print(f"🔍 [GraphRetriever] Memproses Query: '{query}'")
-        
-        # 1. Preprocessing & Entity Linking
+    def link_entities(self, query: str, query_vector=None) -> list:
+        """
+        Entity linking: maksimal 5 node graf, sesuai mode self.linking
+        (semantic / string / both)
+        """
+        if not self.G:
+            return []
+        if self.linking == "string":
+            return self.link_entities_string(query)
+
+        semantic_nodes = self.link_entities_semantic(query, query_vector)
+        if self.linking == "semantic":
+            return semantic_nodes[:5]
+        merged = list(dict.fromkeys(semantic_nodes + self.link_entities_string(query)))
+        return merged[:5]
+
+    def link_entities_string(self, query: str) -> list:
+        """
+        Entity linking berbasis string: maksimal 5 node graf terkuat (terpanjang) yang cocok dengan query
+        """
+        if not self.G:
+            return []
+
+        # Preprocessing query
         query_clean = query.lower().replace("?", "").replace(".", "").replace(",", "")
         query_tokens = set(query_clean.split())
         stopwords = {"what", "who", "is", "the", "a", "of", "in", "tell", "me", "about"}
         keywords = query_tokens - stopwords
         
-        start_nodes = []
-        for node in self.G.nodes():
-            node_str = str(node).lower().strip()
-            if len(node_str) < 3: continue
-            
-            # Exact match
-            if node_str in query_clean:
-                start_nodes.append(node)
-                continue
-            # Keyword match
-            node_tokens = set(node_str.split())
-            if len(node_tokens.intersection(keywords)) >= 1:
-                 if len(node_tokens) > 2 and len(node_tokens.intersection(keywords)) < 2:
-                     continue
-                 start_nodes.append(node)
+        # Kandidat dari indeks entity linking (substring + keyword), urutan sama seperti G.nodes()
+        start_nodes = self.entity_index.candidates(query_clean, keywords)
 
         start_nodes.sort(key=len, reverse=True)
-        start_nodes = start_nodes[:5] # Ambil 5 entitas terkuat
+        return start_nodes[:5] # Ambil 5 entitas terkuat
+
+    def retrieve(self, query: str, depth: int = 1, rank: Optional[str] = None,
+                 start_nodes: Optional[list] = None, query_vector=None) -> list:
+        """
+        depth: jumlah hop dari entitas kandidat (1 = fakta tetangga langsung).
+        rank : None (urutan BFS) atau "ppr" (personalized PageRank atas subgraf yang dijelajahi).
+        start_nodes: hasil link_entities yang sudah dihitung (opsional).
+        query_vector: embedding query untuk linking semantik (opsional, dibagi dengan vector retrieval).
+        """
+        if not self.G:
+            return []
+
+        print(f"🔍 [GraphRetriever] Memproses Query: '{query}'")
+        
+        # 1. Entity Linking
+        if start_nodes is None:
+            start_nodes = self.link_entities(query, query_vector)
         print(f"   [Info] Entitas kandidat: {start_nodes}")
 
-        # 2. Traversal Dua Arah (Incoming & Outgoing)
-        retrieved_info = []
-        seen_facts = set()
-
-        for node in start_nodes:
-            # A. Cek Outgoing (Node -> Tetangga)
-            try:
-                successors = list(self.G.successors(node))
-                for neighbor in successors:
-                    edge_data = self.G.get_edge_data(node, neighbor)
-                    relation = edge_data.get('relation', 'related_to')
-                    fact = f"{node} ({relation}) {neighbor}"
-                    if fact not in seen_facts:
-                        retrieved_info.append({
-                            "text": fact, 
-                            "chunk_id": edge_data.get('source_id'), 
-                            "score": 1.0, "type": "graph_out", "title": f"Graph: {node}"
-                        })
-                        seen_facts.add(fact)
-            except: pass
-
-            # B. Cek Incoming (Tetangga -> Node)
-            try:
-                predecessors = list(self.G.predecessors(node))
-                for neighbor in predecessors:
-                    # Perhatikan urutan: neighbor -> node
-                    edge_data = self.G.get_edge_data(neighbor, node) 
-                    relation = edge_data.get('relation', 'related_to')
-                    fact = f"{neighbor} ({relation}) {node}" # Kalimat dibalik agar logis
-                    if fact not in seen_facts:
-                        retrieved_info.append({
-                            "text": fact, 
-                            "source_id": edge_data.get('source_id'), 
-                            "score": 1.0, "type": "graph_in", "title": f"Graph: {node}"
-                        })
-                        seen_facts.add(fact)
-            except: pass
-        return retrieved_info[:20]
\ No newline at end of file
+        # 2. Traversal Dua Arah (Incoming & Outgoing) sampai `depth` hop
+        return GraphTraverser(self.G).traverse(start_nodes, depth=depth, rank=rank)
@@ -1,23 +1,85 @@
 from app.core.retriever_vector import VectorRetriever
 from app.core.retriever_graph import GraphRetriever
+import os
+from typing import Optional
+from app.core.entity_links import EntityChunkIndex
+from app.core.resources import registry
+from app.core.config import DATA_PROCESSED_DIR, VECTOR_MMAP, HYBRID_MAX_PASSAGES, GRAPH_DEPTH, GRAPH_RANK
 
 class HybridRetriever:
-    def __init__(self):
-        # Inisialisasi dua jalur retriever terpisah (Vector & Graph)
-        self.vector_retriever = VectorRetriever(index_name="hotpot_20k")
-        self.graph_retriever = GraphRetriever(graph_file="knowledge_graph_20k.pkl")
+    def __init__(self, vector_retriever=None, graph_retriever=None, mmap=VECTOR_MMAP,
+                 linking_file="entity_linking_20k.csv", max_passages=HYBRID_MAX_PASSAGES):
+        """
+        vector_retriever / graph_retriever: retriever yang sudah ada (mis. milik RAGPipeline).
+        Jika tidak diberikan, dibuat baru; index & graf tetap dibagi lewat registry.
+        """
+        # Inisialisasi dua jalur retriever (Vector & Graph); yang dibuat sendiri ditutup oleh close()
+        self._owned = []
+        if vector_retriever is None:
+            vector_retriever = VectorRetriever(index_name="hotpot_20k", mmap=mmap)
+            self._owned.append(vector_retriever)
+        if graph_retriever is None:
+            graph_retriever = GraphRetriever(graph_file="knowledge_graph_20k.pkl")
+            self._owned.append(graph_retriever)
+        self.vector_retriever = vector_retriever
+        self.graph_retriever = graph_retriever
+
+        # Postings entity -> chunk_id untuk ekspansi entitas ke passage sumbernya
+        self.max_passages = max_passages
+        self.linking_path = os.path.join(DATA_PROCESSED_DIR, linking_file)
+        self.entity_links = registry.acquire("entity_links", self.linking_path, None,
+                                             lambda: EntityChunkIndex(self.linking_path))
+
+    def close(self):
+        for retriever in self._owned:
+            retriever.close()
+        self._owned = []
+        if self.entity_links is not None:
+            registry.release("entity_links", self.linking_path, None)
+            self.entity_links = None
+
+    def expand_passages(self, graph_results, entities, max_passages=None):
+        """
+        Mengambil passage sumber dari fakta graf & entitas ter-link lewat lookup chunk_id
+        (tanpa pencarian ANN). Urutan kandidat: provenance fakta graf, lalu postings entitas.
+        Hasil: maksimal max_passages passage unik.
+        """
+        max_passages = self.max_passages if max_passages is None else max_passages
+        candidates = []
+        for item in graph_results:
+            candidates.extend(item.get('sources') or [item.get('chunk_id') or item.get('source_id')])
+        for entity in entities:
+            candidates.extend(self.entity_links.get_chunk_ids(entity))
+
+        passages, seen_ids = [], set()
+        for chunk_id in candidates:
+            if len(passages) >= max_passages:
+                break
+            if not chunk_id or chunk_id in seen_ids:
+                continue
+            seen_ids.add(chunk_id)
+            for passage in self.vector_retriever.store.get_chunks([chunk_id]):
+                passage['type'] = "linked_passage"
+                passages.append(passage)
+        return passages
 
-    def retrieve(self, query: str, top_k: int = 5, alpha: float = 0.5):
+    def retrieve(self, query: str, top_k: int = 5, alpha: float = 0.5,
+                 depth: int = GRAPH_DEPTH, rank: Optional[str] = GRAPH_RANK):
         """
         Implementasi Hybrid-RAG dengan strategi Parallel Fusion.
         Menggabungkan penelusuran struktural (Graph) dan semantik (Vector)
         untuk melengkapi konteks multi-hop.
+        depth/rank: penelusuran graf (lihat GraphRetriever.retrieve).
         """
         combined_results = []
         seen_texts = set()
 
+        # 0. Embedding query dihitung sekali: dipakai linking semantik graf & vector search (cache LRU)
+        query_vector = self.vector_retriever.store.encode_queries([query])[0]
+
         # 1. Structural Retrieval (Graph): Fokus menangkap relasi eksplisit antar entitas
-        graph_results = self.graph_retriever.retrieve(query)
+        entities = self.graph_retriever.link_entities(query, query_vector=query_vector)
+        graph_results = self.graph_retriever.retrieve(query, depth=depth, rank=rank, start_nodes=entities)
         
         # Filter duplikasi hasil graph
         valid_graph_results = []
@@ -28,6 +90,14 @@ class HybridRetriever:
                 valid_graph_results.append(item)
                 seen_texts.add(sig)
 
+        # 1b. Ekspansi entitas -> passage sumber (lookup chunk_id, bukan ANN)
+        linked_passages = []
+        for item in self.expand_passages(valid_graph_results, entities):
+            sig = item['text'].lower().strip()[:50]
+            if sig not in seen_texts:
+                linked_passages.append(item)
+                seen_texts.add(sig)
+
         # Hitung sisa slot untuk Vector (Dynamic Filling)
         num_graph_used = len(valid_graph_results)
         target_vector_count = max(2, top_k - num_graph_used)
@@ -45,6 +115,7 @@ class HybridRetriever:
                 valid_vector_results.append(item)
                 seen_texts.add(sig)
 
-        # Context Fusion: Menggabungkan hasil Graph (prioritas) dan Vector
-        combined_results = valid_graph_results[:top_k] + valid_vector_results
+        # Context Fusion: Graph (prioritas), passage sumbernya, lalu Vector
+        num_graph_slots = max(top_k - len(linked_passages), 0)
+        combined_results = valid_graph_results[:num_graph_slots] + linked_passages + valid_vector_results
         return combined_results[:top_k]
\ No newline at end of file
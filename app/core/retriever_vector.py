@@ -1,18 +1,40 @@
+import os
 from typing import List, Dict
-from app.core.vector_store import VectorStore
+from app.core.vector_store import VectorStore, EMBEDDING_MODEL_NAME
+from app.core.config import DATA_PROCESSED_DIR, VECTOR_MMAP
+from app.core.resources import registry
+
+def _load_store(index_name, mmap):
+    store = VectorStore(index_name=index_name)
+    store.load(mmap=mmap)
+    return store
 
 class VectorRetriever:
-    def __init__(self, index_name="hotpot_20k"):
+    def __init__(self, index_name="hotpot_20k", mmap=VECTOR_MMAP):
         """
         Inisialisasi vector retriever.
-        Memuat indeks FAISS yang sudah dibangun sebelumnya
+        Memuat indeks FAISS yang sudah dibangun sebelumnya (default memory-mapped, read-only).
+        Index + metadata diambil dari registry, jadi retriever lain dengan index yang sama
+        memakai instance VectorStore yang sama.
         """
-        self.store = VectorStore(index_name=index_name)
+        self._resource_key = ("vector_index_mmap" if mmap else "vector_index",
+                              os.path.join(DATA_PROCESSED_DIR, f"{index_name}.faiss"),
+                              EMBEDDING_MODEL_NAME)
         try:
-            self.store.load()
+            self.store = registry.acquire(*self._resource_key, lambda: _load_store(index_name, mmap))
             print("[VectorRetriever] Index berhasil dimuat.")
         except Exception as e:
             print(f"[VectorRetriever] Error memuat index: {e}")
+            self.store = VectorStore(index_name=index_name)
+            self._resource_key = None
+
+    def close(self):
+        """
+        Melepas index dari registry; model & index dibebaskan saat pemakai terakhir selesai
+        """
+        if self._resource_key is not None and registry.release(*self._resource_key):
+            self.store.close()
+        self._resource_key = None
     
     def retrieve(self, query: str, top_k: int=5) -> List[Dict]:
         """
@@ -21,4 +43,12 @@ class VectorRetriever:
         """
         print(f"[VectorRetriever] Mencari: '{query}' (Top-{top_k})")
         results = self.store.search(query, top_k=top_k)
-        return results
\ No newline at end of file
+        return results
+
+    def retrieve_batch(self, queries: List[str], top_k: int=5) -> List[List[Dict]]:
+        """
+        Pencarian semantik untuk banyak query sekaligus (satu encode + satu search FAISS)
+        Output: list hasil per query, urutan sama dengan input
+        """
+        print(f"[VectorRetriever] Mencari {len(queries)} query sekaligus (Top-{top_k})")
+        return self.store.search_batch(queries, top_k=top_k)
@@ -1,17 +1,102 @@
 import faiss
+import math
+import re
 import numpy as np
-import pickle
 import os
 from sentence_transformers import SentenceTransformer
-from app.core.config import DATA_PROCESSED_DIR, METADATA_NAME
+from app.core.config import (
+    DATA_PROCESSED_DIR,
+    INDEX_PROFILES,
+    VECTOR_INDEX_FACTORY,
+    VECTOR_TRAIN_SAMPLE,
+    VECTOR_NPROBE,
+    VECTOR_EF_SEARCH
+)
+from app.core.chunk_store import ChunkStore
+from app.core.embedding_cache import get_query_cache, normalize_query
+from app.core.resources import registry
+
+# Model embedding yang dipakai saat indexing maupun query
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Isi vektor pengganjal baris delta yang terhapus saat compact (jarak L2 ke embedding
+# ternormalisasi ~ dimensi x 1e6, selalu di urutan terakhir)
+GAP_VECTOR_VALUE = 1000.0
+
+def resolve_index_factory(index_factory, num_vectors, num_train=None):
+    """
+    Mengubah nama profil (flat, ivf_flat, ivf_pq, hnsw) atau factory string FAISS
+    menjadi factory string final. Placeholder {nlist} diisi berdasarkan ukuran korpus.
+    num_train: jumlah vektor training (default num_vectors). Jika terlalu sedikit untuk
+    codebook PQ (2^bits centroid) atau centroid IVF, factory diturunkan ke IVF-Flat/Flat.
+    """
+    factory = INDEX_PROFILES.get(index_factory, index_factory)
+    if num_train is None:
+        num_train = num_vectors
+    if "{nlist}" in factory:
+        nlist = max(1, int(4 * math.sqrt(max(num_vectors, 1))))
+        factory = factory.format(nlist=nlist)
+
+    pq = re.search(r",PQ\d+(?:x(\d+))?", factory)
+    if pq:
+        min_train = 1 << int(pq.group(1) or 8)
+        if num_train < min_train:
+            fallback = factory[:pq.start()] + ",Flat"
+            print(f"[VectorStore] {factory} butuh >= {min_train} vektor training (ada {num_train}), "
+                  f"memakai {fallback}.")
+            factory = fallback
+    ivf = re.match(r"IVF(\d+)", factory)
+    if ivf and num_train < int(ivf.group(1)):
+        print(f"[VectorStore] {factory} butuh >= {ivf.group(1)} vektor training (ada {num_train}), memakai Flat.")
+        factory = "Flat"
+    return factory
+
+def create_faiss_index(index_factory, dimension, num_vectors, num_train=None):
+    """
+    Membuat index FAISS kosong (metrik L2) dari profil/factory string
+    """
+    factory = resolve_index_factory(index_factory, num_vectors, num_train)
+    return faiss.index_factory(dimension, factory, faiss.METRIC_L2)
+
+def set_search_params(index, nprobe=None, ef_search=None):
+    """
+    Mengatur parameter search-time. Parameter yang tidak relevan dengan
+    jenis index (mis. nprobe pada Flat) diabaikan.
+    """
+    params = faiss.ParameterSpace()
+    for name, value in (("nprobe", nprobe), ("efSearch", ef_search)):
+        if value is None:
+            continue
+        try:
+            params.set_index_parameter(index, name, value)
+        except RuntimeError:
+            pass
+
+def read_index_mmap(path):
+    """
+    Membaca index FAISS secara memory-mapped dan read-only: vektor tetap di file
+    dan hanya halaman yang disentuh saat search yang masuk ke RAM.
+    IO_FLAG_MMAP_IFC (faiss >= 1.9) juga mencakup index Flat; versi lama
+    hanya me-mmap inverted list IVF.
+    """
+    mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+    return faiss.read_index(path, mmap_flag | faiss.IO_FLAG_READ_ONLY)
 
 class VectorStore:
-    def __init__(self, index_name="hotpot_20k"):
+    def __init__(self, index_name="hotpot_20k", index_factory=VECTOR_INDEX_FACTORY,
+                 nprobe=VECTOR_NPROBE, ef_search=VECTOR_EF_SEARCH):
         self.index_name = index_name
+        # Jenis index yang dibangun oleh create_index (profil atau factory string)
+        self.index_factory = index_factory
+        self.nprobe = nprobe
+        self.ef_search = ef_search
         
         # Hardcode nama model (pastikan sama dengan saat indexing)
-        self.model_name = "sentence-transformers/all-MiniLM-L6-v2"
-        self.model = SentenceTransformer(self.model_name)
+        self.model_name = EMBEDDING_MODEL_NAME
+        # Model dimuat saat pertama dipakai: build dari cache embedding tidak butuh model
+        self._model = None
+        # Cache LRU embedding query, dipakai bersama semua VectorStore dengan model yang sama
+        self.query_cache = get_query_cache(self.model_name)
         
         # Dimensi embedding
         self.dimension = 384 
@@ -26,68 +111,364 @@ class VectorStore:
             self.metadata_path = os.path.join(DATA_PROCESSED_DIR, "hotpot_20k_meta.pkl")
         else:
             self.metadata_path = os.path.join(DATA_PROCESSED_DIR, f"{self.index_name}_meta.pkl")
+        
+        # Metadata kolumnar (memory-mapped), menggantikan pickle
+        self.chunk_store_path = os.path.join(DATA_PROCESSED_DIR, f"{self.index_name}_chunks")
             
         self.index_path = os.path.join(DATA_PROCESSED_DIR, f"{self.index_name}.faiss")
+        
+        # Delta index (IDMap, id = baris chunk store) untuk dokumen yang ditambahkan setelah build
+        self.delta_path = os.path.join(DATA_PROCESSED_DIR, f"{self.index_name}.delta.faiss")
+        self.delta_index = None
+        self.deleted_rows = set()
+        # True jika index utama dimuat memory-mapped (tidak bisa diubah/compact)
+        self.read_only = False
+
+    @property
+    def model(self):
+        # Satu instance SentenceTransformer per model untuk seluruh proses
+        if self._model is None:
+            self._model = registry.acquire("embedding_model", None, self.model_name,
+                                           lambda: SentenceTransformer(self.model_name))
+        return self._model
+
+    def close(self):
+        """
+        Melepas model embedding dari registry (dipanggil saat store tidak dipakai lagi)
+        """
+        if self._model is not None:
+            registry.release("embedding_model", None, self.model_name)
+            self._model = None
 
-    def create_index(self, chunks, batch_size=32):
+    def create_index(self, chunks, batch_size=32, train_sample=VECTOR_TRAIN_SAMPLE, embedding_cache=None):
+        """
+        Membangun index dari list chunk.
+        embedding_cache (opsional): EmbeddingCache; hanya chunk yang belum ada di cache yang di-encode.
+        """
         self.chunks = chunks 
+        self.delta_index = None
+        self.deleted_rows = set()
+        self.read_only = False
         total = len(chunks)
+        train_size = min(total, train_sample)
+        factory = resolve_index_factory(self.index_factory, total, train_size)
+        self.index = create_faiss_index(factory, self.dimension, total)
+        print(f"[VectorStore] Index: {factory}")
         print(f"[VectorStore] Memulai encoding {total} dokumen...")
         
+        # Index IVF/PQ perlu training: sampel acak (seed tetap) dari seluruh korpus,
+        # bukan chunk awal (urutan HotpotQA terkelompok per pertanyaan/judul)
+        train_rows = None
+        if not self.index.is_trained:
+            train_rows = np.sort(np.random.default_rng(0).choice(total, size=train_size, replace=False))
+            train_vectors = np.vstack([
+                self._embed_texts([chunks[int(r)]['text'] for r in train_rows[j : j + batch_size]], embedding_cache)
+                for j in range(0, train_size, batch_size)
+            ])
+            print(f"[VectorStore] Training index dengan {train_size} vektor sampel...")
+            self.index.train(train_vectors)
+        
         for i in range(0, total, batch_size):
             batch_chunks = chunks[i : i + batch_size]
-            batch_texts = [c['text'] for c in batch_chunks]
-            
-            # Encode
-            embeddings = self.model.encode(
-                batch_texts, 
-                batch_size=len(batch_texts),
-                show_progress_bar=False, 
-                convert_to_numpy=True,
-                normalize_embeddings=True
-            )
             
-            if not isinstance(embeddings, np.ndarray):
-                embeddings = np.array(embeddings)
+            if train_rows is None:
+                # Encode (cache miss saja jika cache tersedia)
+                embeddings = self._embed_texts([c['text'] for c in batch_chunks], embedding_cache)
+            else:
+                # Vektor sampel training dipakai ulang, tidak di-encode dua kali
+                lo, hi = np.searchsorted(train_rows, [i, i + len(batch_chunks)])
+                sampled = np.zeros(len(batch_chunks), dtype=bool)
+                sampled[train_rows[lo:hi] - i] = True
+                embeddings = np.empty((len(batch_chunks), self.dimension), dtype=np.float32)
+                embeddings[sampled] = train_vectors[lo:hi]
+                rest = np.flatnonzero(~sampled)
+                if len(rest):
+                    embeddings[rest] = self._embed_texts([batch_chunks[j]['text'] for j in rest], embedding_cache)
             
-            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
             self.index.add(embeddings)
             
             if i % 1000 == 0:
                 print(f"Batches: {i}/{total} encoded...", end='\r')
         
         print(f"\n[VectorStore] Selesai. Total vectors: {self.index.ntotal}")
+        if embedding_cache is not None:
+            print(f"[VectorStore] Embedding cache: {embedding_cache.stats()}")
+
+    def _embed_texts(self, texts, embedding_cache=None):
+        if embedding_cache is None:
+            return self._encode_documents(texts)
+        
+        keys, vectors = embedding_cache.lookup(texts)
+        missing = [j for j, v in enumerate(vectors) if v is None]
+        if missing:
+            encoded = self._encode_documents([texts[j] for j in missing])
+            embedding_cache.add([keys[j] for j in missing], encoded)
+            for j, vector in zip(missing, encoded):
+                vectors[j] = vector
+        return np.ascontiguousarray(np.vstack(vectors), dtype=np.float32)
+
+    def _encode_documents(self, texts):
+        embeddings = self.model.encode(
+            texts, 
+            batch_size=len(texts),
+            show_progress_bar=False, 
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        
+        if not isinstance(embeddings, np.ndarray):
+            embeddings = np.array(embeddings)
+        
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
 
     def save(self):
         print(f"[VectorStore] Menyimpan index ke {self.index_path}...")
         faiss.write_index(self.index, self.index_path)
-        with open(self.metadata_path, 'wb') as f:
-            pickle.dump(self.chunks, f)
+        if not isinstance(self.chunks, ChunkStore):
+            self.chunks = ChunkStore.create(self.chunk_store_path, self.chunks)
+        self._save_delta()
         print("[VectorStore] Penyimpanan berhasil.")
 
-    def load(self):
+    def _save_delta(self):
+        if self.delta_index is not None and self.delta_index.ntotal > 0:
+            faiss.write_index(self.delta_index, self.delta_path)
+        elif os.path.exists(self.delta_path):
+            os.remove(self.delta_path)
+
+    def load(self, mmap=False):
+        """
+        Memuat index + metadata. mmap=True: index utama dibuka memory-mapped (read-only),
+        cocok untuk proses serving; add/remove dokumen tetap bisa lewat delta index.
+        """
         if not os.path.exists(self.index_path):
             raise FileNotFoundError(f"Index not found: {self.index_path}")
         
-        print(f"[VectorStore] Memuat index dari {self.index_path}...")
-        self.index = faiss.read_index(self.index_path)
+        print(f"[VectorStore] Memuat index dari {self.index_path}{' (mmap)' if mmap else ''}...")
+        self.index = read_index_mmap(self.index_path) if mmap else faiss.read_index(self.index_path)
+        self.read_only = mmap
+        
+        # Index lama hanya punya *_meta.pkl -> migrasi sekali ke chunk store
+        if not os.path.exists(self.chunk_store_path) and os.path.exists(self.metadata_path):
+            ChunkStore.from_pickle(self.metadata_path, self.chunk_store_path)
+        
+        print(f"[VectorStore] Memuat metadata dari {self.chunk_store_path}...")
+        self.chunks = ChunkStore(self.chunk_store_path)
         
-        print(f"[VectorStore] Memuat metadata dari {self.metadata_path}...")
-        with open(self.metadata_path, 'rb') as f:
-            self.chunks = pickle.load(f)
+        # Perubahan inkremental: delta index + tombstone
+        self.delta_index = faiss.read_index(self.delta_path) if os.path.exists(self.delta_path) else None
+        self.deleted_rows = set(self.chunks.deleted_rows().tolist())
+        if self.delta_index is not None or self.deleted_rows:
+            delta_count = self.delta_index.ntotal if self.delta_index is not None else 0
+            print(f"[VectorStore] Delta: +{delta_count} dokumen, -{len(self.deleted_rows)} dokumen terhapus.")
         print(f"[VectorStore] Berhasil memuat {len(self.chunks)} dokumen.")
 
-    def search(self, query, top_k=5):
-        # 1. Encode Query
-        query_vector = self.model.encode([query], convert_to_numpy=True)
-        query_vector = np.ascontiguousarray(query_vector, dtype=np.float32)
+    def add_documents(self, chunks, batch_size=64, embedding_cache=None):
+        """
+        Menambahkan chunk baru ke index yang sudah dimuat tanpa build ulang.
+        Chunk ditambahkan ke ujung chunk store; vektornya masuk delta index
+        dengan id = nomor baris chunk store. Hanya delta yang ditulis ke disk.
+        """
+        if not isinstance(self.chunks, ChunkStore):
+            raise RuntimeError("add_documents membutuhkan index yang sudah disimpan/dimuat")
         
-        # 2. Search FAISS
-        distances, indices = self.index.search(query_vector, top_k)
+        chunks = list(chunks)
+        if not chunks:
+            return []
+        chunk_ids = [c.get('chunk_id', c.get('id', '')) for c in chunks]
+        if len(set(chunk_ids)) != len(chunk_ids):
+            raise ValueError("add_documents: chunk_id duplikat di dalam satu panggilan")
         
+        # chunk_id yang sudah aktif diganti: baris lama di-tombstone agar search tidak
+        # mengembalikan chunk_id yang sama dua kali (teks lama & baru)
+        replaced = [row for row in (self.get_row(c) for c in chunk_ids) if row is not None]
+        if replaced:
+            self.chunks.mark_deleted(replaced)
+            self.deleted_rows.update(replaced)
+            if self.delta_index is not None:
+                self.delta_index.remove_ids(np.asarray(replaced, dtype=np.int64))
+        
+        rows = self.chunks.append(chunks)
+        if self.delta_index is None:
+            self.delta_index = faiss.IndexIDMap2(faiss.IndexFlatL2(self.dimension))
+        
+        for i in range(0, len(chunks), batch_size):
+            batch_texts = [c['text'] for c in chunks[i : i + batch_size]]
+            embeddings = self._embed_texts(batch_texts, embedding_cache)
+            ids = np.asarray(rows[i : i + batch_size], dtype=np.int64)
+            self.delta_index.add_with_ids(embeddings, ids)
+        
+        self._save_delta()
+        print(f"[VectorStore] {len(rows)} dokumen ditambahkan, {len(replaced)} diganti (delta: {self.delta_index.ntotal}).")
+        return rows
+
+    def remove_documents(self, chunk_ids):
+        """
+        Menghapus dokumen berdasarkan chunk_id. Baris ditandai tombstone di chunk store
+        (ditulis in-place) dan disaring saat search; vektor di delta index ikut dihapus.
+        """
+        rows = [row for row in (self.get_row(c) for c in chunk_ids) if row is not None]
+        if not rows:
+            return 0
+        self.chunks.mark_deleted(rows)
+        self.deleted_rows.update(rows)
+        if self.delta_index is not None:
+            self.delta_index.remove_ids(np.asarray(rows, dtype=np.int64))
+        self._save_delta()
+        print(f"[VectorStore] {len(rows)} dokumen dihapus.")
+        return len(rows)
+
+    def compact(self):
+        """
+        Menggabungkan delta index ke index utama lalu menulis ulang index utama.
+        Dipanggil sesekali (bukan setiap perubahan) saat delta sudah besar.
+        """
+        if self.delta_index is None or self.delta_index.ntotal == 0:
+            return
+        if self.read_only:
+            raise RuntimeError("Index dimuat read-only (mmap); muat ulang dengan load(mmap=False) untuk compact")
+        ids = faiss.vector_to_array(self.delta_index.id_map).astype(np.int64)
+        vectors = self.delta_index.index.reconstruct_n(0, self.delta_index.ntotal)
+        order = np.argsort(ids)
+        ids, vectors = ids[order], np.ascontiguousarray(vectors[order])
+        
+        try:
+            self.index.add_with_ids(vectors, ids)
+        except RuntimeError:
+            # Index tanpa id eksplisit (Flat/HNSW): id = urutan tambah, harus lanjut dari ntotal.
+            # Baris yang sudah dihapus dari delta diisi vektor "jauh" (tidak pernah masuk
+            # kandidat teratas, jadi tidak memakan slot over-fetch) dan tetap ber-tombstone.
+            start = self.index.ntotal
+            if ids[0] < start:
+                raise RuntimeError("Delta tidak bisa digabung: id tumpang tindih, lakukan build ulang")
+            block = np.full((int(ids[-1]) - start + 1, self.dimension), GAP_VECTOR_VALUE, dtype=np.float32)
+            block[ids - start] = vectors
+            gaps = np.setdiff1d(np.arange(start, ids[-1] + 1), ids)
+            if len(gaps):
+                self.chunks.mark_deleted(gaps)
+                self.deleted_rows.update(gaps.tolist())
+            self.index.add(block)
+        
+        self.delta_index = None
+        self.save()
+        print(f"[VectorStore] Compact selesai. Total vectors: {self.index.ntotal}")
+
+    def get_row(self, chunk_id):
+        """
+        chunk_id -> nomor baris chunk store lewat indeks hash (tanpa ANN, tanpa scan).
+        Tombstone disaring dari set di memori; baris aktif terbaru yang dipakai.
+        """
+        rows = self.chunks.chunk_ids.lookup_all(chunk_id)
+        rows = [row for row in rows if row not in self.deleted_rows]
+        return rows[-1] if rows else None
+
+    def get_chunks(self, chunk_ids):
+        """
+        Mengambil passage berdasarkan chunk_id (format sama dengan hasil search, score=None).
+        chunk_id yang tidak ada/terhapus dilewati.
+        """
+        results = []
+        for chunk_id in chunk_ids:
+            row = self.get_row(chunk_id)
+            if row is None:
+                continue
+            item = self.chunks[row]
+            results.append({
+                "chunk_id": item['id'],
+                "text": item.get('text', ''),
+                "title": item.get('title', 'Untitled'),
+                "score": None,
+                "metadata": item.get('metadata', {})
+            })
+        return results
+
+    def search(self, query, top_k=5, nprobe=None, ef_search=None):
+        # Jalur satu query = batch berisi satu query (hasil identik dengan search_batch)
+        return self.search_batch([query], top_k=top_k, nprobe=nprobe, ef_search=ef_search)[0]
+
+    def search_batch(self, queries, top_k=5, nprobe=None, ef_search=None):
+        """
+        Pencarian banyak query sekaligus: satu forward pass encoder untuk semua query
+        dan satu panggilan index.search atas matriks query.
+        Output: list hasil per query (urutan sama dengan input).
+        """
+        if not queries:
+            return []
+        
+        # 1. Encode Query (lewat cache)
+        query_vectors = self.encode_queries(queries)
+        
+        # 2. Search FAISS (nprobe/efSearch hanya berlaku untuk index IVF/HNSW)
+        set_search_params(
+            self.index,
+            nprobe=self.nprobe if nprobe is None else nprobe,
+            ef_search=self.ef_search if ef_search is None else ef_search
+        )
+        # Ambil kandidat lebih banyak agar dokumen terhapus (tombstone) bisa disaring.
+        # Over-fetch dibatasi 2x top_k; query yang masih kurang hasil diulang dengan k dua kali lipat.
+        fetch_k = top_k * 2 if self.deleted_rows else top_k
+        total = self.index.ntotal + (self.delta_index.ntotal if self.delta_index is not None else 0)
+        results = [None] * len(queries)
+        pending = np.arange(len(queries))
+        while len(pending):
+            distances, indices = self._search_candidates(query_vectors[pending], fetch_k)
+            retry = []
+            for q, row_distances, row_indices in zip(pending, distances, indices):
+                formatted = self._format_results(row_distances, row_indices, top_k)
+                if len(formatted) < top_k and fetch_k < total:
+                    retry.append(q)
+                else:
+                    results[q] = formatted
+            pending = np.asarray(retry, dtype=np.int64)
+            fetch_k *= 2
+        return results
+
+    def _search_candidates(self, query_vectors, fetch_k):
+        """
+        fetch_k kandidat per query dari index utama + delta index, diurutkan berdasarkan jarak
+        """
+        distances, indices = self.index.search(query_vectors, fetch_k)
+        
+        # Gabungkan dengan delta index (dokumen yang ditambahkan secara inkremental)
+        if self.delta_index is not None and self.delta_index.ntotal > 0:
+            delta_distances, delta_indices = self.delta_index.search(query_vectors, fetch_k)
+            distances = np.hstack([distances, delta_distances])
+            indices = np.hstack([indices, delta_indices])
+            # Slot kosong (-1) dari FAISS berjarak sangat besar -> tetap di belakang
+            order = np.argsort(distances, axis=1, kind='stable')
+            distances = np.take_along_axis(distances, order, axis=1)
+            indices = np.take_along_axis(indices, order, axis=1)
+        return distances, indices
+
+    def encode_queries(self, queries):
+        """
+        Encode query dengan cache LRU: hanya query yang belum ada di cache
+        yang dikirim ke model (dalam satu forward pass).
+        """
+        vectors = [self.query_cache.get(q) for q in queries]
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(normalize_query(queries[i]), []).append(i)
+        
+        if missing:
+            first_positions = [positions[0] for positions in missing.values()]
+            encoded = self.model.encode([queries[i] for i in first_positions], convert_to_numpy=True)
+            for positions, vector in zip(missing.values(), encoded):
+                self.query_cache.put(queries[positions[0]], vector)
+                for i in positions:
+                    vectors[i] = vector
+        
+        return np.ascontiguousarray(np.vstack(vectors), dtype=np.float32)
+
+    def _format_results(self, distances, indices, top_k):
         results = []
-        for i, idx in enumerate(indices[0]):
+        for i, idx in enumerate(indices):
+            if len(results) >= top_k:
+                break
+            if idx in self.deleted_rows:
+                continue
             if idx < len(self.chunks) and idx >= 0:
+                # Hanya baris top-k yang dibentuk menjadi dict
                 item = self.chunks[idx]
                 
                 # Menggunakan .get() agar aman. 
@@ -98,7 +479,7 @@ class VectorStore:
                     "chunk_id": c_id,        
                     "text": item.get('text', ''),
                     "title": item.get('title', 'Untitled'),
-                    "score": float(distances[0][i]),
+                    "score": float(distances[i]),
                     "metadata": item.get('metadata', {})
                 })
-        return results
\ No newline at end of file
+        return results
@@ -0,0 +1,128 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import faiss
+
+from app.core.vector_store import VectorStore, create_faiss_index, resolve_index_factory, set_search_params
+from app.core.config import DATA_PROCESSED_DIR
+
+# Nilai parameter search-time yang disapu untuk tiap jenis index
+NPROBE_SWEEP = [1, 4, 8, 16, 32, 64]
+EF_SEARCH_SWEEP = [16, 32, 64, 128, 256]
+
+def load_query_vectors(store, num_queries, base_vectors, seed=42):
+    """
+    Query = pertanyaan closed-set yang di-encode seperti jalur VectorStore.search.
+    Jika file soal tidak ada, gunakan vektor korpus acak + noise sebagai pengganti.
+    """
+    csv_path = os.path.join(DATA_PROCESSED_DIR, "closed_set_test_questions.csv")
+    if os.path.exists(csv_path):
+        df = pd.read_csv(csv_path)
+        questions = df.sample(min(num_queries, len(df)), random_state=seed)['question'].tolist()
+        vectors = store.model.encode(questions, convert_to_numpy=True)
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+    print("⚠️ closed_set_test_questions.csv tidak ada, memakai vektor korpus + noise.")
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(base_vectors), size=min(num_queries, len(base_vectors)), replace=False)
+    noise = rng.normal(scale=0.05, size=(len(picks), base_vectors.shape[1]))
+    return np.ascontiguousarray(base_vectors[picks] + noise, dtype=np.float32)
+
+def measure(index, queries, ground_truth, top_k):
+    """
+    Recall@k terhadap index exact + latency rata-rata per query (query satu per satu)
+    """
+    hits = 0
+    start = time.time()
+    for i in range(len(queries)):
+        _, ids = index.search(queries[i:i + 1], top_k)
+        hits += len(set(ids[0].tolist()) & set(ground_truth[i].tolist()))
+    latency_ms = (time.time() - start) / len(queries) * 1000
+    return hits / (len(queries) * top_k), latency_ms
+
+def main(args):
+    print("=== ⚖️ BENCHMARK ANN: RECALL@K vs LATENCY ===")
+
+    # 1. Vektor korpus diambil dari index Flat yang sudah ada (tanpa encoding ulang)
+    store = VectorStore(index_name=args.index_name)
+    store.load()
+    base_vectors = store.index.reconstruct_n(0, store.index.ntotal)
+    base_vectors = np.ascontiguousarray(base_vectors, dtype=np.float32)
+    num_vectors, dimension = base_vectors.shape
+    print(f"[1] {num_vectors} vektor korpus dimuat (dim={dimension}).")
+
+    queries = load_query_vectors(store, args.num_queries, base_vectors)
+    print(f"[2] {len(queries)} query disiapkan.")
+
+    # 2. Ground truth dari pencarian exact
+    exact = faiss.IndexFlatL2(dimension)
+    exact.add(base_vectors)
+    _, ground_truth = exact.search(queries, args.top_k)
+
+    rng = np.random.default_rng(0)
+    train_size = min(num_vectors, args.train_sample)
+    train_vectors = base_vectors[rng.choice(num_vectors, size=train_size, replace=False)]
+
+    rows = []
+    for profile in args.profiles:
+        factory = resolve_index_factory(profile, num_vectors, train_size)
+        print(f"\n[3] Membangun index {profile} ({factory})...")
+        start = time.time()
+        index = create_faiss_index(factory, dimension, num_vectors)
+        if not index.is_trained:
+            index.train(train_vectors)
+        index.add(base_vectors)
+        build_time = time.time() - start
+
+        if "IVF" in factory:
+            sweep = [("nprobe", v) for v in NPROBE_SWEEP]
+        elif "HNSW" in factory:
+            sweep = [("efSearch", v) for v in EF_SEARCH_SWEEP]
+        else:
+            sweep = [(None, None)]
+
+        for param, value in sweep:
+            if param == "nprobe":
+                set_search_params(index, nprobe=value)
+            elif param == "efSearch":
+                set_search_params(index, ef_search=value)
+            recall, latency_ms = measure(index, queries, ground_truth, args.top_k)
+            rows.append({
+                "profile": profile,
+                "factory": factory,
+                "param": param or "-",
+                "value": value if value is not None else "-",
+                f"recall@{args.top_k}": recall,
+                "latency_ms": latency_ms,
+                "build_time_s": build_time,
+                "index_size_mb": faiss.serialize_index(index).nbytes / 1e6
+            })
+            print(f"    {param or '-'}={value if value is not None else '-'} | "
+                  f"recall@{args.top_k}={recall:.3f} | {latency_ms:.3f} ms/query")
+
+    df = pd.DataFrame(rows)
+    print("\n=== HASIL ===")
+    print(df.to_string(index=False))
+
+    output_path = os.path.join(DATA_PROCESSED_DIR, f"benchmark_ann_{args.index_name}.csv")
+    df.to_csv(output_path, index=False)
+    print(f"\n[Save] Hasil benchmark disimpan ke: {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--index_name", type=str, default="hotpot_20k", help="Index Flat acuan (exact)")
+    parser.add_argument("--profiles", type=str, nargs="+", default=["flat", "ivf_flat", "ivf_pq", "hnsw"])
+    parser.add_argument("--num_queries", type=int, default=500)
+    parser.add_argument("--top_k", type=int, default=5)
+    parser.add_argument("--train_sample", type=int, default=50000)
+    args = parser.parse_args()
+    main(args)
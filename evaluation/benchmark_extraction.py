@@ -0,0 +1,108 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import time
+import argparse
+import pandas as pd
+
+from app.core.data_loader import HotpotQALoader
+from app.core.preprocessor import TextPreprocessor
+from app.core.extractor import TripletExtractor, extract_spans, physical_cores, REBEL_MODEL_NAME
+from app.core.config import DATA_PROCESSED_DIR, EXTRACTION_TOKEN_BUDGET, EXTRACTION_SPAN
+
+def load_sample_chunks(limit, records_limit):
+    """
+    Sampel chunk tetap: limit chunk pertama dari records_limit record HotpotQA
+    """
+    loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
+    preprocessor = TextPreprocessor()
+    chunks = []
+    for batch in preprocessor.process_records(loader.iter_records(limit=records_limit), num_workers=1):
+        chunks.extend(batch)
+        if len(chunks) >= limit:
+            break
+    return chunks[:limit]
+
+def triplet_keys(df):
+    if df.empty:
+        return set()
+    return set(zip(df['chunk_id'], df['head'], df['relation'], df['tail']))
+
+def run_spans(extractor, chunks, span_size, batch_size, num_workers=1, model_name=REBEL_MODEL_NAME):
+    """
+    Jalur yang sama dengan run_indexing: extract_spans per span_size chunk,
+    batch_size = item maksimum per batch (pengurutan token_budget hanya di dalam span)
+    """
+    start = time.time()
+    frames = [df_span for _, _, df_span, _ in extract_spans(chunks, span_size, batch_size=batch_size,
+                                                          num_workers=num_workers, extractor=extractor,
+                                                          model_name=model_name)]
+    duration = time.time() - start
+    return duration, pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def main(args):
+    print("=== ⏱️ BENCHMARK EKSTRAKSI REBEL: BATCHING, SPAN & WORKER ===")
+    chunks = load_sample_chunks(args.limit, args.records)
+    print(f"[1] {len(chunks)} chunk sampel dimuat.")
+
+    extractor = TripletExtractor(args.model, batching="fixed")
+    rows, baseline = [], None
+
+    def add_row(mode, span_size, duration, df_result, token_budget=None):
+        nonlocal baseline
+        keys = triplet_keys(df_result)
+        if baseline is None:
+            baseline = keys
+        # Padding berbeda bisa menggeser hasil beam search sedikit -> laporkan irisan (Jaccard)
+        overlap = len(keys & baseline) / max(len(keys | baseline), 1)
+        rows.append({"mode": mode, "span": span_size, "batch_size": args.batch_size, "token_budget": token_budget,
+                     "duration": duration, "chunks_per_sec": len(chunks) / duration,
+                     "triplets": len(keys), "overlap": overlap})
+        print(f"    {mode} span={span_size} budget={token_budget}: {len(chunks) / duration:.2f} chunk/s")
+
+    # 1. Acuan: batch tetap, span = batch_size (jalur run_indexing sebelum token_budget)
+    duration, df_result = run_spans(extractor, chunks, args.batch_size, args.batch_size)
+    add_row("fixed", args.batch_size, duration, df_result)
+
+    # 2. token_budget per span: span = batch_size (jendela pengurutan sempit) vs span besar
+    extractor.batching = "token_budget"
+    for budget in args.token_budgets:
+        extractor.token_budget = budget
+        for span_size in (args.batch_size, args.span):
+            duration, df_result = run_spans(extractor, chunks, span_size, args.batch_size)
+            add_row("token_budget", span_size, duration, df_result, budget)
+
+    # 3. Skala multi-process: setting default config (EXTRACTION_BATCHING/TOKEN_BUDGET) di tiap worker
+    print(f"\n[2] Skala worker ({physical_cores()} core fisik)")
+    extractor.token_budget = EXTRACTION_TOKEN_BUDGET
+    for workers in args.workers:
+        duration, df_result = run_spans(extractor, chunks, args.span, args.batch_size,
+                                        num_workers=workers, model_name=args.model)
+        add_row(f"workers={workers}", args.span, duration, df_result, EXTRACTION_TOKEN_BUDGET)
+
+    df = pd.DataFrame(rows)
+    df["speedup"] = rows[0]["duration"] / df["duration"]
+    print("\n=== HASIL ===")
+    print(df.to_string(index=False))
+
+    output_path = os.path.join(DATA_PROCESSED_DIR, "benchmark_extraction.csv")
+    df.to_csv(output_path, index=False)
+    print(f"\n[Save] Hasil benchmark disimpan ke: {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=2048, help="Jumlah chunk sampel")
+    parser.add_argument("--records", type=int, default=500, help="Jumlah record HotpotQA yang dibaca")
+    parser.add_argument("--model", type=str, default=REBEL_MODEL_NAME)
+    parser.add_argument("--batch_size", type=int, default=64, help="Item maksimum per batch (default run_indexing)")
+    parser.add_argument("--span", type=int, default=EXTRACTION_SPAN, help="Chunk per span (--extract_span run_indexing)")
+    parser.add_argument("--token_budgets", type=int, nargs="+", default=[2048, 4096, 8192])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="Jumlah process ekstraksi yang diukur (1 = process utama)")
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,104 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+from app.core.graph_builder import build_networkx_graph, build_csr_graph, build_linking_table
+from app.core.config import DATA_PROCESSED_DIR
+
+def loop_build_graph(df_triplets):
+    # Implementasi lama (run_indexing.build_networkx_graph sebelum vektorisasi)
+    G = nx.DiGraph()
+    for _, row in df_triplets.iterrows():
+        G.add_edge(row['head'], row['tail'], relation=row['relation'], source_id=row['chunk_id'])
+    return G
+
+def loop_build_linking(df_triplets):
+    linking_data = []
+    for _, row in df_triplets.iterrows():
+        linking_data.append({'entity': row['head'], 'chunk_id': row['chunk_id']})
+        linking_data.append({'entity': row['tail'], 'chunk_id': row['chunk_id']})
+    return pd.DataFrame(linking_data).drop_duplicates().reset_index(drop=True)
+
+def synthetic_triplets(num_triplets, num_entities, seed=42):
+    """
+    Triplet sintetis dengan distribusi entitas miring (mirip graf REBEL) dan duplikat
+    """
+    rng = np.random.default_rng(seed)
+    entity_ids = np.minimum(rng.zipf(1.3, size=(num_triplets, 2)), num_entities) - 1
+    relations = np.array(["country", "director", "cast member", "located in", "part of", "instance of"])
+    return pd.DataFrame({
+        'head': [f"Entity {i}" for i in entity_ids[:, 0]],
+        'relation': relations[rng.integers(0, len(relations), num_triplets)],
+        'tail': [f"Entity {i}" for i in entity_ids[:, 1]],
+        'chunk_id': [f"chunk_{i}" for i in rng.integers(0, num_triplets // 3 + 1, num_triplets)],
+    })
+
+def same_graph(G1, G2):
+    if list(G1.nodes()) != list(G2.nodes()):
+        return False
+    if list(G1.edges(data=True)) != list(G2.edges(data=True)):
+        return False
+    return all(list(G1.predecessors(n)) == list(G2.predecessors(n)) for n in G1.nodes())
+
+def timed(fn, *args):
+    start = time.time()
+    result = fn(*args)
+    return time.time() - start, result
+
+def main(args):
+    print("=== 🏗️ BENCHMARK GRAPH CONSTRUCTION: ITERROWS vs KOLUMNAR ===")
+
+    triplet_path = os.path.join(DATA_PROCESSED_DIR, f"triplets_{args.suffix}.csv")
+    if os.path.exists(triplet_path) and not args.synthetic:
+        df = pd.read_csv(triplet_path)
+        print(f"[1] {len(df)} triplet dimuat dari {triplet_path}")
+    else:
+        df = synthetic_triplets(args.num_triplets, args.num_entities)
+        print(f"[1] {len(df)} triplet sintetis dibuat.")
+
+    rows = []
+    loop_graph_time, G_loop = timed(loop_build_graph, df)
+    new_graph_time, G_new = timed(build_networkx_graph, df)
+    rows.append({"stage": "graph (networkx)", "loop_s": loop_graph_time, "columnar_s": new_graph_time,
+                 "speedup": loop_graph_time / new_graph_time, "identical": same_graph(G_loop, G_new)})
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csr_time, G_csr = timed(build_csr_graph, df, os.path.join(tmp_dir, "graph_csr"))
+        csr_same = (list(G_csr.nodes()) == [str(n) for n in G_loop.nodes()]
+                    and G_csr.number_of_edges() == G_loop.number_of_edges())
+        rows.append({"stage": "graph (csr)", "loop_s": loop_graph_time, "columnar_s": csr_time,
+                     "speedup": loop_graph_time / csr_time, "identical": csr_same})
+
+    loop_link_time, link_loop = timed(loop_build_linking, df)
+    new_link_time, link_new = timed(build_linking_table, df)
+    rows.append({"stage": "entity linking", "loop_s": loop_link_time, "columnar_s": new_link_time,
+                 "speedup": loop_link_time / new_link_time, "identical": link_loop.equals(link_new)})
+
+    result = pd.DataFrame(rows)
+    print(f"\nNodes: {G_new.number_of_nodes()} | Edges: {G_new.number_of_edges()} | Linking rows: {len(link_new)}")
+    print("\n=== HASIL ===")
+    print(result.to_string(index=False))
+
+    output_path = os.path.join(DATA_PROCESSED_DIR, "benchmark_graph_build.csv")
+    result.to_csv(output_path, index=False)
+    print(f"\n[Save] Hasil benchmark disimpan ke: {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--suffix", type=str, default="20k", help="Pakai triplets_{suffix}.csv jika ada")
+    parser.add_argument("--synthetic", action="store_true", help="Paksa memakai triplet sintetis")
+    parser.add_argument("--num_triplets", type=int, default=500000)
+    parser.add_argument("--num_entities", type=int, default=100000)
+    args = parser.parse_args()
+    main(args)
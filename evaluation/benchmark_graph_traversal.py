@@ -0,0 +1,74 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from app.core.data_loader import HotpotQALoader
+from app.core.retriever_graph import GraphRetriever
+from app.core.graph_traversal import GraphTraverser
+from app.core.config import DATA_PROCESSED_DIR, GRAPH_PKL_NAME, GRAPH_BACKEND
+
+def main(args):
+    print("=== 🕸️ BENCHMARK TRAVERSAL GRAF: DEPTH x RANKING ===")
+    loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
+    questions = [record['question'] for record in loader.iter_records(limit=args.limit)]
+    print(f"[1] {len(questions)} pertanyaan dimuat.")
+
+    retriever = GraphRetriever(graph_file=args.graph_file, backend=args.backend, linking="string")
+    if not retriever.G:
+        return
+    print(f"[2] Graf ({args.backend}): {retriever.G.number_of_nodes()} node, {retriever.G.number_of_edges()} edge.")
+
+    # Entity linking dihitung sekali: yang diukur hanya traversal (tahap 2 GraphRetriever.retrieve)
+    start_nodes = [retriever.link_entities_string(q) for q in questions]
+    traverser = GraphTraverser(retriever.G)
+
+    rows = []
+    for depth in args.depths:
+        for rank in args.ranks:
+            rank = None if rank == "none" else rank
+            latencies, num_facts = [], []
+            for nodes in start_nodes:
+                start = time.perf_counter()
+                facts = traverser.traverse(nodes, depth=depth, rank=rank)
+                latencies.append(time.perf_counter() - start)
+                num_facts.append(len(facts))
+            latencies = np.array(latencies) * 1000
+            rows.append({
+                "depth": depth,
+                "rank": rank or "bfs",
+                "ms_mean": latencies.mean(),
+                "ms_p50": np.percentile(latencies, 50),
+                "ms_p95": np.percentile(latencies, 95),
+                "ms_max": latencies.max(),
+                "avg_facts": np.mean(num_facts),
+                "empty_rate": np.mean([n == 0 for n in num_facts]),
+            })
+            print(f"    depth={depth} rank={rank or 'bfs'}: {latencies.mean():.2f} ms/query")
+    retriever.close()
+
+    df = pd.DataFrame(rows)
+    print("\n=== HASIL ===")
+    print(df.to_string(index=False))
+
+    output_path = os.path.join(DATA_PROCESSED_DIR, "benchmark_graph_traversal.csv")
+    df.to_csv(output_path, index=False)
+    print(f"\n[Save] Hasil benchmark disimpan ke: {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=1000, help="Jumlah pertanyaan HotpotQA (dari awal file)")
+    parser.add_argument("--graph_file", type=str, default=GRAPH_PKL_NAME)
+    parser.add_argument("--backend", type=str, default=GRAPH_BACKEND, choices=["networkx", "csr", "sqlite"])
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--ranks", type=str, nargs="+", default=["none", "ppr"], choices=["none", "ppr"])
+    args = parser.parse_args()
+    main(args)
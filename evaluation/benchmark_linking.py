@@ -0,0 +1,99 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import time
+import argparse
+import pandas as pd
+
+from app.core.data_loader import HotpotQALoader
+from app.core.retriever_graph import GraphRetriever
+from app.core.config import DATA_PROCESSED_DIR, GRAPH_PKL_NAME, NODE_LINK_TOP_N
+
+def load_questions(limit):
+    """
+    (pertanyaan, set judul supporting fact lowercase) dari record HotpotQA yang ter-index
+    """
+    loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
+    questions, gold_titles = [], []
+    for record in loader.iter_records(limit=limit):
+        questions.append(record['question'])
+        gold_titles.append({str(title).lower().strip() for title, _ in record.get('supporting_facts', [])})
+    return questions, gold_titles
+
+def score(name, linked, reference, gold_titles, duration):
+    """
+    Precision/recall (mikro) terhadap linker string + kecocokan dengan judul supporting fact
+    """
+    common = sum(len(set(l) & set(r)) for l, r in zip(linked, reference))
+    num_linked = sum(len(l) for l in linked)
+    num_reference = sum(len(r) for r in reference)
+    title_hits, title_found, title_total = 0, 0, 0
+    for nodes, titles in zip(linked, gold_titles):
+        found = titles & {str(n).lower().strip() for n in nodes}
+        title_hits += bool(found)
+        title_found += len(found)
+        title_total += len(titles)
+    return {
+        "linker": name,
+        "precision_vs_string": common / num_linked if num_linked else 0.0,
+        "recall_vs_string": common / num_reference if num_reference else 0.0,
+        "avg_linked": num_linked / len(linked),
+        "empty_rate": sum(not l for l in linked) / len(linked),
+        "gold_title_hit": title_hits / len(linked),
+        "gold_title_recall": title_found / title_total if title_total else 0.0,
+        "ms_per_query": duration / len(linked) * 1000,
+    }
+
+def main(args):
+    print("=== 🔗 BENCHMARK ENTITY LINKING: SEMANTIK vs STRING ===")
+    questions, gold_titles = load_questions(args.limit)
+    print(f"[1] {len(questions)} pertanyaan dimuat.")
+
+    retriever = GraphRetriever(graph_file=GRAPH_PKL_NAME, linking="string")
+    if not retriever.G:
+        return
+
+    # 1. Acuan: linker string (hasil identik dengan loop node lama)
+    start = time.time()
+    string_nodes = [retriever.link_entities_string(q) for q in questions]
+    string_time = time.time() - start
+    rows = [score("string", string_nodes, string_nodes, gold_titles, string_time)]
+
+    # 2. Linker semantik: satu pencarian ANN per query, disaring per ambang jarak
+    #    (waktu encode query tidak dihitung: embedding dibagi dengan vector retrieval)
+    node_index = retriever._load_node_index()
+    query_vectors = retriever.encoder.encode_queries(questions)
+    start = time.time()
+    distances, positions = zip(*(node_index.search(query_vectors[i], args.top_n) for i in range(len(questions))))
+    search_time = time.time() - start
+    nodes = retriever.entity_index.nodes
+
+    for threshold in args.thresholds:
+        semantic_nodes = [[nodes[p] for d, p in zip(dist[0], pos[0]) if p >= 0 and d <= threshold][:5]
+                          for dist, pos in zip(distances, positions)]
+        rows.append(score(f"semantic@{threshold}", semantic_nodes, string_nodes, gold_titles, search_time))
+        both_nodes = [list(dict.fromkeys(s + r))[:5] for s, r in zip(semantic_nodes, string_nodes)]
+        rows.append(score(f"both@{threshold}", both_nodes, string_nodes, gold_titles, search_time + string_time))
+    retriever.close()
+
+    df = pd.DataFrame(rows)
+    print("\n=== HASIL ===")
+    print(df.to_string(index=False))
+
+    output_path = os.path.join(DATA_PROCESSED_DIR, "benchmark_linking.csv")
+    df.to_csv(output_path, index=False)
+    print(f"\n[Save] Hasil benchmark disimpan ke: {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=1000, help="Jumlah pertanyaan HotpotQA (dari awal file)")
+    parser.add_argument("--top_n", type=int, default=NODE_LINK_TOP_N)
+    # Jarak L2^2 antar embedding ternormalisasi: d = 2 - 2*cos
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.8, 1.0, 1.2])
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,69 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import time
+import argparse
+import pandas as pd
+
+from app.core.data_loader import HotpotQALoader
+from app.core.preprocessor import TextPreprocessor
+from app.core.config import DATA_PROCESSED_DIR
+
+def run_preprocessing(preprocessor, records, num_workers, batch_size):
+    """
+    Menjalankan preprocessing dan mengembalikan (durasi, list id chunk)
+    """
+    start = time.time()
+    chunk_ids = []
+    for chunks in preprocessor.process_records(records, num_workers=num_workers, batch_size=batch_size):
+        chunk_ids.extend(c['id'] for c in chunks)
+    return time.time() - start, chunk_ids
+
+def main(args):
+    print("=== ⏱️ BENCHMARK PREPROCESSING: SERIAL vs PROCESS POOL ===")
+
+    # Record dimuat ke memori terlebih dahulu agar waktu parsing JSON tidak ikut terukur
+    loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
+    records = list(loader.iter_records(limit=args.limit))
+    print(f"[1] {len(records)} record dimuat. CPU tersedia: {os.cpu_count()}")
+    if (os.cpu_count() or 1) < 2:
+        print("⚠️ Hanya 1 CPU: process pool tidak bisa lebih cepat dari serial (overhead pickle/IPC).")
+
+    preprocessor = TextPreprocessor()
+    rows = []
+
+    duration, serial_ids = run_preprocessing(preprocessor, records, 1, args.batch_size)
+    rows.append({"mode": "serial", "workers": 1, "duration": duration,
+                 "records_per_sec": len(records) / duration, "chunks": len(serial_ids)})
+
+    for workers in args.workers:
+        duration, parallel_ids = run_preprocessing(preprocessor, records, workers, args.batch_size)
+        # Urutan & id chunk harus identik dengan jalur serial
+        identical = parallel_ids == serial_ids
+        rows.append({"mode": "process_pool", "workers": workers, "duration": duration,
+                     "records_per_sec": len(records) / duration, "chunks": len(parallel_ids),
+                     "identical": identical})
+        if not identical:
+            print(f"❌ Output {workers} worker berbeda dengan jalur serial!")
+
+    df = pd.DataFrame(rows)
+    df["speedup"] = rows[0]["duration"] / df["duration"]
+    print("\n=== HASIL ===")
+    print(df.to_string(index=False))
+
+    output_path = os.path.join(DATA_PROCESSED_DIR, "benchmark_preprocessing.csv")
+    df.to_csv(output_path, index=False)
+    print(f"\n[Save] Hasil benchmark disimpan ke: {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=20000)
+    parser.add_argument("--batch_size", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,76 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import time
+import argparse
+import pandas as pd
+
+from app.core.extractor import TripletExtractor
+from app.core.config import DATA_PROCESSED_DIR, GENERATION_PROFILES
+from benchmark_extraction import load_sample_chunks, triplet_keys
+
+def run_profile(extractor, chunks, profile, batch_size):
+    extractor.set_profile(profile)
+    start = time.time()
+    df = extractor.process_batch(chunks, batch_size=batch_size)
+    return time.time() - start, triplet_keys(df)
+
+def main(args):
+    print("=== ⏱️ BENCHMARK BACKEND & PROFIL REBEL (acuan: torch fp32 beam3) ===")
+    chunks = load_sample_chunks(args.limit, args.records)
+    print(f"[1] {len(chunks)} chunk sampel dimuat.")
+
+    rows = []
+    baseline = None
+    for backend in args.backends:
+        try:
+            extractor = TripletExtractor(backend=backend)
+        except ImportError as e:
+            print(f"⚠️ Backend {backend} dilewati: {e}")
+            continue
+        # Warm-up agar waktu load/alokasi pertama tidak ikut terukur
+        extractor.process_batch(chunks[:args.batch_size], batch_size=args.batch_size)
+
+        for profile in args.profiles:
+            duration, keys = run_profile(extractor, chunks, profile, args.batch_size)
+            if baseline is None:
+                if (backend, profile) != ("torch", "beam3"):
+                    raise ValueError("Kombinasi pertama harus torch/beam3 (output acuan)")
+                baseline = keys
+            common = len(keys & baseline)
+            precision = common / len(keys) if keys else 0.0
+            recall = common / len(baseline) if baseline else 0.0
+            rows.append({
+                "backend": backend, "profile": profile,
+                "duration": duration, "chunks_per_sec": len(chunks) / duration,
+                "triplets": len(keys), "precision": precision, "recall": recall,
+                "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            })
+            print(f"   {backend}/{profile}: {rows[-1]['chunks_per_sec']:.2f} chunks/s, F1 vs acuan {rows[-1]['f1']:.3f}")
+        del extractor
+
+    df = pd.DataFrame(rows)
+    df["speedup"] = df["chunks_per_sec"] / rows[0]["chunks_per_sec"]
+    print("\n=== HASIL ===")
+    print(df.to_string(index=False))
+
+    output_path = os.path.join(DATA_PROCESSED_DIR, "benchmark_rebel_profiles.csv")
+    df.to_csv(output_path, index=False)
+    print(f"\n[Save] Hasil benchmark disimpan ke: {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=200, help="Jumlah chunk sampel (tetap)")
+    parser.add_argument("--records", type=int, default=500, help="Jumlah record HotpotQA yang dibaca")
+    parser.add_argument("--batch_size", type=int, default=16)
+    parser.add_argument("--backends", type=str, nargs="+", default=["torch", "int8", "onnx"])
+    # beam3 pertama: backend torch + beam3 adalah output acuan
+    parser.add_argument("--profiles", type=str, nargs="+", default=["beam3", "beam2", "greedy"],
+                        choices=list(GENERATION_PROFILES))
+    args = parser.parse_args()
+    main(args)
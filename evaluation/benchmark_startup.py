@@ -0,0 +1,111 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import time
+START_TIME = time.time()
+
+import argparse
+import json
+import resource
+import subprocess
+
+RESULT_PREFIX = "STARTUP_RESULT "
+
+def current_rss_mb():
+    """
+    RSS saat ini dari /proc (Linux); fallback ke peak RSS jika /proc tidak ada
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+def peak_rss_mb():
+    # ru_maxrss dalam KB di Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_child(args):
+    """
+    Dijalankan di subprocess terpisah: inisialisasi pipeline untuk satu mode saja,
+    lalu cetak waktu startup & RSS sebagai satu baris JSON.
+    """
+    from app.core.rag_pipeline import RAGPipeline
+
+    import_time = time.time() - START_TIME
+    pipeline = RAGPipeline(modes=[args.child], load_generator=args.with_generator,
+                           mmap=not args.no_mmap)
+    startup_time = time.time() - START_TIME
+
+    query_start = time.time()
+    pipeline.get_retriever(args.child).retrieve(args.query)
+    first_query_time = time.time() - query_start
+
+    result = {
+        "mode": args.child,
+        "mmap": not args.no_mmap,
+        "generator": args.with_generator,
+        "import_s": import_time,
+        "startup_s": startup_time,
+        "first_query_s": first_query_time,
+        "rss_mb": current_rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+        "graph_loaded": pipeline._graph_retriever is not None or pipeline._hybrid_retriever is not None,
+    }
+    print(RESULT_PREFIX + json.dumps(result))
+
+def main(args):
+    import pandas as pd
+    from app.core.config import DATA_PROCESSED_DIR
+
+    print("=== 🚀 BENCHMARK STARTUP: WAKTU & RSS PER MODE ===")
+    rows = []
+    for mode in args.modes:
+        for no_mmap in ([False, True] if args.compare_mmap else [False]):
+            cmd = [sys.executable, os.path.abspath(__file__), "--child", mode, "--query", args.query]
+            if no_mmap:
+                cmd.append("--no_mmap")
+            if args.with_generator:
+                cmd.append("--with_generator")
+            print(f"\n[Run] mode={mode} | mmap={not no_mmap}")
+            proc = subprocess.run(cmd, capture_output=True, text=True, cwd=parent_dir)
+            lines = [l for l in proc.stdout.splitlines() if l.startswith(RESULT_PREFIX)]
+            if proc.returncode != 0 or not lines:
+                print(f"❌ Gagal (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+                continue
+            result = json.loads(lines[-1][len(RESULT_PREFIX):])
+            print(f"    startup={result['startup_s']:.2f}s | rss={result['rss_mb']:.0f} MB | "
+                  f"peak={result['peak_rss_mb']:.0f} MB")
+            rows.append(result)
+
+    if not rows:
+        return
+    df = pd.DataFrame(rows)
+    print("\n=== HASIL ===")
+    print(df.to_string(index=False))
+
+    output_path = os.path.join(DATA_PROCESSED_DIR, "benchmark_startup.csv")
+    df.to_csv(output_path, index=False)
+    print(f"\n[Save] Hasil benchmark disimpan ke: {output_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", type=str, nargs="+", default=["vector", "graph", "hybrid"])
+    parser.add_argument("--query", type=str, default="Who directed the film Titanic?")
+    parser.add_argument("--compare_mmap", action="store_true", help="Bandingkan load mmap vs load penuh")
+    parser.add_argument("--with_generator", action="store_true", help="Ikut memuat LLM (GGUF)")
+    parser.add_argument("--child", type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--no_mmap", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args)
+    else:
+        main(args)
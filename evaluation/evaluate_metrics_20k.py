@@ -6,13 +6,14 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
+import time
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from tqdm import tqdm
 
 from app.core.rag_pipeline import RAGPipeline
-from app.core.config import DATA_PROCESSED_DIR
+from app.core.config import DATA_PROCESSED_DIR, GRAPH_DEPTH, GRAPH_RANK
 
 # Import Metrics Calculator
 try:
@@ -98,6 +99,7 @@ def main():
     OUTPUT_PATH = os.path.join(DATA_PROCESSED_DIR, OUTPUT_FILE)
     CHART_PATH = os.path.join(DATA_PROCESSED_DIR, OUTPUT_CHART)
     CSV_SOURCE = os.path.join(DATA_PROCESSED_DIR, "closed_set_test_questions.csv")
+    print(f"    Penelusuran graf: depth={GRAPH_DEPTH}, rank={GRAPH_RANK}")
 
     # --- 2. LOAD DATASET ---
     print(f"[1] Memuat Soal Ujian dari: {CSV_SOURCE}")
@@ -132,11 +134,18 @@ def main():
     modes = ["vector", "graph", "hybrid"]
     results = []
     
+    # Pre-retrieval mode vector: semua soal di-encode & dicari dalam satu batch
+    print("    Pre-retrieval Vector-RAG (batch)...")
+    start_batch = time.time()
+    vector_contexts = pipeline.vector_retriever.retrieve_batch(df_sample['question'].tolist(), top_k=3)
+    # Biaya retrieval batch dibagi rata ke setiap soal agar latency tetap sebanding
+    vector_retrieval_latency = (time.time() - start_batch) / max(len(df_sample), 1)
+    
     print(f"\n[3] 🔥 MEMULAI PENGUJIAN ({len(df_sample)} Soal x 3 Mode)...")
 
     # Loop Pertanyaan
     counter = 0
-    for idx, row in tqdm(df_sample.iterrows(), total=len(df_sample), desc="Testing"):
+    for pos, (idx, row) in enumerate(tqdm(df_sample.iterrows(), total=len(df_sample), desc="Testing")):
         query = row['question']
         ground_truth = row['answer']
         q_id = row['id']
@@ -144,9 +153,14 @@ def main():
         for mode in modes:
             try:
                 # A. Jalankan Pipeline
-                res = pipeline.answer_question(query, mode=mode, top_k=3)
+                if mode == "vector":
+                    res = pipeline.answer_question(query, mode=mode, top_k=3, contexts=vector_contexts[pos])
+                    latency = res['latency'] + vector_retrieval_latency
+                else:
+                    res = pipeline.answer_question(query, mode=mode, top_k=3,
+                                                   depth=GRAPH_DEPTH, rank=GRAPH_RANK)
+                    latency = res['latency']
                 prediction = res['answer']
-                latency = res['latency']
                 contexts = res['contexts']
                 
                 # B. Hitung Metrik Tradisional
@@ -168,6 +182,8 @@ def main():
                     "faithfulness": faithfulness,
                     "relevancy": relevancy,
                     "latency": latency,
+                    "graph_depth": GRAPH_DEPTH,
+                    "graph_rank": GRAPH_RANK,
                     "question": query,
                     "prediction": prediction,
                     "ground_truth": ground_truth
@@ -194,6 +210,11 @@ def main():
         print("\n=== 📈 RATA-RATA PERFORMA (SKRIPSI) ===")
         print(summary)
         
+        # Statistik cache embedding query (vector & hybrid memakai cache yang sama)
+        query_cache = pipeline.vector_retriever.store.query_cache
+        print(f"\n[Info] Query embedding cache: {query_cache.stats()}")
+        query_cache.save()
+        
         # --- 5. GENERATE RADAR CHART ---
         print("\n[5] 🎨 Membuat Visualisasi Radar Chart...")
         plot_radar_chart(summary, CHART_PATH)
@@ -2,25 +2,12 @@ import time
 import os
 import pickle
 import pandas as pd
-import networkx as nx
 from app.core.data_loader import HotpotQALoader
 from app.core.preprocessor import TextPreprocessor
 from app.core.extractor import TripletExtractor
+from app.core.graph_builder import build_networkx_graph, build_linking_table
 from app.core.config import DATA_PROCESSED_DIR
 
-def build_networkx_graph(df_triplets):
-    """Konversi DataFrame triplet menjadi objek NetworkX"""
-    G = nx.DiGraph() # Directed Graph (Berarah)
-    
-    print(f"[GraphBuilder] Membangun graf dari {len(df_triplets)} relasi...")
-    for _, row in df_triplets.iterrows():
-        head = row['head']
-        tail = row['tail']
-        relation = row['relation']
-        G.add_edge(head, tail, relation=relation, source_id=row['chunk_id'])
-        
-    return G
-
 def main():
     print("=== 🕸️ MEMULAI PROSES KONSTRUKSI GRAPH (GraphRAG) ===")
     start_global = time.time()
@@ -29,11 +16,7 @@ def main():
     LIMIT_DATA = 20 
     
     loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
-    raw_data = loader.load_data(limit=LIMIT_DATA)
-    
-    if not raw_data:
-        print("Data kosong atau tidak ditemukan.")
-        return
+    raw_data = loader.iter_records(limit=LIMIT_DATA)
 
     # 2. Preprocessing
     print("\n[2] Preprocessing & Chunking...")
@@ -44,6 +27,10 @@ def main():
         chunks = preprocessor.process_record(record)
         all_chunks.extend(chunks)
         
+    if not all_chunks:
+        print("Data kosong atau tidak ditemukan.")
+        return
+
     print(f"Total chunks yang akan diproses: {len(all_chunks)}")
     
     # 3. Ekstraksi Relasi (REBEL)
@@ -68,6 +55,7 @@ def main():
 
     # 5. Bangun Graf NetworkX & Simpan
     print("\n[4] Membangun Struktur Graf...")
+    print(f"[GraphBuilder] Membangun graf dari {len(df_triplets)} relasi...")
     G = build_networkx_graph(df_triplets)
     
     print(f"Statistik Graf:")
@@ -81,13 +69,7 @@ def main():
     
     # 6. Buat Entity Linking Table (Untuk Hybrid-RAG)
     print("\n[5] Membuat Entity-Text Linking Table...")
-    linking_data = []
-    
-    for _, row in df_triplets.iterrows():
-        linking_data.append({'entity': row['head'], 'chunk_id': row['chunk_id']})
-        linking_data.append({'entity': row['tail'], 'chunk_id': row['chunk_id']})
-        
-    df_linking = pd.DataFrame(linking_data).drop_duplicates()
+    df_linking = build_linking_table(df_triplets)
     link_path = os.path.join(DATA_PROCESSED_DIR, "entity_linking.csv")
     df_linking.to_csv(link_path, index=False)
     print(f"[Save] Linking table disimpan ke: {link_path}")
@@ -11,11 +11,7 @@ def main():
     LIMIT_DATA = 100  
     
     loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
-    raw_data = loader.load_data(limit=LIMIT_DATA)
-    
-    if not raw_data:
-        print("Data kosong!")
-        return
+    raw_data = loader.iter_records(limit=LIMIT_DATA)
 
     # 2. Preprocessing & Chunking
     print("\n[2] Melakukan Preprocessing & Chunking...")
@@ -26,6 +22,10 @@ def main():
         chunks = preprocessor.process_record(record)
         all_documents.extend(chunks)
         
+    if not all_documents:
+        print("Data kosong!")
+        return
+
     print(f"Total dokumen (chunks) yang akan di-embed: {len(all_documents)}")
     
     # 3. Vector Store Creation
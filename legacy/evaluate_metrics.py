@@ -1,11 +1,11 @@
 import time
-import json
 import random
 import os
 import pandas as pd
 from tqdm import tqdm
 from app.core.rag_pipeline import RAGPipeline
-from app.core.config import DATA_RAW_DIR, DATA_PROCESSED_DIR
+from app.core.config import DATA_PROCESSED_DIR
+from app.core.data_loader import HotpotQALoader
 from app.core.utils_metrics import compute_exact_match, compute_f1, LocalRagasEvaluator
 
 def main():
@@ -17,10 +17,8 @@ def main():
     
     # 2. Load Data Valid
     print("[1] Memuat Dataset...")
-    file_path = os.path.join(DATA_RAW_DIR, "hotpot_train_v1.1.json")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        all_data = json.load(f)
-    valid_data = all_data[:DATA_INDEXED]
+    loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
+    valid_data = list(loader.iter_records(limit=DATA_INDEXED))
     test_samples = random.sample(valid_data, JUMLAH_SAMPEL)
     
     # 3. Inisialisasi Pipeline & Evaluator
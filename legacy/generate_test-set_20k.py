@@ -1,48 +1,52 @@
 import os
-import json
-import pickle
 import pandas as pd
 from tqdm import tqdm
 from app.core.config import (
-    DATA_RAW_DIR, 
     DATA_PROCESSED_DIR, 
-    METADATA_NAME
+    METADATA_NAME,
+    CHUNK_STORE_NAME,
+    QUESTION_MAP_NAME
 )
+from app.core.data_loader import HotpotQALoader
+from app.core.chunk_store import ChunkStore
 
 def generate_closed_set_questions():
     print("=== 🎯 MENYIAPKAN DATA UJI (STRATEGI CLOSED-SET) [REVISI] ===")
     
     # 1. Tentukan Path File
     path_meta_pkl = os.path.join(DATA_PROCESSED_DIR, METADATA_NAME)
-    path_raw_json = os.path.join(DATA_RAW_DIR, "hotpot_train_v1.1.json")
+    path_chunk_store = os.path.join(DATA_PROCESSED_DIR, CHUNK_STORE_NAME)
+    loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
     output_csv = os.path.join(DATA_PROCESSED_DIR, "closed_set_test_questions.csv")
     
-    print(f"📂 Membaca Metadata dari: {path_meta_pkl}")
-    
-    # 2. Load Metadata (.pkl)
-    if not os.path.exists(path_meta_pkl):
-        print(f"❌ Error: File metadata tidak ditemukan di {path_meta_pkl}")
-        return
+    # 2. Load Metadata (chunk store kolumnar, migrasi dari .pkl jika perlu)
+    if not os.path.exists(path_chunk_store):
+        if not os.path.exists(path_meta_pkl):
+            print(f"❌ Error: File metadata tidak ditemukan di {path_meta_pkl}")
+            return
+        ChunkStore.from_pickle(path_meta_pkl, path_chunk_store)
 
-    with open(path_meta_pkl, 'rb') as f:
-        chunks_data = pickle.load(f)
+    print(f"📂 Membaca Metadata dari: {path_chunk_store}")
+    chunk_store = ChunkStore(path_chunk_store)
     
     # --- PERBAIKAN LOGIKA EKSTRAKSI ID ---
+    # ID pertanyaan tersimpan sebagai dictionary -> tidak perlu memindai semua chunk
     print("🔍 Sedang mengekstrak ID unik dari metadata...")
-    valid_ids = set()
-    
-    for chunk in tqdm(chunks_data, desc="Scanning Chunks"):
-        # Kita ambil dari metadata -> original_question_id
-        # Sesuai hasil inspeksi: {'metadata': {'original_question_id': '...'}}
-        if 'metadata' in chunk and 'original_question_id' in chunk['metadata']:
-             valid_ids.add(chunk['metadata']['original_question_id'])
+    valid_ids = set(chunk_store.question_ids())
+
+    # Jika indexing memakai deduplikasi, chunk kanonik hanya menyimpan ID pertanyaan pertama.
+    # Mapping lengkap question_id -> chunk_id ada di file question map.
+    path_question_map = os.path.join(DATA_PROCESSED_DIR, QUESTION_MAP_NAME)
+    if os.path.exists(path_question_map):
+        df_map = pd.read_csv(path_question_map)
+        valid_ids.update(df_map['question_id'].astype(str))
             
     print(f"✅ Ditemukan {len(valid_ids)} ID unik Pertanyaan yang ter-index.")
 
     # 3. Load Raw JSON
-    print(f"📂 Membaca Raw Data dari: {path_raw_json}")
-    with open(path_raw_json, 'r') as f:
-        raw_data = json.load(f)
+    # Raw JSON dibaca secara streaming (tidak dimuat penuh ke memori)
+    print(f"📂 Membaca Raw Data dari: {loader.file_path}")
+    raw_data = loader.iter_records()
         
     # 4. Filtering (Match ID Raw dengan ID Valid)
     print("🚀 Mencocokkan dengan Dataset Asli...")
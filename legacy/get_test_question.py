@@ -1,18 +1,13 @@
-import json
 import random
-import os
-from app.core.config import DATA_RAW_DIR
+from app.core.data_loader import HotpotQALoader
 
 def main():
-    file_path = os.path.join(DATA_RAW_DIR, "hotpot_train_v1.1.json")
-    
-    print(f"Membaca file: {file_path}...")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
     
     JUMLAH_DATA_INDEXED = 90000
     
-    valid_data = data[:JUMLAH_DATA_INDEXED]
+    print(f"Membaca file: {loader.file_path}...")
+    valid_data = list(loader.iter_records(limit=JUMLAH_DATA_INDEXED))
     
     print(f"Total Data Valid (Indexed): {len(valid_data)}")
     print("=== 5 CONTOH PERTANYAAN DARI DATABASE ANDA ===")
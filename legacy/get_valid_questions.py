@@ -1,23 +1,20 @@
-import json
 import random
 import os
-from app.core.config import DATA_RAW_DIR
+from app.core.data_loader import HotpotQALoader
 
 def main():
     JUMLAH_DATA_INDEXED = 2000 
     
     print(f"=== GENERATOR PERTANYAAN VALID (DARI {JUMLAH_DATA_INDEXED} DATA) ===\n")
     
-    file_path = os.path.join(DATA_RAW_DIR, "hotpot_train_v1.1.json")
+    loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
     
-    if not os.path.exists(file_path):
+    if not os.path.exists(loader.file_path):
         print("File dataset tidak ditemukan.")
         return
 
-    print("Membaca file JSON (sedikit lama)...")
-    with open(file_path, 'r', encoding='utf-8') as f:
-        all_data = json.load(f)
-    known_data = all_data[:JUMLAH_DATA_INDEXED]
+    print("Membaca file JSON (streaming)...")
+    known_data = list(loader.iter_records(limit=JUMLAH_DATA_INDEXED))
     
     print(f"Total Data yang diketahui sistem: {len(known_data)}")
     
@@ -3,16 +3,26 @@ import argparse
 import os
 import pickle
 import pandas as pd
-import networkx as nx
 import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime
 
 from app.core.data_loader import HotpotQALoader
 from app.core.preprocessor import TextPreprocessor
+from app.core.deduplicator import ChunkDeduplicator
 from app.core.vector_store import VectorStore
-from app.core.extractor import TripletExtractor
-from app.core.config import DATA_PROCESSED_DIR
+from app.core.embedding_cache import EmbeddingCache
+from app.core.extractor import (TripletExtractor, extract_spans, extraction_model_key, generation_params,
+                                REBEL_MODEL_NAME)
+from app.core.checkpoint import ExtractionCheckpoint
+from app.core.entity_index import EntityIndex
+from app.core.graph_builder import (TripletArrays, build_networkx_graph, build_csr_graph, build_sqlite_graph,
+                                    build_linking_table)
+from app.core.canonicalizer import canonicalize_triplets, alias_table_path, load_alias_table
+from app.core.node_index import NodeVectorIndex
+from app.core.retriever_graph import csr_graph_path, sqlite_graph_path, graph_paths, node_index_path
+from app.core.config import (DATA_PROCESSED_DIR, GRAPH_BACKEND, GRAPH_LINKING, EXTRACTION_CACHE_PATH,
+                             EXTRACTION_BACKEND, EXTRACTION_PROFILE, EXTRACTION_SPAN, GENERATION_PROFILES)
 
 # --- CLASS LOGGER ---
 class IndexingLogger:
@@ -81,28 +91,25 @@ def plot_indexing_comparison(vector_time, graph_time, output_path):
     plt.close()
     print(f"📊 Chart perbandingan disimpan ke: {output_path}")
 
-def build_networkx_graph(df_triplets):
-    G = nx.DiGraph()
-    for _, row in df_triplets.iterrows():
-        G.add_edge(row['head'], row['tail'], relation=row['relation'], source_id=row['chunk_id'])
-    return G
-
 def main(args):
     # Setup Path & Nama File
     suffix = args.suffix
     vector_index_name = f"hotpot_{suffix}"
     triplet_csv_name = f"triplets_{suffix}.csv"
-    checkpoint_name = f"triplets_checkpoint_{suffix}.csv"
+    checkpoint_name = f"triplets_checkpoint_{suffix}"
     graph_pkl_name = f"knowledge_graph_{suffix}.pkl"
     linking_csv_name = f"entity_linking_{suffix}.csv"
+    question_map_name = f"question_chunk_map_{suffix}.csv"
     
     log_file_name = f"indexing_log_{suffix}.txt"
     chart_file_name = f"indexing_cost_chart_{suffix}.png" # Nama file gambar chart
     
     final_csv_path = os.path.join(DATA_PROCESSED_DIR, triplet_csv_name)
-    checkpoint_csv_path = os.path.join(DATA_PROCESSED_DIR, checkpoint_name)
+    checkpoint_dir = os.path.join(DATA_PROCESSED_DIR, checkpoint_name)
+    legacy_checkpoint_path = os.path.join(DATA_PROCESSED_DIR, f"{checkpoint_name}.csv")
     graph_pkl_path = os.path.join(DATA_PROCESSED_DIR, graph_pkl_name)
     linking_csv_path = os.path.join(DATA_PROCESSED_DIR, linking_csv_name)
+    question_map_path = os.path.join(DATA_PROCESSED_DIR, question_map_name)
     log_path = os.path.join(DATA_PROCESSED_DIR, log_file_name)
     chart_path = os.path.join(DATA_PROCESSED_DIR, chart_file_name)
 
@@ -110,7 +117,7 @@ def main(args):
     logger = IndexingLogger(log_path)
     
     limit_text = "ALL" if args.limit == -1 else str(args.limit)
-    logger.log(f"KONFIGURASI: Limit={limit_text}, Batch={args.batch_size}, Suffix='{suffix}'")
+    logger.log(f"KONFIGURASI: Limit={limit_text}, Offset={args.offset}, Batch={args.batch_size}, Span={args.extract_span}, Index={args.index_type}, Workers={args.num_workers}, ExtractWorkers={args.extract_workers}, Extract={args.extract_backend}/{args.extract_profile}, Suffix='{suffix}'")
     
     start_global = time.time()
 
@@ -118,85 +125,113 @@ def main(args):
     logger.start_timer("Preprocessing")
     loader = HotpotQALoader(file_name="hotpot_train_v1.1.json")
     load_limit = None if args.limit == -1 else args.limit
-    raw_data = loader.load_data(limit=load_limit)
+    # Generator: record dibaca satu per satu, parsing berhenti setelah limit
+    raw_data = loader.iter_records(limit=load_limit, offset=args.offset)
     
     preprocessor = TextPreprocessor()
+    deduplicator = None if args.no_dedup else ChunkDeduplicator()
     all_chunks = []
-    for record in raw_data:
-        chunks = preprocessor.process_record(record)
+    for chunks in preprocessor.process_records(raw_data, num_workers=args.num_workers):
+        if deduplicator:
+            # Hanya paragraf unik yang diteruskan ke embedding & ekstraksi
+            chunks = deduplicator.add(chunks)
         all_chunks.extend(chunks)
     
     total_chunks = len(all_chunks)
+    if deduplicator:
+        deduplicator.save_question_map(question_map_path)
+        logger.log(f"♻️ Dedup: {deduplicator.total_seen} chunks -> {total_chunks} chunk unik")
     logger.end_timer("Preprocessing", f"| Total Chunks: {total_chunks}")
 
     # --- 2. Vector Indexing ---
     logger.start_timer("Vector Indexing")
-    vector_store = VectorStore(index_name=vector_index_name)
-    vector_store.create_index(all_chunks, batch_size=args.batch_size * 2)
+    vector_store = VectorStore(index_name=vector_index_name, index_factory=args.index_type)
+    embedding_cache = None
+    if not args.no_embedding_cache:
+        # Cache persisten: chunk yang sudah pernah di-encode (build lain/suffix lain) tidak di-encode ulang
+        embedding_cache = EmbeddingCache(vector_store.model_name, vector_store.dimension)
+        logger.log(f"♻️ Embedding cache: {len(embedding_cache)} vektor tersedia")
+    vector_store.create_index(all_chunks, batch_size=args.batch_size * 2, embedding_cache=embedding_cache)
     vector_store.save()
     logger.end_timer("Vector Indexing", "| FAISS Index Created")
 
     # --- 3. Graph Extraction ---
     logger.start_timer("Graph Extraction")
-    extractor = TripletExtractor()
-    all_triplets = []
-    start_index = 0 
-    
-    # Resume Logic
-    if os.path.exists(checkpoint_csv_path):
-        logger.log(f"⚠️ Checkpoint ditemukan: {checkpoint_name}")
-        try:
-            df_checkpoint = pd.read_csv(checkpoint_csv_path)
-            if not df_checkpoint.empty:
-                all_triplets = df_checkpoint.to_dict('records')
-                last_chunk_id = df_checkpoint.iloc[-1]['chunk_id']
-                found = False
-                for idx in range(len(all_chunks)-1, -1, -1):
-                    if all_chunks[idx]['chunk_id'] == last_chunk_id:
-                        start_index = idx + 1
-                        remainder = start_index % args.batch_size
-                        if remainder != 0:
-                            start_index = start_index + (args.batch_size - remainder)
-                        found = True
-                        break
-                if found:
-                    logger.log(f"⏩ RESUME dari Chunk ke-{start_index}...")
-                else:
-                    logger.log("⚠️ ID checkpoint tidak cocok. Mulai dari 0.")
-        except Exception:
-            logger.log("❌ Error baca checkpoint. Mulai dari 0.")
-
-    # Loop Batch
-    for i in range(start_index, total_chunks, args.batch_size):
-        batch_chunks = all_chunks[i : i + args.batch_size]
-        try:
-            df_batch = extractor.process_batch(batch_chunks, batch_size=args.batch_size)
-            if not df_batch.empty:
-                all_triplets.extend(df_batch.to_dict('records'))
-        except Exception as e:
-            logger.log(f"❌ Error Batch {i}: {e}")
+    # Cache triplet persisten: chunk yang pernah diekstrak (build/suffix lain, paragraf duplikat) dilewati
+    extraction_cache_path = None if args.no_extraction_cache else EXTRACTION_CACHE_PATH
+    # Mode multi-process: model dimuat di tiap worker, bukan di process utama
+    extractor = None
+    if args.extract_workers <= 1:
+        extractor = TripletExtractor(cache_path=extraction_cache_path, backend=args.extract_backend,
+                                     profile=args.extract_profile)
+
+    # Checkpoint append-only: shard JSONL + manifest span yang selesai (resume tepat, tanpa rewrite)
+    # Setting yang memengaruhi output ikut dicatat: resume dengan backend/profil lain mulai dari awal
+    extraction_settings = {"model": extraction_model_key(REBEL_MODEL_NAME, args.extract_backend),
+                           "generation_params": generation_params(args.extract_profile)}
+    checkpoint = ExtractionCheckpoint(checkpoint_dir, [chunk['id'] for chunk in all_chunks], extraction_settings)
+    if os.path.exists(legacy_checkpoint_path):
+        logger.log(f"⚠️ Checkpoint CSV lama diabaikan: {legacy_checkpoint_path}")
+    if checkpoint.entries:
+        logger.log(f"⏩ RESUME: {checkpoint.num_completed}/{total_chunks} chunk sudah selesai "
+                   f"({checkpoint.num_triplets} triplet di checkpoint)")
+
+    # Loop Batch (hasil worker diterima berurutan; process utama satu-satunya penulis checkpoint)
+    # Span besar (extract_span) = jendela pengurutan token_budget; batch_size = item maksimum per batch
+    extract_span = max(args.extract_span, args.batch_size)
+    spans = extract_spans(all_chunks, extract_span, batch_size=args.batch_size,
+                          num_workers=args.extract_workers, extractor=extractor,
+                          cache_path=extraction_cache_path, ranges=checkpoint.pending_ranges(extract_span),
+                          backend=args.extract_backend, profile=args.extract_profile)
+    last_logged = checkpoint.num_completed
+    for i, end, df_batch, error in spans:
+        if error is not None:
+            # Span gagal tidak masuk manifest -> diulang pada run berikutnya
+            logger.log(f"❌ Error Batch {i}: {error}")
             continue
-        
-        current_count = i + args.batch_size
-        if i % 1000 == 0:
-            print(f"   ...Processing chunk {i}/{total_chunks}")
-        if current_count % args.save_every < args.batch_size or current_count >= total_chunks:
-            logger.log(f"💾 Checkpoint: {len(all_triplets)} triplets saved.")
-            pd.DataFrame(all_triplets).to_csv(checkpoint_csv_path, index=False)
+        checkpoint.append(i, end, df_batch.to_dict('records'))
 
-    logger.end_timer("Graph Extraction", f"| Total Triplet: {len(all_triplets)}")
+        print(f"   ...Processing chunk {end}/{total_chunks}")
+        if checkpoint.num_completed - last_logged >= args.save_every or checkpoint.num_completed >= total_chunks:
+            last_logged = checkpoint.num_completed
+            logger.log(f"💾 Checkpoint: {checkpoint.num_completed}/{total_chunks} chunk, "
+                       f"{checkpoint.num_triplets} triplets.")
+
+    if extractor is not None and extractor.cache is not None:
+        logger.log(f"♻️ Extraction cache: {extractor.cache.stats()}")
+    logger.end_timer("Graph Extraction", f"| Total Triplet: {checkpoint.num_triplets}")
 
     # --- 4. Build Graph Object ---
     logger.start_timer("Graph Construction")
-    if not all_triplets:
+    if checkpoint.num_triplets == 0:
         logger.log("⚠️ Graf Kosong! Tidak ada triplet.")
         return
 
-    df_final = pd.DataFrame(all_triplets).drop_duplicates()
+    # Triplet dibaca dari shard dalam urutan chunk (bukan urutan selesai)
+    df_final = checkpoint.to_dataframe().drop_duplicates()
     df_final.to_csv(final_csv_path, index=False)
-    G = build_networkx_graph(df_final)
-    with open(graph_pkl_path, "wb") as f:
-        pickle.dump(G, f)
+
+    # Kanonikalisasi entitas: gabungkan varian surface form, simpan tabel alias di samping graf
+    df_aliases = None
+    if not args.no_canonicalize:
+        raw_graph = TripletArrays(df_final)
+        df_final, df_aliases = canonicalize_triplets(df_final)
+        df_aliases.to_csv(alias_table_path(graph_pkl_path), index=False)
+        canonical_graph = TripletArrays(df_final)
+        logger.log(f"🔤 Kanonikalisasi: Nodes {len(raw_graph.node_names)} -> {len(canonical_graph.node_names)}, "
+                   f"Edges {len(raw_graph)} -> {len(canonical_graph)}, Alias: {len(df_aliases)}")
+    elif os.path.exists(alias_table_path(graph_pkl_path)):
+        os.remove(alias_table_path(graph_pkl_path))
+
+    if GRAPH_BACKEND == "sqlite":
+        # Graf lebih besar dari RAM: langsung dari array triplet kanonik, tanpa nx.DiGraph & pickle
+        G = build_sqlite_graph(df_final, sqlite_graph_path(graph_pkl_path), df_aliases)
+    else:
+        G = build_networkx_graph(df_final)
+        with open(graph_pkl_path, "wb") as f:
+            pickle.dump(G, f)
+        if GRAPH_BACKEND == "csr":
+            build_csr_graph(df_final, csr_graph_path(graph_pkl_path))
     
     num_nodes = G.number_of_nodes()
     num_edges = G.number_of_edges()
@@ -204,13 +239,22 @@ def main(args):
 
     # --- 5. Linking Table ---
     logger.start_timer("Entity Linking")
-    linking_data = []
-    for _, row in df_final.iterrows():
-        linking_data.append({'entity': row['head'], 'chunk_id': row['chunk_id']})
-        linking_data.append({'entity': row['tail'], 'chunk_id': row['chunk_id']})
-    df_linking = pd.DataFrame(linking_data).drop_duplicates()
+    df_linking = build_linking_table(df_final)
     df_linking.to_csv(linking_csv_path, index=False)
-    logger.end_timer("Entity Linking")
+    # Indeks entity linking query-time (disimpan di samping file graf)
+    _, graph_source_path, entity_index_path = graph_paths(graph_pkl_path)
+    if entity_index_path is not None:
+        entity_index = EntityIndex.build_for_graph(G, graph_source_path, entity_index_path,
+                                                   load_alias_table(graph_pkl_path))
+        logger.log(f"🔎 Entity index: {len(entity_index.postings)} token")
+    # Index FAISS nama node untuk linking semantik (model & embedding cache yang sama dengan chunk)
+    if GRAPH_LINKING != "string" or args.node_index:
+        node_index = NodeVectorIndex.build_for_graph(G, graph_source_path, node_index_path(graph_pkl_path),
+                                                     vector_store, embedding_cache)
+        logger.log(f"🧭 Node index: {len(node_index)} nama node ter-embed")
+    if hasattr(G, "close"):
+        G.close()
+    logger.end_timer("Entity Linking", f"| Linking rows: {len(df_linking)}")
 
     # --- FINISH & PLOTTING ---
     total_time = time.time() - start_global
@@ -236,8 +280,26 @@ def main(args):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--limit", type=int, default=-1)
+    parser.add_argument("--offset", type=int, default=0)
     parser.add_argument("--batch_size", type=int, default=64)
     parser.add_argument("--save_every", type=int, default=5000)
     parser.add_argument("--suffix", type=str, default="full")
+    parser.add_argument("--index_type", type=str, default="flat",
+                        help="Profil index FAISS (flat, ivf_flat, ivf_pq, hnsw) atau factory string")
+    parser.add_argument("--no_embedding_cache", action="store_true", help="Encode ulang semua chunk tanpa cache")
+    parser.add_argument("--extract_backend", type=str, default=EXTRACTION_BACKEND, choices=["torch", "int8", "onnx"],
+                        help="Backend model REBEL (int8/onnx hanya CPU)")
+    parser.add_argument("--extract_span", type=int, default=EXTRACTION_SPAN,
+                        help="Chunk per span ekstraksi (unit checkpoint; batch diurutkan per span)")
+    parser.add_argument("--extract_profile", type=str, default=EXTRACTION_PROFILE, choices=list(GENERATION_PROFILES),
+                        help="Profil generate REBEL")
+    parser.add_argument("--no_extraction_cache", action="store_true", help="Ekstraksi ulang semua chunk tanpa cache triplet")
+    parser.add_argument("--num_workers", type=int, default=1, help="Jumlah proses untuk tahap preprocessing (hanya menguntungkan di mesin multi-core)")
+    parser.add_argument("--extract_workers", type=int, default=1,
+                        help="Jumlah proses ekstraksi REBEL (CPU, satu model per proses)")
+    parser.add_argument("--no_dedup", action="store_true", help="Nonaktifkan deduplikasi paragraf konteks")
+    parser.add_argument("--no_canonicalize", action="store_true", help="Nonaktifkan penggabungan alias entitas")
+    parser.add_argument("--node_index", action="store_true",
+                        help="Bangun index nama node meskipun GRAPH_LINKING = 'string'")
     args = parser.parse_args()
     main(args)
\ No newline at end of file
@@ -0,0 +1,50 @@
+import os
+import pickle
+import tempfile
+from app.core.chunk_store import ChunkStore
+
+def main():
+    print("=== 🧪 PENGUJIAN CHUNK STORE (KOLUMNAR) ===")
+
+    # 1. Siapkan chunk dummy dengan format hasil TextPreprocessor
+    chunks = []
+    for i in range(1000):
+        title = f"Judul {i % 10}"
+        chunks.append({
+            "id": f"q{i // 10}_{title}_{i % 3}",
+            "title": title,
+            "text": f"isi paragraf nomor {i} – ünïcode",
+            "metadata": {"source": title, "type": "context", "original_question_id": f"q{i // 10}"}
+        })
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 2. Migrasi dari pickle lama
+        pkl_path = os.path.join(tmp_dir, "meta.pkl")
+        with open(pkl_path, "wb") as f:
+            pickle.dump(chunks, f)
+        store_path = os.path.join(tmp_dir, "chunks")
+        ChunkStore.from_pickle(pkl_path, store_path)
+
+        # 3. Buka ulang (memory-mapped) dan bandingkan isi
+        store = ChunkStore(store_path)
+        assert len(store) == len(chunks)
+        assert all(store[i] == chunks[i] for i in range(len(chunks)))
+        print(f"✅ {len(store)} chunk identik dengan pickle asal.")
+
+        # 4. Lookup chunk_id -> row
+        assert store.get_row(chunks[123]["id"]) == 123
+        assert store.get_row("tidak_ada") is None
+        assert len(store.question_ids()) == 100
+        print("✅ Lookup chunk_id & dictionary question_id benar.")
+
+        # 5. Append tanpa menulis ulang
+        new_rows = store.append([{"id": "baru", "title": "Judul 1", "text": "teks baru", "metadata": {}}])
+        reopened = ChunkStore(store_path)
+        assert reopened[new_rows[0]]["text"] == "teks baru"
+        assert reopened.get_row("baru") == len(chunks)
+        print("✅ Append chunk baru berhasil.")
+
+    print("\n=== PENGUJIAN SELESAI ===")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import random
+import tempfile
+import pandas as pd
+from app.core.entity_index import EntityIndex
+from app.core.graph_builder import build_sqlite_graph
+from app.core.graph_sqlite import SQLiteEntityIndex
+
+STOPWORDS = {"what", "who", "is", "the", "a", "of", "in", "tell", "me", "about"}
+
+def query_terms(query):
+    # Preprocessing query sama seperti GraphRetriever.link_entities_string
+    query_clean = query.lower().replace("?", "").replace(".", "").replace(",", "")
+    return query_clean, set(query_clean.split()) - STOPWORDS
+
+def reference_candidates(nodes, query_clean, keywords):
+    """
+    Loop lama GraphRetriever (scan semua node per query), sebagai acuan
+    """
+    start_nodes = []
+    for node in nodes:
+        node_str = str(node).lower().strip()
+        if len(node_str) < 3: continue
+
+        # Exact match
+        if node_str in query_clean:
+            start_nodes.append(node)
+            continue
+        # Keyword match
+        node_tokens = set(node_str.split())
+        if len(node_tokens.intersection(keywords)) >= 1:
+            if len(node_tokens) > 2 and len(node_tokens.intersection(keywords)) < 2:
+                continue
+            start_nodes.append(node)
+    return start_nodes
+
+def random_nodes(rng, count):
+    # Kosakata kecil agar banyak nama node saling tumpang tindih (substring & token)
+    vocab = ["new", "york", "ab", "abc", "bca", "the", "city", "río", "ünï", "ed", "band", "of", "x"]
+    nodes = set()
+    while len(nodes) < count:
+        words = [rng.choice(vocab) for _ in range(rng.randint(1, 4))]
+        name = " ".join(words)
+        if rng.random() < 0.3:
+            name = name.title()
+        if rng.random() < 0.1:
+            name = f" {name} "
+        nodes.add(name)
+    return sorted(nodes, key=lambda _: rng.random())
+
+def random_query(rng, nodes):
+    parts = [rng.choice(nodes) for _ in range(rng.randint(0, 3))]
+    parts += [rng.choice(["What", "who is", "the", "bandabc", "x,", "york?", "ciTy."]) for _ in range(rng.randint(1, 4))]
+    rng.shuffle(parts)
+    return " ".join(parts)
+
+def main():
+    print("=== 🧪 PENGUJIAN ENTITY INDEX vs LOOP LAMA ===")
+    rng = random.Random(0)
+
+    # 1. Kandidat identik (isi & urutan) dengan scan node per query
+    for trial in range(5):
+        nodes = random_nodes(rng, 2000)
+        index = EntityIndex(nodes)
+        for _ in range(300):
+            query_clean, keywords = query_terms(random_query(rng, nodes))
+            expected = reference_candidates(nodes, query_clean, keywords)
+            assert index.candidates(query_clean, keywords) == expected, query_clean
+    print("✅ 1500 query acak: kandidat identik dengan loop lama.")
+
+    # 2. Alias me-link node kanonik lewat substring query
+    nodes = ["New York City", "Beatles", "ab"]
+    index = EntityIndex(nodes, aliases={"nyc": "New York City", "the fab four": "Beatles", "zz": "Beatles"})
+    assert index.candidates("where is nyc", {"where", "nyc"}) == ["New York City"]
+    assert index.candidates("songs by the fab four", {"songs", "fab", "four"}) == ["Beatles"]
+    assert index.candidates("zz top", {"zz", "top"}) == []
+    print("✅ Alias (panjang >= 3) me-link node kanonik.")
+
+    # 3. Linker backend SQLite = EntityIndex (node, alias, urutan kandidat)
+    nodes = random_nodes(rng, 2000)
+    aliases = {f"alias {i} {rng.choice(nodes)}": rng.choice(nodes) for i in range(200)}
+    # head/tail berselang-seling -> urutan node graf sama dengan urutan list nodes
+    df_triplets = pd.DataFrame({"head": nodes[0::2], "relation": "r", "tail": nodes[1::2], "chunk_id": "c"})
+    df_aliases = pd.DataFrame(list(aliases.items()), columns=["alias", "canonical"])
+    index = EntityIndex(nodes, aliases)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        graph = build_sqlite_graph(df_triplets, os.path.join(tmp_dir, "graph.sqlite"), df_aliases)
+        sqlite_index = SQLiteEntityIndex(graph)
+        for _ in range(300):
+            query = random_query(rng, nodes + list(aliases))
+            query_clean, keywords = query_terms(query)
+            assert sqlite_index.candidates(query_clean, keywords) == index.candidates(query_clean, keywords), query_clean
+        graph.close()
+    print("✅ 300 query acak: kandidat SQLiteEntityIndex identik dengan EntityIndex.")
+
+    print("\n=== PENGUJIAN SELESAI ===")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import numpy as np
+from app.core.vector_store import VectorStore
+
+class HashEncoder:
+    """
+    Pengganti SentenceTransformer: embedding acak deterministik per teks (ternormalisasi)
+    """
+    def __init__(self, dimension=384):
+        self.dimension = dimension
+        self.vectors = {}
+
+    def encode(self, texts, **kwargs):
+        rows = []
+        for text in texts:
+            if text not in self.vectors:
+                rng = np.random.default_rng(len(self.vectors))
+                vector = rng.standard_normal(self.dimension).astype(np.float32)
+                self.vectors[text] = vector / np.linalg.norm(vector)
+            rows.append(self.vectors[text])
+        return np.vstack(rows)
+
+def open_store(tmp_dir, encoder):
+    store = VectorStore(index_name="test_vs")
+    store.metadata_path = os.path.join(tmp_dir, "test_vs_meta.pkl")
+    store.chunk_store_path = os.path.join(tmp_dir, "test_vs_chunks")
+    store.index_path = os.path.join(tmp_dir, "test_vs.faiss")
+    store.delta_path = os.path.join(tmp_dir, "test_vs.delta.faiss")
+    store._model = encoder
+    return store
+
+def make_chunk(chunk_id, text):
+    return {"id": chunk_id, "title": "t", "text": text, "metadata": {}}
+
+def main():
+    print("=== 🧪 PENGUJIAN VECTOR STORE (DELTA INDEX) ===")
+    encoder = HashEncoder()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = open_store(tmp_dir, encoder)
+        store.create_index([make_chunk(f"c{i}", f"teks {i}") for i in range(50)])
+        store.save()
+        store = open_store(tmp_dir, encoder)
+        store.load()
+
+        # 1. Re-add chunk_id yang ada di index utama -> versi lama di-tombstone
+        store.add_documents([make_chunk("c7", "teks 7 revisi")])
+        results = store.search("teks 7 revisi", top_k=50)
+        ids = [r['chunk_id'] for r in results]
+        assert ids.count("c7") == 1, ids
+        assert len(ids) == len(set(ids)) == 50, ids
+        assert results[0]['chunk_id'] == "c7" and results[0]['text'] == "teks 7 revisi"
+        assert [c['text'] for c in store.get_chunks(["c7"])] == ["teks 7 revisi"]
+        print("✅ Re-add chunk_id dari index utama: hanya versi baru yang dikembalikan.")
+
+        # 2. Re-add chunk_id yang ada di delta index
+        store.add_documents([make_chunk("c7", "teks 7 revisi kedua")])
+        assert store.delta_index.ntotal == 1
+        ids = [r['chunk_id'] for r in store.search("teks 7 revisi", top_k=50)]
+        assert ids.count("c7") == 1, ids
+        assert [c['text'] for c in store.get_chunks(["c7"])] == ["teks 7 revisi kedua"]
+        print("✅ Re-add chunk_id dari delta index: baris delta lama dihapus.")
+
+        # 3. Bertahan setelah load ulang & compact
+        store = open_store(tmp_dir, encoder)
+        store.load()
+        ids = [r['chunk_id'] for r in store.search("teks 7 revisi kedua", top_k=50)]
+        assert ids.count("c7") == 1 and ids[0] == "c7", ids
+        store.compact()
+        ids = [r['chunk_id'] for r in store.search("teks 7 revisi kedua", top_k=50)]
+        assert ids.count("c7") == 1 and ids[0] == "c7" and len(ids) == 50, ids
+        print("✅ Tombstone bertahan setelah load ulang dan compact.")
+
+        # 4. chunk_id duplikat dalam satu panggilan ditolak
+        try:
+            store.add_documents([make_chunk("n1", "a"), make_chunk("n1", "b")])
+            assert False, "duplikat seharusnya ditolak"
+        except ValueError:
+            pass
+        assert store.get_row("n1") is None
+        print("✅ chunk_id duplikat dalam satu panggilan ditolak.")
+        store.close()
+
+    print("\n=== PENGUJIAN SELESAI ===")
+
+if __name__ == "__main__":
+    main()